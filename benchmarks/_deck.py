@@ -0,0 +1,66 @@
+"""ベンチマーク用の合成スライド PDF を生成するヘルパー.
+
+NotebookLM のデッキを模し、1ページに多数のスパン（フォント・色が混在する行）と
+全ページ共通のロゴ・フッターを配置する。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+# 行内でスパンを分割させるためのフォントと色の組み合わせ
+_STYLES: list[tuple[str, tuple[float, float, float]]] = [
+    ("helv", (0.0, 0.0, 0.0)),
+    ("hebo", (0.1, 0.2, 0.6)),
+    ("tiro", (0.0, 0.0, 0.0)),
+    ("cour", (0.6, 0.1, 0.1)),
+]
+
+
+def make_dense_pdf(
+    path: str | Path,
+    pages: int = 50,
+    lines_per_page: int = 30,
+    spans_per_line: int = 8,
+) -> Path:
+    """スパンの多い合成 PDF を生成する.
+
+    Args:
+        path: 出力先パス
+        pages: ページ数
+        lines_per_page: 1ページあたりの本文行数
+        spans_per_line: 1行あたりのスパン数（スタイルを交互に切り替える）
+
+    Returns:
+        生成した PDF の Path
+    """
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    logo.set_rect(logo.irect, (30, 90, 200))
+    logo_png = logo.tobytes("png")
+
+    doc = fitz.open()
+    for page_index in range(pages):
+        page = doc.new_page(width=720, height=405)
+        page.insert_text(
+            (40, 40), f"Benchmark Slide {page_index + 1}", fontsize=24, fontname="hebo"
+        )
+        line_height = 320 / lines_per_page
+        for line in range(lines_per_page):
+            y = 60 + line * line_height
+            x = 40.0
+            for span in range(spans_per_line):
+                fontname, color = _STYLES[span % len(_STYLES)]
+                text = f"w{span}"
+                page.insert_text(
+                    (x, y), text, fontsize=7, fontname=fontname, color=color
+                )
+                x += fitz.get_text_length(text, fontname=fontname, fontsize=7) + 4
+        page.insert_text((40, 398), "NotebookLM Deck", fontsize=7, fontname="helv")
+        page.insert_text((660, 398), f"{page_index + 1}", fontsize=7, fontname="helv")
+        page.insert_image(fitz.Rect(660, 8, 708, 56), stream=logo_png)
+    out = Path(path)
+    doc.save(str(out))
+    doc.close()
+    return out
@@ -0,0 +1,61 @@
+"""PPTX構築バックエンドの比較ベンチマーク.
+
+使い方:
+    python -m benchmarks.bench_build [--slides 200] [--blocks 25] [--spans 4]
+
+python-pptx のプロキシ経由でテキストボックスを組み立てる PPTXBuilder と、p:sp の XML を
+直接生成する XMLSlideBuilder について、デッキ全体の build() の時間（repeat 回の最小値）を
+比較し、両者のスライドのシェイプツリーが一致することを確認する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+
+from lxml import etree
+
+from benchmarks.bench_layout import make_slides
+from src.builder import BUILDER_BACKENDS
+from src.models import PresentationData
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=25)
+    parser.add_argument("--spans", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = PresentationData(
+        source_path="bench.pdf",
+        total_pages=args.slides,
+        slide_width=720,
+        slide_height=405,
+        slides=make_slides(args.slides, args.blocks, args.spans),
+    )
+
+    best = {backend: float("inf") for backend in BUILDER_BACKENDS}
+    trees = {}
+    for _ in range(args.repeat):
+        for backend, builder_class in BUILDER_BACKENDS.items():
+            builder = builder_class()
+            gc.collect()
+            start = time.perf_counter()
+            prs = builder.build(data)
+            best[backend] = min(best[backend], time.perf_counter() - start)
+            trees[backend] = [etree.tostring(slide.shapes._spTree) for slide in prs.slides]
+
+    print(f"slides={args.slides} blocks={args.slides * args.blocks} spans/block={args.spans}")
+    print(f"{'backend':<14}{'ms/deck':>10}")
+    for backend, seconds in best.items():
+        print(f"{backend:<14}{seconds * 1000:>10.1f}")
+    print(f"speedup: {best['python-pptx'] / best['xml']:.2f}x")
+    print(f"shapes identical: {trees['python-pptx'] == trees['xml']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""テキスト抽出のモデル生成方式の比較ベンチマーク.
+
+使い方:
+    python -m benchmarks.bench_extract [--pages 50] [--lines 30] [--spans 8]
+
+スパンごとに FontInfo / BoundingBox / TextSpan を検証付きで生成する従来方式と、
+construct_trusted() で検証を省略し StyleTable で書式を共有する現行方式について、
+1ページあたりのテキスト抽出時間（repeat 回の最小値）と、抽出結果が保持する
+メモリ量（tracemalloc）を比較する。get_text("dict") 自体の時間も含む。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import fitz  # PyMuPDF
+
+from benchmarks._deck import make_dense_pdf
+from src.extractor import PDFExtractor
+from src.models import BoundingBox, FontInfo, TextBlock, TextSpan
+
+
+class _PerSpanExtractor(PDFExtractor):
+    """比較用: スパンごとに検証付きモデルを生成する従来の抽出処理."""
+
+    def _extract_text_blocks(self, page_dict: dict[str, Any]) -> list[TextBlock]:
+        blocks: list[TextBlock] = []
+        for block in page_dict.get("blocks", []):
+            if block.get("type") != 0:
+                continue
+            spans: list[TextSpan] = []
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    font_name = span.get("font", "Arial")
+                    font_info = FontInfo(
+                        name=font_name,
+                        size=round(span.get("size", 12.0), 1),
+                        bold="bold" in font_name.lower(),
+                        italic="italic" in font_name.lower(),
+                        color=f"#{span.get('color', 0):06x}",
+                    )
+                    x0, y0, x1, y1 = span["bbox"]
+                    spans.append(
+                        TextSpan(
+                            text=span.get("text", ""),
+                            font=font_info,
+                            bbox=BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1),
+                        )
+                    )
+            if spans:
+                x0, y0, x1, y1 = block["bbox"]
+                blocks.append(
+                    TextBlock(spans=spans, bbox=BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1))
+                )
+        return blocks
+
+
+def _page_dict(page: fitz.Page) -> dict[str, Any]:
+    return page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+
+
+def _measure(
+    extractors: dict[str, PDFExtractor], repeat: int
+) -> dict[str, tuple[float, float]]:
+    """各方式の1ページあたりのテキスト抽出時間(ms)と割り当て量(KB)を返す.
+
+    ノイズを抑えるため、方式を交互に repeat 回実行して最小値を採用する。
+    """
+    best = {label: float("inf") for label in extractors}
+    for _ in range(repeat):
+        for label, extractor in extractors.items():
+            gc.collect()
+            start = time.perf_counter()
+            for page in extractor.doc:
+                extractor._extract_text_blocks(_page_dict(page))
+            best[label] = min(best[label], time.perf_counter() - start)
+
+    results: dict[str, tuple[float, float]] = {}
+    for label, extractor in extractors.items():
+        pages = len(extractor.doc)
+        gc.collect()
+        tracemalloc.start()
+        blocks = [extractor._extract_text_blocks(_page_dict(page)) for page in extractor.doc]
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del blocks
+        results[label] = (best[label] / pages * 1000, retained / pages / 1024)
+    return results
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=30)
+    parser.add_argument("--spans", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        pdf_path = make_dense_pdf(Path(tmpdir) / "dense.pdf", args.pages, args.lines, args.spans)
+        with _PerSpanExtractor(pdf_path) as validated, PDFExtractor(pdf_path) as trusted:
+            spans = sum(
+                len(b.spans)
+                for page in trusted.doc
+                for b in trusted._extract_text_blocks(_page_dict(page))
+            )
+            results = _measure({"validated": validated, "trusted": trusted}, args.repeat)
+
+    print(f"pages={args.pages} spans={spans}")
+    print(f"{'mode':<10}{'ms/page':>10}{'KB/page':>12}")
+    for label, (ms, kb) in results.items():
+        print(f"{label:<10}{ms:>10.2f}{kb:>12.1f}")
+    base, fast = results["validated"], results["trusted"]
+    print(f"speedup: {base[0] / fast[0]:.2f}x, retained alloc: {fast[1] / base[1]:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""ヒューリスティックなレイアウト判定の比較ベンチマーク.
+
+使い方:
+    python -m benchmarks.bench_layout [--slides 500] [--blocks 25] [--spans 4]
+
+スライドごとに _analyze_slide_heuristic を呼ぶ従来方式と、全スライドの特徴量行列を
+NumPy で一括判定する vectorized_heuristic.analyze_slides について、デッキ全体の
+判定時間（repeat 回の最小値）を比較し、両者のラベルが一致することを確認する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import time
+
+from src.analyzer import LayoutAnalyzer
+from src.analyzer.vectorized_heuristic import analyze_slides
+from src.models import BoundingBox, FontInfo, SlideData, TextBlock, TextSpan
+
+_TEXTS = ["Slide title", "• bullet item", "1. step", "body text goes here", "Page 3"]
+_SIZES = [8.0, 12.0, 14.0, 18.0, 24.0, 28.0]
+
+
+def make_slides(slides: int, blocks: int, spans: int, seed: int = 0) -> list[SlideData]:
+    """ランダムな位置・フォントサイズのテキストブロックを持つスライドを生成する."""
+    rng = random.Random(seed)
+    result = []
+    for page in range(1, slides + 1):
+        text_blocks = []
+        for _ in range(blocks):
+            y0 = rng.uniform(0, 390)
+            text_blocks.append(
+                TextBlock(
+                    spans=[
+                        TextSpan(
+                            text=rng.choice(_TEXTS),
+                            font=FontInfo(size=rng.choice(_SIZES), bold=rng.random() < 0.3),
+                        )
+                        for _ in range(spans)
+                    ],
+                    bbox=BoundingBox(x0=40, y0=y0, x1=680, y1=y0 + 15),
+                )
+            )
+        result.append(SlideData(page_number=page, width=720, height=405, text_blocks=text_blocks))
+    return result
+
+
+def _labels(slides: list[SlideData]) -> list[str]:
+    return [block.element_type.value for slide in slides for block in slide.text_blocks]
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slides", type=int, default=500)
+    parser.add_argument("--blocks", type=int, default=25)
+    parser.add_argument("--spans", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    slides = make_slides(args.slides, args.blocks, args.spans)
+    analyzer = LayoutAnalyzer()
+
+    def per_slide() -> None:
+        for slide in slides:
+            analyzer._analyze_slide_heuristic(slide)
+
+    def vectorized() -> None:
+        analyze_slides(slides)
+
+    modes = {"per-slide": per_slide, "vectorized": vectorized}
+    best = {label: float("inf") for label in modes}
+    labels = {}
+    for _ in range(args.repeat):
+        for label, run in modes.items():
+            gc.collect()
+            start = time.perf_counter()
+            run()
+            best[label] = min(best[label], time.perf_counter() - start)
+            labels[label] = _labels(slides)
+
+    print(f"slides={args.slides} blocks={args.slides * args.blocks} spans/block={args.spans}")
+    print(f"{'mode':<12}{'ms/deck':>10}")
+    for label, seconds in best.items():
+        print(f"{label:<12}{seconds * 1000:>10.1f}")
+    print(f"speedup: {best['per-slide'] / best['vectorized']:.2f}x")
+    print(f"labels identical: {labels['per-slide'] == labels['vectorized']}")
+
+
+if __name__ == "__main__":
+    main()
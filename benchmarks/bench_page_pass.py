@@ -0,0 +1,158 @@
+"""ページ解析のパス数の比較ベンチマーク.
+
+使い方:
+    python -m benchmarks.bench_page_pass [--pages 30] [--images 4] [--placements 2]
+        [--format flate|jpeg] [--size 640]
+
+get_text("dict") のあとに get_images() と画像ごとの get_image_rects() を呼ぶ従来方式
+（画像の数だけコンテンツストリームを解釈し直し、同じ画像の配置はすべて最初の位置になる）と、
+テキスト用と画像情報用の TextPage から取り出す現行方式について、1ページあたりの
+抽出時間（repeat 回の最小値）と抽出した画像ブロック数を比較する。画像は遅延読み込みとし、
+デコードの時間は含めない。
+
+画像は Flate（PNG 相当）と JPEG の両方で計測する。MuPDF は JPEG をそのまま受け渡すが、
+Flate の画像は辞書出力で再エンコードされるため、テキスト抽出に画像が紛れ込むと
+Flate の計測値だけが大きく悪化する。
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from benchmarks._deck import make_dense_pdf
+from src.extractor import PDFExtractor
+from src.models import BoundingBox, ImageBlock, SlideData
+
+
+class _MultiPassExtractor(PDFExtractor):
+    """比較用: テキストと画像の位置をそれぞれ別に解析する従来の抽出処理.
+
+    get_images() は同じ画像をリソース名ごとに列挙するため、配置の数だけ ImageBlock を
+    作るが、位置は get_image_rects() の先頭だけを使う。
+    """
+
+    def _extract_page_uncached(self, page: fitz.Page, page_num: int) -> SlideData:
+        page_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        images: list[ImageBlock] = []
+        for img_info in page.get_images(full=True):
+            xref = img_info[0]
+            img_rects = page.get_image_rects(xref)
+            if not img_rects:
+                continue
+            rect = img_rects[0]
+            image_block = ImageBlock(
+                bbox=BoundingBox(x0=rect.x0, y0=rect.y0, x1=rect.x1, y1=rect.y1),
+                image_format="png",
+                xref=xref,
+            )
+            image_block.bind_loader(self._load_image_data)
+            images.append(image_block)
+        return SlideData(
+            page_number=page_num + 1,
+            width=page.rect.width,
+            height=page.rect.height,
+            text_blocks=self._extract_text_blocks(page_dict),
+            image_blocks=images,
+        )
+
+
+def _add_images(
+    pdf_path: Path, images: int, placements: int, image_format: str, size: int
+) -> None:
+    """各ページに、ページ固有の画像を images 個ずつ placements 回配置する.
+
+    Args:
+        pdf_path: 画像を追加する PDF
+        images: 1ページあたりの画像の種類数
+        placements: 1画像あたりの配置数
+        image_format: "flate"（PNG から取り込み FlateDecode で格納）または "jpeg"
+        size: 画像の幅（ピクセル。高さは 3/4）
+    """
+    doc = fitz.open(pdf_path)
+    for page in doc:
+        for index in range(images):
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, size + index, size * 3 // 4), False)
+            pix.set_rect(pix.irect, (page.number * 7 % 256, index * 40 % 256, 120))
+            # 単色だと圧縮が効きすぎるため、帯状に色を変える
+            for band in range(0, pix.height, 8):
+                pix.set_rect(fitz.IRect(0, band, pix.width, band + 4), (band % 256, 60, 200))
+            stream = pix.tobytes("png") if image_format == "flate" else pix.tobytes("jpeg")
+            xref = 0
+            for placement in range(placements):
+                x = 40 + index * 150
+                y = 80 + placement * 110
+                rect = fitz.Rect(x, y, x + 96, y + 72)
+                if xref:
+                    page.insert_image(rect, xref=xref)
+                else:
+                    xref = page.insert_image(rect, stream=stream)
+    doc.saveIncr()
+    doc.close()
+
+
+def _measure(extractors: dict[str, PDFExtractor], repeat: int) -> dict[str, tuple[float, int]]:
+    """各方式の1ページあたりの抽出時間(ms)と画像ブロック数を返す.
+
+    ノイズを抑えるため、方式を交互に repeat 回実行して最小値を採用する。
+    """
+    best = {label: float("inf") for label in extractors}
+    counts = {label: 0 for label in extractors}
+    for _ in range(repeat):
+        for label, extractor in extractors.items():
+            gc.collect()
+            start = time.perf_counter()
+            slides = [extractor._extract_page(page_num) for page_num in extractor.page_numbers]
+            best[label] = min(best[label], time.perf_counter() - start)
+            counts[label] = sum(len(slide.image_blocks) for slide in slides)
+    return {
+        label: (best[label] / len(extractor.page_numbers) * 1000, counts[label])
+        for label, extractor in extractors.items()
+    }
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示する."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--lines", type=int, default=30)
+    parser.add_argument("--spans", type=int, default=8)
+    parser.add_argument("--images", type=int, default=4, help="1ページあたりの画像の種類数")
+    parser.add_argument("--placements", type=int, default=2, help="1画像あたりの配置数")
+    parser.add_argument(
+        "--format",
+        choices=["flate", "jpeg"],
+        action="append",
+        help="画像の格納形式（複数指定可。既定は両方）",
+    )
+    parser.add_argument("--size", type=int, default=640, help="画像の幅（ピクセル）")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"pages={args.pages} images/page={args.images} placements/image={args.placements}")
+    for image_format in args.format or ["flate", "jpeg"]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf_path = make_dense_pdf(
+                Path(tmpdir) / "dense.pdf", args.pages, args.lines, args.spans
+            )
+            _add_images(pdf_path, args.images, args.placements, image_format, args.size)
+            with (
+                _MultiPassExtractor(pdf_path, lazy_images=True) as multi_pass,
+                PDFExtractor(pdf_path, lazy_images=True) as current,
+            ):
+                results = _measure({"multi": multi_pass, "current": current}, args.repeat)
+
+        print(f"\n[{image_format} {args.size}px]")
+        print(f"{'mode':<10}{'ms/page':>10}{'images':>10}")
+        for label, (ms, count) in results.items():
+            print(f"{label:<10}{ms:>10.2f}{count:>10}")
+        print(f"speedup: {results['multi'][0] / results['current'][0]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from pathlib import Path
 
 from pydantic import Field
@@ -24,6 +25,42 @@ class AppSettings(BaseSettings):
         default="claude-sonnet-4-20250514",
         description="使用するLLMモデル名",
     )
+    llm_concurrency: int = Field(
+        default=8,
+        description="同時に実行するLLMレイアウト解析の呼び出し数",
+    )
+    llm_requests_per_minute: int = Field(
+        default=50,
+        description="LLM APIの1分あたりのリクエスト数上限。0 で無制限",
+    )
+    llm_tokens_per_minute: int = Field(
+        default=40000,
+        description="LLM APIの1分あたりのトークン数上限（入力+出力）。0 で無制限",
+    )
+    llm_batch_tokens: int = Field(
+        default=4000,
+        description="LLMの1リクエストにまとめるスライドの入力トークン数の目安。0 で1枚ずつ送信",
+    )
+    llm_escalation_threshold: float = Field(
+        default=0.0,
+        description="ルールベース判定の信頼度がこの値未満のスライドのみLLMに送る。0 で全スライド",
+    )
+    llm_cache: bool = Field(
+        default=True,
+        description="同じレイアウトのLLM判定結果をキャッシュから返すか",
+    )
+    llm_cache_path: Path = Field(
+        default=Path("./.cache/llm_layout.sqlite"),
+        description="LLM判定キャッシュの SQLite ファイル",
+    )
+    llm_cache_ttl_days: float = Field(
+        default=30,
+        description="LLM判定キャッシュのエントリの有効期間（日）。0 で無期限",
+    )
+    llm_cache_max_entries: int = Field(
+        default=50000,
+        description="LLM判定キャッシュに保持するエントリ数の上限",
+    )
 
     # 出力設定
     output_dir: Path = Field(
@@ -40,11 +77,35 @@ class AppSettings(BaseSettings):
     # PDF解析設定
     image_dpi: int = Field(
         default=300,
-        description="画像レンダリングのDPI",
+        description="画像の最適化で、表示サイズ1インチあたりに残すピクセル数 (DPI)",
     )
     extract_images: bool = Field(
         default=True,
-        description="画像を抽出するか",
+        description="画像を抽出するか。false の場合は画像の一覧取得・デコードを行わない",
+    )
+    image_cache_mb: int = Field(
+        default=64,
+        description="ページ間で共有する抽出画像キャッシュの上限 (MB)。0 で無効",
+    )
+    lazy_images: bool = Field(
+        default=True,
+        description="画像データを抽出時に読み込まず、PPTX構築時に必要になってから読み込むか",
+    )
+    optimize_images: bool = Field(
+        default=False,
+        description="画像を表示サイズと image_dpi に合わせて縮小・切り抜きし、再圧縮するか",
+    )
+    image_jpeg_quality: int = Field(
+        default=85,
+        description="画像の最適化で JPEG に再圧縮するときの品質 (1〜95)",
+    )
+    image_encoding: str = Field(
+        default="auto",
+        description="画像の最適化での再圧縮形式: auto（写真は JPEG、図版は PNG）/ jpeg / png",
+    )
+    image_optimize_workers: int = Field(
+        default=4,
+        description="画像の最適化（デコード・縮小・エンコード）を行うスレッド数",
     )
 
     # PPTX構築設定
@@ -57,6 +118,71 @@ class AppSettings(BaseSettings):
         description="最小フォントサイズ (pt)",
     )
 
+    pptx_backend: str = Field(
+        default="python-pptx",
+        description=(
+            "PPTX構築のバックエンド: python-pptx または xml（テキストボックスの XML を直接生成）"
+        ),
+    )
+    stream_package: bool = Field(
+        default=True,
+        description="ストリーミング変換で、構築したスライドと画像をすぐにPPTXへ書き出してメモリから解放するか",
+    )
+    promote_recurring: bool = Field(
+        default=True,
+        description="多くのスライドで繰り返すフッター・ロゴ等をスライドレイアウトに1度だけ配置するか",
+    )
+
+    # ページ単位の抽出キャッシュ設定
+    page_cache: bool = Field(
+        default=False,
+        description="内容の変わらないページの抽出結果をキャッシュから復元するか",
+    )
+    page_cache_dir: Path = Field(
+        default=Path("./.cache/pages"),
+        description="ページ抽出キャッシュのディレクトリ",
+    )
+    page_cache_mb: int = Field(
+        default=512,
+        description="ページ抽出キャッシュの上限サイズ (MB)",
+    )
+
+    # 変換結果キャッシュ設定
+    result_cache: bool = Field(
+        default=False,
+        description="同じPDF・設定の変換結果をキャッシュから返すか",
+    )
+    result_cache_dir: Path = Field(
+        default=Path("./.cache/results"),
+        description="変換結果キャッシュのディレクトリ",
+    )
+    result_cache_mb: int = Field(
+        default=1024,
+        description="変換結果キャッシュの上限サイズ (MB)",
+    )
+
+    # 変換サーバー設定
+    server_host: str = Field(
+        default="127.0.0.1",
+        description="変換サーバーの待ち受けホスト",
+    )
+    server_port: int = Field(
+        default=8765,
+        description="変換サーバーの待ち受けポート",
+    )
+    server_workers: int = Field(
+        default=2,
+        description="変換サーバーのウォームアップ済みワーカープロセス数",
+    )
+    server_max_upload_mb: int = Field(
+        default=100,
+        description="変換サーバーが受け付けるPDFの最大サイズ (MB)",
+    )
+    server_job_ttl_sec: int = Field(
+        default=3600,
+        description="非同期ジョブの結果を完了後に保持する秒数",
+    )
+
     model_config = {
         "env_prefix": "",
         "env_file": ".env",
@@ -67,15 +193,23 @@ class AppSettings(BaseSettings):
 
 # シングルトンインスタンス
 _settings: AppSettings | None = None
+_settings_lock = threading.Lock()
 
 
 def get_settings() -> AppSettings:
     """アプリケーション設定を取得する.
 
+    初回の呼び出しで環境変数・.env から読み込む。複数のスレッドから同時に呼び出しても
+    インスタンスは1つだけ作られる。
+
     Returns:
         AppSettings インスタンス
     """
     global _settings
-    if _settings is None:
-        _settings = AppSettings()
-    return _settings
+    settings = _settings
+    if settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = AppSettings()
+            settings = _settings
+    return settings
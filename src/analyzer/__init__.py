@@ -1,5 +1,18 @@
 """AI分析モジュール - LLMによるレイアウト意味解釈."""
 
 from src.analyzer.layout_analyzer import LayoutAnalyzer
+from src.analyzer.llm_cache import LLMLayoutCache
+from src.analyzer.rate_limiter import RateLimiter
+from src.analyzer.recurring import RecurringElements, find_recurring_elements
+from src.analyzer.span_normalizer import merge_spans, normalize_presentation, normalize_slide
 
-__all__ = ["LayoutAnalyzer"]
+__all__ = [
+    "LayoutAnalyzer",
+    "LLMLayoutCache",
+    "RateLimiter",
+    "RecurringElements",
+    "find_recurring_elements",
+    "merge_spans",
+    "normalize_presentation",
+    "normalize_slide",
+]
@@ -2,24 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Optional
+import operator
+from collections.abc import Coroutine
+from typing import Any, Optional
 
+from src.analyzer.llm_cache import LLMLayoutCache, layout_key
+from src.analyzer.rate_limiter import RateLimiter, estimate_tokens
+from src.analyzer.vectorized_heuristic import FONT_RATIO_MARGIN, POSITION_MARGIN, analyze_slides
 from src.models import (
     ElementType,
     PresentationData,
     SlideData,
     TextBlock,
 )
+from src.utils.progress import PageProgressCallback, notify
 
 logger = logging.getLogger(__name__)
 
-# レイアウト解析用のシステムプロンプト
-LAYOUT_ANALYSIS_PROMPT = """\
-あなたはPDFスライドのレイアウト解析のエキスパートです。
-以下のJSON形式のテキストブロック情報を分析し、各ブロックの役割を判定してください。
-
+# 判定カテゴリと判定基準（1スライド用・複数スライド用のプロンプトで共通）
+_LAYOUT_CRITERIA = """\
 判定カテゴリ:
 - title: スライドのメインタイトル
 - subtitle: サブタイトル
@@ -34,10 +38,41 @@ LAYOUT_ANALYSIS_PROMPT = """\
 2. フォントサイズ: 大きいものはtitle、中くらいはsubtitle
 3. テキスト内容: 番号や記号で始まるものはbullet
 4. 位置関係: インデントされているものはbullet/body
+"""
+
+# レイアウト解析用のシステムプロンプト
+LAYOUT_ANALYSIS_PROMPT = f"""\
+あなたはPDFスライドのレイアウト解析のエキスパートです。
+以下のJSON形式のテキストブロック情報を分析し、各ブロックの役割を判定してください。
+
+{_LAYOUT_CRITERIA}
+JSON配列で返してください。各要素は {{"block_index": int, "element_type": str}} の形式です。
+"""
+
+# 複数スライドをまとめて解析するためのシステムプロンプト
+LAYOUT_BATCH_PROMPT = f"""\
+あなたはPDFスライドのレイアウト解析のエキスパートです。
+複数スライドのテキストブロックを表形式で与えます。各ブロックの役割を判定してください。
 
-JSON配列で返してください。各要素は {"block_index": int, "element_type": str} の形式です。
+入力形式:
+- 各スライドは「# <ページ番号> <幅>x<高さ>」の行で始まる（単位は pt）
+- 続く各行が1ブロック: block_index|x0|y0|x1|y1|平均フォントサイズ|太字(1/0)|テキスト
+
+{_LAYOUT_CRITERIA}
+JSONオブジェクトのみを返してください。キーはページ番号、値は block_index から
+element_type へのオブジェクトです。すべてのスライドの全ブロックを含めてください。
+例: {{"3": {{"0": "title", "1": "body"}}, "4": {{"0": "title", "1": "bullet"}}}}
 """
 
+# システムプロンプトや判定カテゴリを変えたときに上げる（LLMキャッシュのキーに含まれる）
+LAYOUT_PROMPT_VERSION = 1
+
+# LLM 応答の最大トークン数
+LLM_MAX_TOKENS = 1024
+
+# 一括解析の応答で1ブロックあたりに見込むトークン数
+_BATCH_OUTPUT_TOKENS_PER_BLOCK = 12
+
 
 class LayoutAnalyzer:
     """スライドレイアウトを解析し、各要素の意味的役割を判定するクラス.
@@ -46,36 +81,190 @@ class LayoutAnalyzer:
     オプションでLLM（Claude API）による高精度分析を提供する。
     """
 
-    def __init__(self, anthropic_client: Optional[object] = None, model: str = "claude-sonnet-4-20250514") -> None:
+    def __init__(
+        self,
+        anthropic_client: Optional[object] = None,
+        model: str = "claude-sonnet-4-20250514",
+        concurrency: int = 8,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[LLMLayoutCache] = None,
+        batch_tokens: int = 0,
+        escalation_threshold: float = 0.0,
+    ) -> None:
         """LayoutAnalyzerを初期化する.
 
         Args:
-            anthropic_client: Anthropic APIクライアント（Noneの場合はルールベースのみ）
+            anthropic_client: 非同期 Anthropic APIクライアント（anthropic.AsyncAnthropic）。
+                Noneの場合はルールベースのみ
             model: 使用するLLMモデル名
+            concurrency: 同時に実行するLLM呼び出し数の上限
+            rate_limiter: LLM呼び出しのレート制限（Noneの場合は制限しない）
+            cache: LLM判定結果のキャッシュ（Noneの場合は毎回 API を呼び出す）
+            batch_tokens: 1リクエストにまとめる複数スライドの入力トークン数の目安。
+                0 の場合はスライドごとに1リクエストを送る
+            escalation_threshold: ヒューリスティック判定の信頼度（スライド内の最小値）が
+                この値未満のスライドだけを LLM に送る。0 の場合は全スライドを送る
         """
         self.client = anthropic_client
         self.model = model
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.batch_tokens = batch_tokens
+        self.escalation_threshold = escalation_threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def close(self) -> None:
+        """LLM呼び出し用のイベントループとキャッシュを閉じる."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+            self._loop.close()
+        self._loop = None
+        if self.cache is not None:
+            self.cache.close()
+
+    def _run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """専用のイベントループでコルーチンを実行する.
+
+        非同期クライアントの接続プールはループに結び付くため、呼び出しごとに
+        asyncio.run() で新しいループを作らず、同じループを使い回す。
 
-    def analyze_presentation(self, presentation: PresentationData) -> PresentationData:
+        Args:
+            coro: 実行するコルーチン
+
+        Returns:
+            コルーチンの戻り値
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
+
+    def analyze_presentation(
+        self,
+        presentation: PresentationData,
+        on_progress: Optional[PageProgressCallback] = None,
+    ) -> PresentationData:
         """プレゼンテーション全体のレイアウトを解析する.
 
-        各スライドのテキストブロックにヒューリスティックで element_type を付与する。
-        （LLM クライアントが設定されている場合は analyze_slide_with_llm を利用可能だが、
-        本メソッドは現状ヒューリスティックのみ呼び出す。）
+        LLM クライアントが設定されている場合は全スライド（escalation_threshold が
+        設定されている場合はヒューリスティックの信頼度が低いスライドのみ）を
+        concurrency 件ずつ並行して LLM で解析し、失敗したスライドだけを
+        ヒューリスティックで判定する。クライアントが無い場合はヒューリスティックのみで判定する。
 
         Args:
             presentation: 抽出済みプレゼンテーションデータ
+            on_progress: 解析済みスライド数を (完了数, 総数) で受け取るコールバック
 
         Returns:
             各 TextBlock の element_type が更新された同一オブジェクト
         """
-        for slide in presentation.slides:
-            self._analyze_slide_heuristic(slide)
+        total = len(presentation.slides)
+        if self.client is not None:
+            self._run(self._analyze_slides_with_llm(presentation.slides, on_progress))
+        else:
+            analyze_slides(presentation.slides)
+            notify(on_progress, total, total)
 
         logger.info("レイアウト解析完了: %d スライド", len(presentation.slides))
         return presentation
 
-    def _analyze_slide_heuristic(self, slide: SlideData) -> None:
+    async def _analyze_slides_with_llm(
+        self,
+        slides: list[SlideData],
+        on_progress: Optional[PageProgressCallback] = None,
+    ) -> None:
+        """複数スライドを同時実行数の上限付きで並行してLLM解析する.
+
+        escalation_threshold が設定されている場合は、先にヒューリスティックで判定し、
+        信頼度の低いスライドだけを LLM に送る。batch_tokens が設定されている場合は、
+        キャッシュにヒットしなかったスライドを入力トークン数の目安ごとにまとめ、
+        1リクエストで複数スライドを解析する。
+
+        Args:
+            slides: 解析対象のスライド
+            on_progress: 解析済みスライド数を (完了数, 総数) で受け取るコールバック
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        total = len(slides)
+        completed = 0
+
+        def advance(count: int) -> None:
+            nonlocal completed
+            completed += count
+            notify(on_progress, completed, total)
+
+        if self.escalation_threshold > 0:
+            confidences = analyze_slides(slides).tolist()
+            slides = [
+                slide
+                for slide, confidence in zip(slides, confidences, strict=True)
+                if confidence < self.escalation_threshold
+            ]
+            logger.info(
+                "LLMへ送るスライド: %d / %d（信頼度 < %.2f）",
+                len(slides),
+                total,
+                self.escalation_threshold,
+            )
+            advance(total - len(slides))
+
+        if self.batch_tokens <= 0:
+
+            async def analyze(slide: SlideData) -> None:
+                async with semaphore:
+                    await self.analyze_slide_with_llm(slide)
+                advance(1)
+
+            await asyncio.gather(*(analyze(slide) for slide in slides))
+            return
+
+        pending = [slide for slide in slides if not self._apply_cached(slide)]
+        advance(total - len(pending))
+        batches = self._pack_batches(pending)
+        logger.info("LLM一括解析: %d スライドを %d リクエストで解析", len(pending), len(batches))
+
+        async def analyze_batch(batch: list[SlideData]) -> None:
+            async with semaphore:
+                await self._analyze_batch_with_llm(batch)
+            advance(len(batch))
+
+        await asyncio.gather(*(analyze_batch(batch) for batch in batches))
+
+    def analyze_slide(self, slide: SlideData) -> SlideData:
+        """1スライド分のレイアウトを解析する.
+
+        ストリーミング変換でスライドを1枚ずつ処理するためのメソッド。
+        判定ロジックは analyze_presentation と同一（LLM クライアントがあれば LLM、
+        失敗時とクライアントが無い場合はヒューリスティック。escalation_threshold が
+        設定されている場合は信頼度の低いスライドのみ LLM）。
+
+        Args:
+            slide: 抽出済みスライドデータ
+
+        Returns:
+            各 TextBlock の element_type が更新された同一オブジェクト
+        """
+        if self.client is None:
+            self._analyze_slide_heuristic(slide)
+        elif self.escalation_threshold <= 0 or self._needs_escalation(slide):
+            self._run(self.analyze_slide_with_llm(slide))
+        return slide
+
+    def _needs_escalation(self, slide: SlideData) -> bool:
+        """ヒューリスティックで判定し、信頼度が escalation_threshold 未満かを返す.
+
+        判定結果はスライドに反映されたままになる（LLM に送らない場合はそれが最終結果）。
+
+        Args:
+            slide: 1スライド分のデータ
+
+        Returns:
+            LLM に送るべき場合は True
+        """
+        confidence = min(self._analyze_slide_heuristic(slide), default=1.0)
+        return confidence < self.escalation_threshold
+
+    def _analyze_slide_heuristic(self, slide: SlideData) -> list[float]:
         """ヒューリスティック（ルールベース）でスライドレイアウトを解析する.
 
         座標、フォントサイズ、テキスト内容に基づいて各テキストブロックの
@@ -83,22 +272,25 @@ class LayoutAnalyzer:
 
         Args:
             slide: 1スライド分のデータ
+
+        Returns:
+            各テキストブロックの判定の信頼度（0.0〜1.0、text_blocks と同じ順）
         """
         if not slide.text_blocks:
-            return
+            return []
 
-        # フォントサイズで降順ソートし、最大サイズを取得
-        sorted_by_size = sorted(
-            slide.text_blocks,
-            key=lambda b: max((s.font.size for s in b.spans), default=0),
-            reverse=True,
-        )
+        # スライド内の最大フォントサイズ
         max_font_size = max(
             (s.font.size for b in slide.text_blocks for s in b.spans), default=12.0
         )
 
+        confidences = []
         for block in slide.text_blocks:
-            block.element_type = self._classify_block(block, slide, max_font_size)
+            block.element_type, confidence = self._classify_block_with_confidence(
+                block, slide, max_font_size
+            )
+            confidences.append(confidence)
+        return confidences
 
     def _classify_block(
         self, block: TextBlock, slide: SlideData, max_font_size: float
@@ -113,9 +305,29 @@ class LayoutAnalyzer:
         Returns:
             判定されたElementType
         """
+        return self._classify_block_with_confidence(block, slide, max_font_size)[0]
+
+    def _classify_block_with_confidence(
+        self, block: TextBlock, slide: SlideData, max_font_size: float
+    ) -> tuple[ElementType, float]:
+        """個別のテキストブロックを分類し、判定の信頼度を返す.
+
+        信頼度は、判定までに評価した各ルールの結果が覆るまでの余裕（フォントサイズ比・
+        相対位置としきい値の差）の最小値。成立したルールは全条件の余裕の最小値、
+        不成立のルールは不成立だった条件の余裕の最大値をそのルールの余裕とする。
+        余裕が FONT_RATIO_MARGIN / POSITION_MARGIN 以上あれば 1.0 になる。
+
+        Args:
+            block: 分類対象のテキストブロック
+            slide: スライドデータ（相対位置の計算に使用）
+            max_font_size: スライド内の最大フォントサイズ
+
+        Returns:
+            (判定されたElementType, 信頼度 0.0〜1.0)
+        """
         text = block.full_text.strip()
         if not text:
-            return ElementType.UNKNOWN
+            return ElementType.UNKNOWN, 1.0
 
         avg_font_size = (
             sum(s.font.size for s in block.spans) / len(block.spans) if block.spans else 12.0
@@ -124,43 +336,70 @@ class LayoutAnalyzer:
         # 相対位置（0.0 = 上端, 1.0 = 下端）
         relative_y = block.bbox.y0 / slide.height if slide.height > 0 else 0.5
 
-        # フッター判定: 下部 20% にある小さいテキスト
-        if relative_y > 0.85 and avg_font_size < max_font_size * 0.6:
-            return ElementType.FOOTER
-
-        # ヘッダー判定: 上部 10% にある小さいテキスト
-        if relative_y < 0.1 and avg_font_size < max_font_size * 0.7:
-            return ElementType.HEADER
-
-        # タイトル判定: 大きいフォントサイズ
-        if avg_font_size >= max_font_size * 0.85 and relative_y < 0.4:
-            return ElementType.TITLE
+        font_scale = max_font_size * FONT_RATIO_MARGIN
+        rules = (
+            # フッター判定: 下部 20% にある小さいテキスト
+            (
+                ElementType.FOOTER,
+                (
+                    (relative_y, operator.gt, 0.85, POSITION_MARGIN),
+                    (avg_font_size, operator.lt, max_font_size * 0.6, font_scale),
+                ),
+            ),
+            # ヘッダー判定: 上部 10% にある小さいテキスト
+            (
+                ElementType.HEADER,
+                (
+                    (relative_y, operator.lt, 0.1, POSITION_MARGIN),
+                    (avg_font_size, operator.lt, max_font_size * 0.7, font_scale),
+                ),
+            ),
+            # タイトル判定: 大きいフォントサイズ
+            (
+                ElementType.TITLE,
+                (
+                    (avg_font_size, operator.ge, max_font_size * 0.85, font_scale),
+                    (relative_y, operator.lt, 0.4, POSITION_MARGIN),
+                ),
+            ),
+            # サブタイトル判定
+            (
+                ElementType.SUBTITLE,
+                (
+                    (avg_font_size, operator.ge, max_font_size * 0.65, font_scale),
+                    (relative_y, operator.lt, 0.45, POSITION_MARGIN),
+                ),
+            ),
+        )
 
-        # サブタイトル判定
-        if avg_font_size >= max_font_size * 0.65 and relative_y < 0.45:
-            return ElementType.SUBTITLE
+        confidence = 1.0
+        for element_type, conditions in rules:
+            checks = [
+                (compare(value, threshold), _margin(value, threshold, scale))
+                for value, compare, threshold, scale in conditions
+            ]
+            if all(passed for passed, _ in checks):
+                return element_type, min(confidence, *(margin for _, margin in checks))
+            confidence = min(confidence, max(margin for passed, margin in checks if not passed))
 
         # 箇条書き判定: 先頭文字が箇条書き記号
         bullet_chars = {"•", "・", "‣", "◦", "▪", "▸", "►", "■", "-", "–", "―"}
         if text and (text[0] in bullet_chars or (len(text) > 2 and text[1] == ".")):
-            return ElementType.BULLET
+            return ElementType.BULLET, confidence
 
         # それ以外は本文
-        return ElementType.BODY
+        return ElementType.BODY, confidence
 
-    async def analyze_slide_with_llm(self, slide: SlideData) -> None:
-        """LLM（Claude API）を使用してスライドレイアウトを解析する.
+    @staticmethod
+    def _blocks_info(slide: SlideData) -> list[dict[str, Any]]:
+        """LLM に送るテキストブロック情報を返す（LLMキャッシュのキーにも使う）.
 
         Args:
             slide: 1スライド分のデータ
 
-        Raises:
-            RuntimeError: APIクライアントが設定されていない場合
+        Returns:
+            block_index・テキスト・座標・平均フォントサイズ・太字の有無の辞書のリスト
         """
-        if self.client is None:
-            raise RuntimeError("Anthropic APIクライアントが設定されていません。")
-
-        # テキストブロック情報をJSON化
         blocks_info = []
         for idx, block in enumerate(slide.text_blocks):
             blocks_info.append(
@@ -182,36 +421,268 @@ class LayoutAnalyzer:
                     "is_bold": any(s.font.bold for s in block.spans),
                 }
             )
+        return blocks_info
+
+    def _cache_key(self, slide: SlideData, blocks_info: list[dict[str, Any]]) -> str:
+        """スライドの LLM キャッシュキーを返す."""
+        payload = {"size": [round(slide.width), round(slide.height)], "blocks": blocks_info}
+        return layout_key(payload, self.model, LAYOUT_PROMPT_VERSION)
+
+    def _apply_cached(self, slide: SlideData) -> bool:
+        """キャッシュ済みの判定結果があればスライドに反映する.
+
+        テキストブロックが無いスライドは解析不要のため、反映済みとして扱う。
+
+        Args:
+            slide: 1スライド分のデータ
+
+        Returns:
+            反映した（LLM に送る必要が無い）場合は True
+        """
+        if not slide.text_blocks:
+            return True
+        if self.cache is None:
+            return False
+        cached = self.cache.get(self._cache_key(slide, self._blocks_info(slide)))
+        if cached is None:
+            return False
+        self._apply_element_types(slide, cached)
+        logger.debug("LLMキャッシュにヒット: スライド %d", slide.page_number)
+        return True
+
+    @staticmethod
+    def _encode_slide_table(slide: SlideData, blocks_info: list[dict[str, Any]]) -> str:
+        """テキストブロック情報を一括解析用の表形式（1ブロック1行）に変換する.
+
+        JSON のキー名や空白を繰り返さないため、同じ情報を少ないトークンで表せる。
+        テキストは行末の列なので、区切り文字 | を含んでいても列はずれない。
+
+        Args:
+            slide: 1スライド分のデータ
+            blocks_info: _blocks_info() の戻り値
+
+        Returns:
+            「# <ページ番号> <幅>x<高さ>」の行で始まる複数行の文字列
+        """
+        lines = [f"# {slide.page_number} {slide.width:.0f}x{slide.height:.0f}"]
+        for info in blocks_info:
+            bbox = info["bbox"]
+            text = " ".join(info["text"].split())
+            lines.append(
+                f"{info['block_index']}|{bbox['x0']:g}|{bbox['y0']:g}|{bbox['x1']:g}|{bbox['y1']:g}"
+                f"|{info['avg_font_size']:g}|{int(info['is_bold'])}|{text}"
+            )
+        return "\n".join(lines)
+
+    def _pack_batches(self, slides: list[SlideData]) -> list[list[SlideData]]:
+        """スライドを入力トークン数が batch_tokens 以下になるようにまとめる.
+
+        1枚で batch_tokens を超えるスライドは単独のバッチにする。
+
+        Args:
+            slides: LLM で解析するスライド（ページ順）
+
+        Returns:
+            バッチのリスト
+        """
+        batches: list[list[SlideData]] = []
+        current: list[SlideData] = []
+        current_tokens = 0
+        for slide in slides:
+            tokens = estimate_tokens(self._encode_slide_table(slide, self._blocks_info(slide)))
+            if current and current_tokens + tokens > self.batch_tokens:
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(slide)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _analyze_batch_with_llm(self, slides: list[SlideData]) -> None:
+        """複数スライドを1リクエストで LLM 解析する.
+
+        応答はページ番号と block_index をキーに検証し、全ブロックの判定が揃った
+        スライドだけに反映してキャッシュする。応答に含まれない・不正なスライドと、
+        リクエスト自体が失敗した場合のスライドはヒューリスティックで判定する。
+
+        Args:
+            slides: 解析対象のスライド（テキストブロックを持つもの）
+        """
+        infos = [self._blocks_info(slide) for slide in slides]
+        user_message = "\n".join(
+            self._encode_slide_table(slide, info) for slide, info in zip(slides, infos, strict=True)
+        )
+        block_count = sum(len(slide.text_blocks) for slide in slides)
+        max_tokens = max(LLM_MAX_TOKENS, block_count * _BATCH_OUTPUT_TOKENS_PER_BLOCK)
+        estimated = estimate_tokens(LAYOUT_BATCH_PROMPT + user_message) + max_tokens
+
+        results: dict[str, Any] = {}
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated)
+
+            response = await self.client.messages.create(  # type: ignore[union-attr]
+                model=self.model,
+                max_tokens=max_tokens,
+                system=LAYOUT_BATCH_PROMPT,
+                messages=[{"role": "user", "content": user_message}],
+            )
+
+            usage = getattr(response, "usage", None)
+            if self.rate_limiter is not None and usage is not None:
+                self.rate_limiter.settle(estimated, usage.input_tokens + usage.output_tokens)
+
+            parsed = _parse_json(response.content[0].text)
+            if not isinstance(parsed, dict):
+                raise ValueError("応答が JSON オブジェクトではありません")
+            results = parsed
+        except Exception as e:
+            logger.error(
+                "LLM一括解析に失敗 (スライド %s): %s. ヒューリスティック解析にフォールバック",
+                ", ".join(str(slide.page_number) for slide in slides),
+                e,
+            )
 
+        for slide, info in zip(slides, infos, strict=True):
+            element_types = _validate_element_types(
+                results.get(str(slide.page_number)), len(slide.text_blocks)
+            )
+            if element_types is None:
+                if results:
+                    logger.warning(
+                        "スライド %d のLLM判定が不完全です。ヒューリスティック解析にフォールバック",
+                        slide.page_number,
+                    )
+                self._analyze_slide_heuristic(slide)
+                continue
+            self._apply_element_types(slide, element_types)
+            if self.cache is not None:
+                self.cache.put(self._cache_key(slide, info), element_types)
+
+        logger.info("LLM一括解析完了: %d スライド, %d ブロック", len(slides), block_count)
+
+    async def analyze_slide_with_llm(self, slide: SlideData) -> None:
+        """LLM（Claude API）を使用してスライドレイアウトを解析する.
+
+        API 呼び出しや応答の解析に失敗した場合と、応答の判定が全ブロック分揃っていない・
+        不正な要素タイプを含む場合は、このスライドのみヒューリスティックで判定する。
+        キャッシュには全ブロックの判定が揃った結果だけを保存する。
+
+        Args:
+            slide: 1スライド分のデータ
+
+        Raises:
+            RuntimeError: APIクライアントが設定されていない場合
+        """
+        if self.client is None:
+            raise RuntimeError("Anthropic APIクライアントが設定されていません。")
+
+        if self._apply_cached(slide):
+            return
+
+        blocks_info = self._blocks_info(slide)
         user_message = (
             f"スライドサイズ: {slide.width:.0f} x {slide.height:.0f} pt\n\n"
-            f"テキストブロック:\n{json.dumps(blocks_info, ensure_ascii=False, indent=2)}"
+            f"テキストブロック:\n"
+            f"{json.dumps(blocks_info, ensure_ascii=False, separators=(',', ':'))}"
         )
 
+        # 入力の概算と応答の上限をレート制限の消費量として見積もる
+        estimated = estimate_tokens(LAYOUT_ANALYSIS_PROMPT + user_message) + LLM_MAX_TOKENS
         try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated)
+
             # Anthropic API呼び出し
             response = await self.client.messages.create(  # type: ignore[union-attr]
                 model=self.model,
-                max_tokens=1024,
+                max_tokens=LLM_MAX_TOKENS,
                 system=LAYOUT_ANALYSIS_PROMPT,
                 messages=[{"role": "user", "content": user_message}],
             )
 
+            usage = getattr(response, "usage", None)
+            if self.rate_limiter is not None and usage is not None:
+                self.rate_limiter.settle(estimated, usage.input_tokens + usage.output_tokens)
+
             # レスポンス解析
             result_text = response.content[0].text  # type: ignore[index]
-            results = json.loads(result_text)
+            results = _parse_json(result_text)
 
-            for item in results:
-                idx = item.get("block_index")
-                etype = item.get("element_type", "unknown")
-                if idx is not None and 0 <= idx < len(slide.text_blocks):
-                    try:
-                        slide.text_blocks[idx].element_type = ElementType(etype)
-                    except ValueError:
-                        logger.warning("不明な要素タイプ: %s", etype)
+            element_types = _validate_element_types(
+                {str(item.get("block_index")): item.get("element_type") for item in results},
+                len(slide.text_blocks),
+            )
+            if element_types is None:
+                raise ValueError("全ブロックの判定が揃っていません")
+            self._apply_element_types(slide, element_types)
 
-            logger.info("LLM解析完了: %d ブロック", len(results))
+            if self.cache is not None:
+                self.cache.put(self._cache_key(slide, blocks_info), element_types)
+
+            logger.info("LLM解析完了: スライド %d, %d ブロック", slide.page_number, len(results))
 
         except Exception as e:
-            logger.error("LLM解析に失敗: %s. ヒューリスティック解析にフォールバック", e)
+            logger.error(
+                "スライド %d のLLM解析に失敗: %s. ヒューリスティック解析にフォールバック",
+                slide.page_number,
+                e,
+            )
             self._analyze_slide_heuristic(slide)
+
+    @staticmethod
+    def _apply_element_types(slide: SlideData, element_types: dict[int, str]) -> None:
+        """block_index → element_type の判定結果をスライドに反映する.
+
+        Args:
+            slide: 1スライド分のデータ
+            element_types: LLM の判定結果（またはそのキャッシュ）
+        """
+        for idx, etype in element_types.items():
+            slide.text_blocks[idx].element_type = ElementType(etype)
+
+
+def _margin(value: float, threshold: float, scale: float) -> float:
+    """しきい値までの距離を scale で正規化した余裕（0.0〜1.0）を返す."""
+    if scale <= 0:
+        return 1.0
+    return min(abs(value - threshold) / scale, 1.0)
+
+
+def _parse_json(text: str) -> Any:
+    """LLM の応答テキストから JSON を取り出す（```json のコードブロックにも対応）.
+
+    Raises:
+        ValueError: JSON として解析できない場合
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+def _validate_element_types(entry: Any, block_count: int) -> Optional[dict[int, str]]:
+    """LLM の応答のうち1スライド分を検証する.
+
+    Args:
+        entry: block_index（文字列）→ element_type のオブジェクト
+        block_count: スライドのテキストブロック数
+
+    Returns:
+        全ブロックの判定が揃っていれば block_index → element_type の辞書、そうでなければ None
+    """
+    if not isinstance(entry, dict):
+        return None
+    element_types: dict[int, str] = {}
+    for key, etype in entry.items():
+        try:
+            idx = int(key)
+            element_types[idx] = ElementType(etype).value
+        except (TypeError, ValueError):
+            logger.warning("不正なLLM判定: %s → %s", key, etype)
+            return None
+    if sorted(element_types) != list(range(block_count)):
+        return None
+    return element_types
@@ -0,0 +1,168 @@
+"""LLM レイアウト判定のキャッシュ - 同じレイアウトの再解析で API 呼び出しを省略する.
+
+キーは analyze_slide_with_llm が送るテキストブロック情報（とスライドサイズ）を
+正規化した JSON に、モデル名とプロンプトのバージョンを加えたハッシュ。
+値は block_index ごとの element_type。SQLite に保存し、TTL を過ぎたエントリは
+ミスとして削除する。件数が上限を超えたら最後に使われた時刻が古いものから削除する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from src.utils.cache_stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CACHE_TTL_SEC = 30 * 24 * 3600
+DEFAULT_LLM_CACHE_MAX_ENTRIES = 50_000
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS layout (
+    key TEXT PRIMARY KEY,
+    element_types TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)"""
+
+
+def layout_key(payload: Any, model: str, prompt_version: int) -> str:
+    """LLM に送るペイロードからキャッシュキーを計算する.
+
+    キーの順序や空白の違いで別のキーにならないよう、JSON を正規化してからハッシュする。
+
+    Args:
+        payload: テキストブロック情報とスライドサイズ（JSON 化できる値）
+        model: LLM モデル名
+        prompt_version: システムプロンプトのバージョン
+
+    Returns:
+        SHA-256 の16進文字列
+    """
+    normalized = json.dumps(
+        {"payload": payload, "model": model, "prompt": prompt_version},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class LLMLayoutCache:
+    """スライドごとの LLM 判定結果を保存する、TTL と件数上限付きの SQLite キャッシュ.
+
+    複数プロセスから同じファイルを共有できる（書き込みは SQLite のロックで直列化される）。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        ttl_sec: float = DEFAULT_LLM_CACHE_TTL_SEC,
+        max_entries: int = DEFAULT_LLM_CACHE_MAX_ENTRIES,
+    ) -> None:
+        """LLMLayoutCacheを初期化する.
+
+        Args:
+            db_path: SQLite ファイルのパス（親ディレクトリは自動作成する）
+            ttl_sec: エントリの有効期間（秒）。0 以下で無期限
+            max_entries: 保持するエントリ数の上限
+        """
+        self.db_path = Path(db_path)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """データベース接続を閉じる."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get(self, key: str) -> Optional[dict[int, str]]:
+        """キャッシュ済みの判定結果を返す.
+
+        Args:
+            key: layout_key() で計算したキー
+
+        Returns:
+            block_index → element_type の辞書。ミスまたは期限切れの場合は None
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT element_types, created_at FROM layout WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            if self.ttl_sec > 0 and now - row[1] > self.ttl_sec:
+                conn.execute("DELETE FROM layout WHERE key = ?", (key,))
+                conn.commit()
+                self.stats.misses += 1
+                self.stats.evictions += 1
+                return None
+            conn.execute("UPDATE layout SET used_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        self.stats.hits += 1
+        return {int(index): etype for index, etype in json.loads(row[0]).items()}
+
+    def put(self, key: str, element_types: dict[int, str]) -> None:
+        """判定結果を保存し、上限を超えた分を追い出す.
+
+        Args:
+            key: layout_key() で計算したキー
+            element_types: block_index → element_type の辞書
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO layout (key, element_types, created_at, used_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(element_types), now, now),
+            )
+            self.stats.evictions += self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> int:
+        """期限切れのエントリと、件数の上限を超えた古いエントリを削除する.
+
+        Returns:
+            削除したエントリ数
+        """
+        evicted = 0
+        if self.ttl_sec > 0:
+            evicted += conn.execute(
+                "DELETE FROM layout WHERE created_at < ?", (now - self.ttl_sec,)
+            ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM layout").fetchone()[0]
+        if count > self.max_entries:
+            evicted += conn.execute(
+                "DELETE FROM layout WHERE key IN"
+                " (SELECT key FROM layout ORDER BY used_at LIMIT ?)",
+                (count - self.max_entries,),
+            ).rowcount
+        if evicted:
+            logger.debug("LLMキャッシュから %d 件削除", evicted)
+        return evicted
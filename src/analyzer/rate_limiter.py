@@ -0,0 +1,100 @@
+"""LLM API 呼び出しのレート制限（リクエスト数・トークン数 / 分）."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """1分あたりの上限を連続的に補充するトークンバケット."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount を消費できるまでの待ち時間（秒）を返す."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """amount を消費する（負の残量は後続の待ち時間として扱われる）."""
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """requests / tokens per minute を超えないよう LLM 呼び出しを待たせる.
+
+    asyncio 用。acquire() は呼び出し順に許可を出す。
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ) -> None:
+        """RateLimiterを初期化する.
+
+        Args:
+            requests_per_minute: 1分あたりのリクエスト数上限（None または 0 で無制限）
+            tokens_per_minute: 1分あたりのトークン数上限（None または 0 で無制限）
+        """
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """1リクエスト分（推定 tokens トークン）の許可を得るまで待つ.
+
+        Args:
+            tokens: このリクエストで消費する推定トークン数
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                wait = 0.0
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_time(1))
+                if self._tokens is not None:
+                    wait = max(wait, self._tokens.wait_time(tokens))
+                if wait <= 0:
+                    break
+                logger.debug("レート制限により %.2f 秒待機", wait)
+                await asyncio.sleep(wait)
+            if self._requests is not None:
+                self._requests.consume(1)
+            if self._tokens is not None:
+                self._tokens.consume(tokens)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """実際の使用トークン数との差を反映する.
+
+        Args:
+            estimated: acquire() に渡した推定トークン数
+            actual: API が返した実際のトークン数
+        """
+        if self._tokens is not None:
+            self._tokens.consume(actual - estimated)
+
+
+def estimate_tokens(text: str) -> int:
+    """プロンプトのトークン数を概算する（ASCII は約4文字、それ以外は約1文字で1トークン）."""
+    ascii_chars = sum(1 for ch in text if ch < "\x80")
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
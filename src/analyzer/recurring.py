@@ -0,0 +1,246 @@
+"""デッキ全体で繰り返し現れる要素（フッター・ページ番号・ロゴなど）の検出.
+
+テキストブロックと画像ブロックを (内容のハッシュ, 量子化した座標) のキーで全ページに
+わたって索引し、多くのスライドに同じ位置で現れる要素を見つける。見つけた要素は
+PPTXBuilder がスライドレイアウトに1度だけ配置し、各スライドからは省く。
+
+レイアウトのシェイプはスライドのシェイプより下に描かれるため、スライド上で先に描かれる
+（下にある）別のブロックと重なる要素はレイアウトに移さない。移すと、元は上に描かれていた
+要素がそのブロックに隠れてしまう。
+
+ページ番号は、ヘッダー・フッターと判定されたブロックに限り、スライドの通し番号と一致する
+数字を PAGE_NUMBER_TOKEN に置き換えてからキーを計算するため、「3」「4」…のように
+内容の異なるフッターも同じ要素として扱える。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import re
+from collections import defaultdict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+from src.models import BoundingBox, ElementType, ImageBlock, PresentationData, SlideData, TextBlock
+
+logger = logging.getLogger(__name__)
+
+# スライド番号フィールドに置き換えるページ番号の目印
+PAGE_NUMBER_TOKEN = "‹#›"
+
+# ページ番号を探す要素タイプ
+_PAGE_NUMBER_TYPES = frozenset({ElementType.HEADER, ElementType.FOOTER})
+
+# 座標を量子化する格子の間隔 (pt)
+_GRID_PT = 2.0
+
+# 繰り返し要素とみなす出現率と最小スライド数
+DEFAULT_MIN_FRACTION = 0.6
+DEFAULT_MIN_SLIDES = 3
+
+
+@dataclass
+class RecurringElements:
+    """レイアウトに移す繰り返し要素と、それを省くスライド・ブロックの対応."""
+
+    text_blocks: list[TextBlock] = field(default_factory=list)
+    image_blocks: list[ImageBlock] = field(default_factory=list)
+    # レイアウトを使うスライドの位置（data.slides のインデックス）
+    slide_indices: frozenset[int] = frozenset()
+    # スライドの位置 → 省くテキストブロック / 画像ブロックのインデックス
+    skipped_text: dict[int, frozenset[int]] = field(default_factory=dict)
+    skipped_images: dict[int, frozenset[int]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.slide_indices)
+
+
+def _quantize(block: TextBlock | ImageBlock) -> tuple[int, ...]:
+    """座標を _GRID_PT の格子に丸めたタプルを返す."""
+    bbox = block.bbox
+    return tuple(round(v / _GRID_PT) for v in (bbox.x0, bbox.y0, bbox.x1, bbox.y1))
+
+
+def _page_pattern(position: int) -> re.Pattern[str]:
+    return re.compile(rf"(?<!\d){position}(?!\d)")
+
+
+def _normalize_text_block(block: TextBlock, pattern: re.Pattern[str]) -> TextBlock:
+    """ページ番号を PAGE_NUMBER_TOKEN に置き換えたテキストブロックを返す.
+
+    一致するページ番号が無ければ元のブロックをそのまま返す。
+    """
+    texts = [pattern.sub(PAGE_NUMBER_TOKEN, span.text) for span in block.spans]
+    if all(new == span.text for new, span in zip(texts, block.spans, strict=True)):
+        return block
+    normalized = block.model_copy(deep=True)
+    for span, text in zip(normalized.spans, texts, strict=True):
+        span.text = text
+    return normalized
+
+
+def _text_key(block: TextBlock) -> Hashable:
+    """テキストブロックの内容（テキストと書式）のハッシュと量子化した座標のキー."""
+    digest = hashlib.sha1()
+    for span in block.spans:
+        font = span.font
+        digest.update(
+            f"{span.text}\x00{font.name}\x00{font.size}\x00{font.bold}\x00{font.italic}"
+            f"\x00{font.color}\x01".encode()
+        )
+    return ("text", digest.hexdigest(), block.alignment, _quantize(block))
+
+
+def _drawing_order(slide: SlideData) -> list[TextBlock | ImageBlock]:
+    """スライドのブロックを描画順（PPTXBuilder と同じくテキスト → 画像）に並べる."""
+    return [*slide.text_blocks, *slide.image_blocks]
+
+
+def _overlaps(a: BoundingBox, b: BoundingBox) -> bool:
+    """2つの矩形が正の面積で重なるか."""
+    return min(a.x1, b.x1) > max(a.x0, b.x0) and min(a.y1, b.y1) > max(a.y0, b.y0)
+
+
+def _is_drawn(block: TextBlock | ImageBlock) -> bool:
+    """ブロックがスライド上に見える内容を持つか."""
+    if isinstance(block, TextBlock):
+        return bool(block.full_text.strip())
+    return block.has_payload
+
+
+def _is_covered(blocks: list[TextBlock | ImageBlock], order: int, promoted: set[int]) -> bool:
+    """レイアウトに移すと、スライドに残る先に描かれたブロックに隠れるか.
+
+    Args:
+        blocks: 描画順に並べたスライドのブロック
+        order: 調べるブロックの描画順の位置
+        promoted: レイアウトに移すことにしたブロックの描画順の位置
+
+    Returns:
+        スライドに残るブロックのうち、先に描かれて bbox が重なるものがあれば True
+    """
+    bbox = blocks[order].bbox
+    return any(
+        index not in promoted and _is_drawn(block) and _overlaps(block.bbox, bbox)
+        for index, block in enumerate(blocks[:order])
+    )
+
+
+def find_recurring_elements(
+    data: PresentationData,
+    min_fraction: float = DEFAULT_MIN_FRACTION,
+    min_slides: int = DEFAULT_MIN_SLIDES,
+) -> RecurringElements:
+    """多くのスライドに同じ位置で現れるテキスト・画像を見つける.
+
+    出現スライド数の多い要素から順に採用し、採用した要素をすべて含むスライドが
+    しきい値以上残る範囲で要素を増やす。レイアウトはそれらのスライドにだけ適用する。
+    スライドに残るブロックの下に隠れてしまうスライドでは、要素は出現しないものとみなす。
+
+    Args:
+        data: 解析済みプレゼンテーションデータ
+        min_fraction: 繰り返し要素とみなすスライドの割合
+        min_slides: 繰り返し要素とみなす最小スライド数
+
+    Returns:
+        検出結果（該当なしの場合は偽となる空の RecurringElements）
+    """
+    total = len(data.slides)
+    threshold = max(min_slides, math.ceil(total * min_fraction))
+    if total < threshold:
+        return RecurringElements()
+
+    # キー → {スライド位置: ブロックのインデックス}（1スライドで最初の出現のみ）
+    occurrences: dict[Hashable, dict[int, int]] = defaultdict(dict)
+    representatives: dict[Hashable, TextBlock | ImageBlock] = {}
+
+    for position, slide in enumerate(data.slides):
+        pattern = _page_pattern(position + 1)
+        for index, block in enumerate(slide.text_blocks):
+            if not block.full_text.strip():
+                continue
+            normalized = block
+            if block.element_type in _PAGE_NUMBER_TYPES:
+                normalized = _normalize_text_block(block, pattern)
+            key = _text_key(normalized)
+            occurrences[key].setdefault(position, index)
+            representatives.setdefault(key, normalized)
+
+    # 画像は位置で候補を絞ってから内容をハッシュする（同じ xref は1度だけ読む）
+    by_position: dict[Hashable, list[tuple[int, int]]] = defaultdict(list)
+    for position, slide in enumerate(data.slides):
+        for index, image in enumerate(slide.image_blocks):
+            if image.has_payload:
+                by_position[_quantize(image)].append((position, index))
+    xref_digests: dict[int, str] = {}
+    for bbox_key, entries in by_position.items():
+        if len({position for position, _ in entries}) < threshold:
+            continue
+        for position, index in entries:
+            image = data.slides[position].image_blocks[index]
+            digest = xref_digests.get(image.xref) if image.xref is not None else None
+            if digest is None:
+                digest = hashlib.sha1(image.load_payload()).hexdigest()
+                if image.xref is not None:
+                    xref_digests[image.xref] = digest
+            key = ("image", digest, bbox_key)
+            occurrences[key].setdefault(position, index)
+            representatives.setdefault(key, image)
+
+    candidates = sorted(
+        (key for key, slides in occurrences.items() if len(slides) >= threshold),
+        key=lambda key: len(occurrences[key]),
+        reverse=True,
+    )
+    selected: list[Hashable] = []
+    slide_set: set[int] = set(range(total))
+    drawn = [_drawing_order(slide) for slide in data.slides]
+    # スライド位置 → レイアウトに移すブロックの描画順の位置
+    promoted: dict[int, set[int]] = defaultdict(set)
+
+    def order_of(key: Hashable, position: int) -> int:
+        index = occurrences[key][position]
+        is_text = isinstance(representatives[key], TextBlock)
+        return index if is_text else len(data.slides[position].text_blocks) + index
+
+    for key in candidates:
+        remaining = {
+            position
+            for position in slide_set & occurrences[key].keys()
+            if not _is_covered(drawn[position], order_of(key, position), promoted[position])
+        }
+        if len(remaining) >= threshold:
+            selected.append(key)
+            slide_set = remaining
+            for position in remaining:
+                promoted[position].add(order_of(key, position))
+
+    if not selected:
+        return RecurringElements()
+
+    result = RecurringElements(slide_indices=frozenset(slide_set))
+    skipped_text: dict[int, set[int]] = defaultdict(set)
+    skipped_images: dict[int, set[int]] = defaultdict(set)
+    for key in selected:
+        element = representatives[key]
+        if isinstance(element, TextBlock):
+            result.text_blocks.append(element)
+            target = skipped_text
+        else:
+            result.image_blocks.append(element)
+            target = skipped_images
+        for position in slide_set:
+            target[position].add(occurrences[key][position])
+    result.skipped_text = {k: frozenset(v) for k, v in skipped_text.items()}
+    result.skipped_images = {k: frozenset(v) for k, v in skipped_images.items()}
+
+    logger.info(
+        "繰り返し要素: テキスト %d 個, 画像 %d 個を %d / %d スライドのレイアウトに集約",
+        len(result.text_blocks),
+        len(result.image_blocks),
+        len(slide_set),
+        total,
+    )
+    return result
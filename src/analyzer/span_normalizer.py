@@ -0,0 +1,141 @@
+"""抽出済みテキストスパンの正規化モジュール.
+
+PyMuPDF は見た目上1行のテキストを、同じフォント・サイズ・色のまま
+複数のスパンに分割して返すことが多い。Builder はスパンごとに1つのランを
+生成するため、同一書式で同じ行に連続するスパンを構築前に1つにまとめ、
+XML要素数・構築時間・ファイルサイズを削減する。
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from src.models import BoundingBox, PresentationData, SlideData, TextBlock, TextSpan
+
+logger = logging.getLogger(__name__)
+
+# 同じ行とみなす縦方向の重なり率（小さい方のスパン高さに対する割合）
+SAME_LINE_OVERLAP_RATIO = 0.5
+
+# 左方向への後戻りを許容する幅 (pt)。これを超えて戻る場合は改行とみなす
+BACKTRACK_TOLERANCE = 1.0
+
+
+def _on_same_line(a: Optional[BoundingBox], b: Optional[BoundingBox]) -> bool:
+    """2つのスパンが同じ行で左から右へ連続しているかを判定する.
+
+    座標が無いスパン同士は、Builder 上も同じ段落に連結されるため同じ行とみなす。
+
+    Args:
+        a: 先行スパンの座標
+        b: 後続スパンの座標
+
+    Returns:
+        同じ行で連続している場合 True
+    """
+    if a is None or b is None:
+        return a is None and b is None
+
+    overlap = min(a.y1, b.y1) - max(a.y0, b.y0)
+    min_height = min(a.height, b.height)
+    if min_height <= 0 or overlap < min_height * SAME_LINE_OVERLAP_RATIO:
+        return False
+    return b.x0 >= a.x0 - BACKTRACK_TOLERANCE
+
+
+def _union_bbox(a: Optional[BoundingBox], b: Optional[BoundingBox]) -> Optional[BoundingBox]:
+    """2つの座標を包含する BoundingBox を返す（どちらかが None なら None）."""
+    if a is None or b is None:
+        return None
+    return BoundingBox(
+        x0=min(a.x0, b.x0),
+        y0=min(a.y0, b.y0),
+        x1=max(a.x1, b.x1),
+        y1=max(a.y1, b.y1),
+    )
+
+
+def merge_spans(spans: list[TextSpan]) -> list[TextSpan]:
+    """同一書式で同じ行に連続するスパンを結合する.
+
+    結合条件:
+        - FontInfo が完全に一致する
+        - どちらのテキストにも改行を含まない（Builder で段落分割の対象になるため）
+        - 同じ行にあり、後続スパンが左から右へ続いている
+
+    空文字のスパンは Builder で出力されないため取り除く。
+
+    Args:
+        spans: 抽出順のスパンリスト
+
+    Returns:
+        結合後のスパンリスト（入力のスパンは変更しない）
+    """
+    merged: list[TextSpan] = []
+    for span in spans:
+        if not span.text:
+            continue
+        if merged:
+            prev = merged[-1]
+            if (
+                (prev.font is span.font or prev.font == span.font)
+                and "\n" not in prev.text
+                and "\n" not in span.text
+                and _on_same_line(prev.bbox, span.bbox)
+            ):
+                merged[-1] = TextSpan(
+                    text=prev.text + span.text,
+                    font=prev.font,
+                    bbox=_union_bbox(prev.bbox, span.bbox),
+                )
+                continue
+        merged.append(span)
+    return merged
+
+
+def normalize_block(block: TextBlock) -> TextBlock:
+    """テキストブロック内のスパンを結合する.
+
+    Args:
+        block: 対象のテキストブロック
+
+    Returns:
+        spans が更新された同一オブジェクト
+    """
+    block.spans = merge_spans(block.spans)
+    return block
+
+
+def normalize_slide(slide: SlideData) -> SlideData:
+    """スライド内の全テキストブロックのスパンを結合する.
+
+    Args:
+        slide: 対象のスライド
+
+    Returns:
+        各 TextBlock の spans が更新された同一オブジェクト
+    """
+    for block in slide.text_blocks:
+        normalize_block(block)
+    return slide
+
+
+def normalize_presentation(presentation: PresentationData) -> PresentationData:
+    """プレゼンテーション全体のスパンを結合する.
+
+    Args:
+        presentation: 解析済みプレゼンテーションデータ
+
+    Returns:
+        各 TextBlock の spans が更新された同一オブジェクト
+    """
+    before = 0
+    after = 0
+    for slide in presentation.slides:
+        for block in slide.text_blocks:
+            before += len(block.spans)
+            normalize_block(block)
+            after += len(block.spans)
+    logger.info("スパン結合: %d → %d", before, after)
+    return presentation
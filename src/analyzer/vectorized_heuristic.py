@@ -0,0 +1,214 @@
+"""プレゼンテーション全体のヒューリスティック判定を NumPy の配列演算で行うモジュール.
+
+全スライドのテキストブロックを1つの特徴量行列（スライド番号・相対位置・平均/最大
+フォントサイズ・太字の割合・先頭文字の種類）にまとめ、LayoutAnalyzer._classify_block と
+同じしきい値・同じ比較で一括判定する。判定結果と信頼度はブロック単位の判定と一致する。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.models import ElementType, SlideData
+
+# 判定結果の配列で使う ElementType のコード
+_LABELS = (
+    ElementType.UNKNOWN,
+    ElementType.FOOTER,
+    ElementType.HEADER,
+    ElementType.TITLE,
+    ElementType.SUBTITLE,
+    ElementType.BULLET,
+    ElementType.BODY,
+)
+_UNKNOWN, _FOOTER, _HEADER, _TITLE, _SUBTITLE, _BULLET, _BODY = range(len(_LABELS))
+
+# 先頭文字の種類
+CHAR_EMPTY = 0
+CHAR_BULLET = 1
+CHAR_OTHER = 2
+
+_BULLET_CHARS = frozenset({"•", "・", "‣", "◦", "▪", "▸", "►", "■", "-", "–", "―"})
+
+# ヒューリスティック判定の信頼度を 1.0 とみなす、しきい値からの余裕
+# （フォントサイズはスライド内最大サイズに対する比、位置はスライド高さに対する比）
+FONT_RATIO_MARGIN = 0.15
+POSITION_MARGIN = 0.1
+
+
+@dataclass
+class BlockFeatures:
+    """全スライドのテキストブロックの特徴量（各配列の長さはブロック数）."""
+
+    slide_id: np.ndarray
+    relative_y: np.ndarray
+    avg_font_size: np.ndarray
+    max_font_size: np.ndarray
+    bold_fraction: np.ndarray
+    first_char: np.ndarray
+    slide_count: int
+
+
+def _first_char_class(text: str) -> int:
+    """strip 済みテキストの先頭文字の種類を返す（箇条書き記号・「1.」形式は CHAR_BULLET）."""
+    if not text:
+        return CHAR_EMPTY
+    if text[0] in _BULLET_CHARS or (len(text) > 2 and text[1] == "."):
+        return CHAR_BULLET
+    return CHAR_OTHER
+
+
+def build_features(slides: Sequence[SlideData]) -> BlockFeatures:
+    """全スライドのテキストブロックから特徴量行列を作る.
+
+    モデルから値を取り出す走査は1回だけ行い、ブロックごとのフォントサイズの合計と
+    テキストの連結もこの走査で済ませる。
+
+    Args:
+        slides: 対象スライド
+
+    Returns:
+        ブロック単位の特徴量
+    """
+    slide_ids: list[int] = []
+    relative_y: list[float] = []
+    avg_sizes: list[float] = []
+    bold_fractions: list[float] = []
+    first_chars: list[int] = []
+    slide_max: list[float] = []
+
+    for slide_id, slide in enumerate(slides):
+        max_size: float | None = None
+        for block in slide.text_blocks:
+            spans = block.spans
+            sizes = [span.font.size for span in spans]
+            if sizes:
+                block_max = max(sizes)
+                max_size = block_max if max_size is None else max(max_size, block_max)
+                avg_sizes.append(sum(sizes) / len(sizes))
+                bold_fractions.append(sum(span.font.bold for span in spans) / len(spans))
+            else:
+                avg_sizes.append(12.0)
+                bold_fractions.append(0.0)
+            slide_ids.append(slide_id)
+            relative_y.append(block.bbox.y0 / slide.height if slide.height > 0 else 0.5)
+            first_chars.append(_first_char_class("".join(span.text for span in spans).strip()))
+        slide_max.append(12.0 if max_size is None else max_size)
+
+    ids = np.asarray(slide_ids, dtype=np.intp)
+    return BlockFeatures(
+        slide_id=ids,
+        relative_y=np.asarray(relative_y, dtype=np.float64),
+        avg_font_size=np.asarray(avg_sizes, dtype=np.float64),
+        max_font_size=np.asarray(slide_max, dtype=np.float64)[ids],
+        bold_fraction=np.asarray(bold_fractions, dtype=np.float64),
+        first_char=np.asarray(first_chars, dtype=np.int8),
+        slide_count=len(slides),
+    )
+
+
+def _margin(
+    value: np.ndarray, threshold: np.ndarray | float, scale: np.ndarray | float
+) -> np.ndarray:
+    """しきい値までの距離を scale で正規化した余裕（0.0〜1.0）を返す."""
+    scale = np.broadcast_to(scale, value.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.minimum(np.abs(value - threshold) / scale, 1.0)
+    return np.where(scale > 0, margin, 1.0)
+
+
+def classify(features: BlockFeatures) -> tuple[np.ndarray, np.ndarray]:
+    """特徴量から全ブロックの判定結果と信頼度を計算する.
+
+    規則の順序と信頼度の定義は LayoutAnalyzer._classify_block_with_confidence と同じ。
+
+    Args:
+        features: build_features() の戻り値
+
+    Returns:
+        (_LABELS のインデックスの配列, 信頼度の配列)
+    """
+    y = features.relative_y
+    size = features.avg_font_size
+    max_size = features.max_font_size
+    font_scale = max_size * FONT_RATIO_MARGIN
+
+    # (規則のコード, ((条件の成否, 余裕), ...))
+    rules = (
+        (
+            _FOOTER,
+            (
+                (y > 0.85, _margin(y, 0.85, POSITION_MARGIN)),
+                (size < max_size * 0.6, _margin(size, max_size * 0.6, font_scale)),
+            ),
+        ),
+        (
+            _HEADER,
+            (
+                (y < 0.1, _margin(y, 0.1, POSITION_MARGIN)),
+                (size < max_size * 0.7, _margin(size, max_size * 0.7, font_scale)),
+            ),
+        ),
+        (
+            _TITLE,
+            (
+                (size >= max_size * 0.85, _margin(size, max_size * 0.85, font_scale)),
+                (y < 0.4, _margin(y, 0.4, POSITION_MARGIN)),
+            ),
+        ),
+        (
+            _SUBTITLE,
+            (
+                (size >= max_size * 0.65, _margin(size, max_size * 0.65, font_scale)),
+                (y < 0.45, _margin(y, 0.45, POSITION_MARGIN)),
+            ),
+        ),
+    )
+
+    empty = features.first_char == CHAR_EMPTY
+    labels = np.where(features.first_char == CHAR_BULLET, _BULLET, _BODY).astype(np.int8)
+    confidence = np.ones_like(y)
+    # 判定が決まるまでに不成立だった規則の余裕の最小値
+    running = np.ones_like(y)
+    decided = empty.copy()
+
+    for code, ((pass1, margin1), (pass2, margin2)) in rules:
+        passed = pass1 & pass2
+        hit = passed & ~decided
+        labels[hit] = code
+        confidence = np.where(hit, np.minimum(running, np.minimum(margin1, margin2)), confidence)
+        failed_margin = np.maximum(np.where(pass1, 0.0, margin1), np.where(pass2, 0.0, margin2))
+        running = np.where(~passed & ~decided, np.minimum(running, failed_margin), running)
+        decided |= passed
+
+    confidence = np.where(decided, confidence, running)
+    labels[empty] = _UNKNOWN
+    confidence[empty] = 1.0
+    return labels, confidence
+
+
+def analyze_slides(slides: Sequence[SlideData]) -> np.ndarray:
+    """全スライドの各テキストブロックに element_type を付与する.
+
+    Args:
+        slides: 対象スライド
+
+    Returns:
+        スライドごとの判定の信頼度（ブロックの最小値。ブロックが無いスライドは 1.0）
+    """
+    features = build_features(slides)
+    labels, confidence = classify(features)
+
+    codes = labels.tolist()
+    index = 0
+    for slide in slides:
+        for block in slide.text_blocks:
+            block.element_type = _LABELS[codes[index]]
+            index += 1
+
+    slide_confidence = np.ones(features.slide_count, dtype=np.float64)
+    np.minimum.at(slide_confidence, features.slide_id, confidence)
+    return slide_confidence
@@ -0,0 +1,515 @@
+"""バッチ変換 - 複数のPDFをワーカープロセスで並列に変換する.
+
+ディレクトリまたは glob パターンで指定した PDF をまとめて変換し、
+ファイルごとの結果（状態・所要時間・ページ/秒）を JSON のサマリーに書き出す。
+1ファイルの失敗はバッチ全体を止めず、そのファイルの結果として記録する。
+変換中にワーカープロセスが異常終了した場合も、プールを作り直して未完了の
+ファイルだけを変換し直し、異常終了を起こしたファイルだけを失敗として記録する。
+
+使い方:
+    python -m src.batch input/ "archive/**/*.pdf" -o output/ -j 8
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from multiprocessing.queues import SimpleQueue
+from pathlib import Path
+from typing import Optional
+
+import click
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+from src.utils.progress import STAGE_BUILD
+
+logger = logging.getLogger(__name__)
+
+# ファイルごとの変換結果
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+@dataclass
+class BatchItem:
+    """1ファイル分の変換対象."""
+
+    input_path: Path
+    output_path: Path
+
+
+@dataclass
+class FileResult:
+    """1ファイル分の変換結果."""
+
+    input: str
+    output: str
+    status: str
+    duration_sec: float = 0.0
+    pages: int = 0
+    pages_per_sec: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    """バッチ全体の変換結果."""
+
+    files: list[FileResult]
+    duration_sec: float
+
+    def count(self, status: str) -> int:
+        """指定した状態のファイル数を返す."""
+        return sum(1 for result in self.files if result.status == status)
+
+    def to_dict(self) -> dict[str, object]:
+        """JSON に書き出す辞書を返す."""
+        return {
+            "total": len(self.files),
+            "succeeded": self.count(STATUS_SUCCEEDED),
+            "failed": self.count(STATUS_FAILED),
+            "skipped": self.count(STATUS_SKIPPED),
+            "duration_sec": round(self.duration_sec, 3),
+            "files": [asdict(result) for result in self.files],
+        }
+
+    def write(self, path: str | Path) -> Path:
+        """サマリーを JSON ファイルに書き出す.
+
+        Args:
+            path: 出力先の JSON ファイルパス
+
+        Returns:
+            書き出したファイルの Path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+
+def collect_inputs(
+    specs: list[str], output_dir: Optional[str | Path] = None
+) -> list[BatchItem]:
+    """ディレクトリ・glob パターン・ファイルから変換対象を列挙する.
+
+    ディレクトリは配下の *.pdf を再帰的に列挙し、output_dir 指定時はディレクトリ内の
+    相対パスを保ったまま出力する。glob パターンはワイルドカードを含まない先頭部分からの
+    相対パスを保つ。output_dir 未指定時は入力PDFと同じ場所に .pptx を出力する。
+
+    Args:
+        specs: ディレクトリ・glob パターン・PDFファイルのパス
+        output_dir: 出力ディレクトリ
+
+    Returns:
+        重複を除いた変換対象のリスト（指定順）
+
+    Raises:
+        ValueError: 異なる入力PDFの出力先が同じファイルになる場合
+    """
+    items: list[BatchItem] = []
+    seen: set[Path] = set()
+    outputs: dict[Path, Path] = {}
+
+    def add(pdf_path: Path, relative: Path) -> None:
+        resolved = pdf_path.resolve()
+        if resolved in seen:
+            return
+        seen.add(resolved)
+        if output_dir is None:
+            output_path = pdf_path.with_suffix(".pptx")
+        else:
+            output_path = Path(output_dir) / relative.with_suffix(".pptx")
+        key = output_path.resolve()
+        if key in outputs:
+            raise ValueError(
+                f"出力先が重複しています: {outputs[key]} と {pdf_path} -> {output_path}"
+            )
+        outputs[key] = pdf_path
+        items.append(BatchItem(input_path=pdf_path, output_path=output_path))
+
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            for pdf_path in sorted(path.rglob("*")):
+                if pdf_path.is_file() and pdf_path.suffix.lower() == ".pdf":
+                    add(pdf_path, pdf_path.relative_to(path))
+        elif glob.has_magic(spec):
+            base = _glob_base(spec)
+            for match in sorted(glob.glob(spec, recursive=True)):
+                pdf_path = Path(match)
+                if pdf_path.is_file() and pdf_path.suffix.lower() == ".pdf":
+                    add(pdf_path, pdf_path.relative_to(base))
+        elif path.is_file():
+            add(path, Path(path.name))
+        else:
+            logger.warning("入力が見つかりません: %s", spec)
+    return items
+
+
+def _glob_base(spec: str) -> Path:
+    """glob パターンのうち、ワイルドカードを含まない先頭のディレクトリ部分を返す."""
+    parts = Path(spec).parts
+    fixed = 0
+    while fixed < len(parts) - 1 and not glob.has_magic(parts[fixed]):
+        fixed += 1
+    return Path(*parts[:fixed]) if fixed else Path()
+
+
+def is_up_to_date(item: BatchItem) -> bool:
+    """出力ファイルが入力PDFより新しいか."""
+    try:
+        return item.output_path.stat().st_mtime >= item.input_path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+
+
+# ワーカープロセスが変換を開始した入力PDFを親プロセスに知らせるキュー
+_started_queue: Optional[SimpleQueue[str]] = None
+
+
+def _init_worker(started_queue: Optional[SimpleQueue[str]] = None) -> None:
+    """ワーカープロセスの初期化: 変換ごとの進捗表示を抑止する.
+
+    Args:
+        started_queue: 変換を開始した入力PDFのパスを送るキュー
+    """
+    global _started_queue
+    from src import main
+
+    main.console.quiet = True
+    _started_queue = started_queue
+
+
+def _convert_one(
+    item: BatchItem,
+    template_path: Optional[str],
+    use_llm: bool,
+    merge_spans: bool,
+) -> FileResult:
+    """ワーカープロセスで1ファイルを変換する（例外は結果として返す）.
+
+    Args:
+        item: 変換対象
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+        merge_spans: 同一書式スパンを結合するか
+
+    Returns:
+        変換結果
+    """
+    from src.main import convert_pdf_to_pptx
+
+    if _started_queue is not None:
+        # SimpleQueue は put() の時点でパイプに書き込むため、直後に異常終了しても届く
+        _started_queue.put(str(item.input_path))
+
+    pages = 0
+
+    def on_progress(stage: str, completed: int, total: int) -> None:
+        nonlocal pages
+        if stage == STAGE_BUILD:
+            pages = completed
+
+    started = time.perf_counter()
+    try:
+        convert_pdf_to_pptx(
+            item.input_path,
+            item.output_path,
+            template_path=template_path,
+            use_llm=use_llm,
+            save_images=False,
+            merge_spans=merge_spans,
+            on_progress=on_progress,
+        )
+    except Exception as e:
+        return FileResult(
+            input=str(item.input_path),
+            output=str(item.output_path),
+            status=STATUS_FAILED,
+            duration_sec=round(time.perf_counter() - started, 3),
+            error=f"{type(e).__name__}: {e}",
+        )
+
+    duration = time.perf_counter() - started
+    return FileResult(
+        input=str(item.input_path),
+        output=str(item.output_path),
+        status=STATUS_SUCCEEDED,
+        duration_sec=round(duration, 3),
+        pages=pages,
+        pages_per_sec=round(pages / duration, 2) if duration > 0 else 0.0,
+    )
+
+
+def _crashed_result(item: BatchItem) -> FileResult:
+    """変換中にワーカープロセスが異常終了したファイルの結果を返す."""
+    return FileResult(
+        input=str(item.input_path),
+        output=str(item.output_path),
+        status=STATUS_FAILED,
+        error="BrokenProcessPool: 変換中にワーカープロセスが異常終了しました",
+    )
+
+
+def _run_pool(
+    items: list[BatchItem],
+    indexes: list[int],
+    workers: int,
+    convert_args: tuple[Optional[str], bool, bool],
+    on_result: Callable[[int, FileResult], None],
+) -> tuple[list[int], list[int]]:
+    """1つのプロセスプールで変換対象を変換する.
+
+    ワーカープロセスが異常終了してプールが壊れた場合、未完了の変換対象を
+    変換を開始していたもの（異常終了の原因の候補）と開始前のものに分けて返す。
+
+    Args:
+        items: 変換対象の全体
+        indexes: このプールで変換する items の添字
+        workers: ワーカープロセス数
+        convert_args: _convert_one() に渡すテンプレート・LLM・スパン結合の指定
+        on_result: 完了した変換対象の添字と結果を受け取るコールバック
+
+    Returns:
+        (変換中だった添字, 開始前だった添字)。プールが壊れなければどちらも空
+    """
+    started_queue: SimpleQueue[str] = multiprocessing.SimpleQueue()
+    unfinished = set(indexes)
+    broken = False
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(indexes))),
+        initializer=_init_worker,
+        initargs=(started_queue,),
+    ) as executor:
+        futures: dict[Future[FileResult], int] = {
+            executor.submit(_convert_one, items[index], *convert_args): index
+            for index in indexes
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken = True
+                continue
+            except Exception as e:
+                # 引数の受け渡しなど、変換の外で起きた失敗
+                result = FileResult(
+                    input=str(items[index].input_path),
+                    output=str(items[index].output_path),
+                    status=STATUS_FAILED,
+                    error=f"{type(e).__name__}: {e}",
+                )
+            unfinished.discard(index)
+            on_result(index, result)
+
+    if not broken:
+        return [], []
+    by_input = {str(items[index].input_path): index for index in indexes}
+    started: set[int] = set()
+    while not started_queue.empty():
+        started.add(by_input[started_queue.get()])
+    in_flight = started & unfinished
+    return sorted(in_flight), sorted(unfinished - in_flight)
+
+
+def run_batch(
+    items: list[BatchItem],
+    workers: int = 1,
+    force: bool = False,
+    template_path: Optional[str | Path] = None,
+    use_llm: bool = False,
+    merge_spans: bool = True,
+    progress: Optional[Progress] = None,
+) -> BatchSummary:
+    """変換対象をワーカープロセスで並列に変換する.
+
+    ワーカープロセスが異常終了した場合はプールを作り直し、未完了の変換対象だけを
+    投入し直す。異常終了時に変換中だったものが複数あるときは、1件ずつ単独の
+    プールで変換し直して原因のファイルを特定し、そのファイルだけを失敗とする。
+
+    Args:
+        items: collect_inputs() で列挙した変換対象
+        workers: ワーカープロセス数
+        force: 出力が入力より新しい場合も変換し直すか
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+        merge_spans: 同一書式スパンを結合するか
+        progress: 完了ファイル数を表示する rich のプログレス表示
+
+    Returns:
+        入力順に並んだファイルごとの結果を含むサマリー
+    """
+    started = time.perf_counter()
+    results: dict[int, FileResult] = {}
+    pending: list[int] = []
+    for index, item in enumerate(items):
+        if not force and is_up_to_date(item):
+            results[index] = FileResult(
+                input=str(item.input_path), output=str(item.output_path), status=STATUS_SKIPPED
+            )
+        else:
+            pending.append(index)
+
+    task = progress.add_task("PDFを変換中...", total=len(items)) if progress else None
+    if progress is not None and task is not None:
+        progress.update(task, completed=len(results))
+
+    def record(index: int, result: FileResult) -> None:
+        if result.status == STATUS_FAILED:
+            logger.error("変換に失敗: %s (%s)", result.input, result.error)
+        results[index] = result
+        if progress is not None and task is not None:
+            progress.advance(task)
+
+    template = str(template_path) if template_path else None
+    convert_args = (template, use_llm, merge_spans)
+    if pending:
+        workers = max(1, min(workers, len(pending)))
+        logger.info("%d プロセスで %d ファイルを変換", workers, len(pending))
+        queue = pending
+        while queue:
+            in_flight, queue = _run_pool(items, queue, workers, convert_args, record)
+            if len(in_flight) > 1:
+                # どの変換でワーカーが異常終了したか分からないため、1件ずつ単独で変換し直す
+                for index in in_flight:
+                    crashed, not_started = _run_pool(items, [index], 1, convert_args, record)
+                    if crashed or not_started:
+                        record(index, _crashed_result(items[index]))
+            elif in_flight:
+                record(in_flight[0], _crashed_result(items[in_flight[0]]))
+            elif queue:
+                # 変換を開始する前にプールが壊れた（ワーカーの起動失敗など）
+                for index in queue:
+                    record(index, _crashed_result(items[index]))
+                break
+            if queue:
+                logger.warning(
+                    "ワーカープロセスが異常終了したため、残り %d ファイルを新しいプールで変換",
+                    len(queue),
+                )
+
+    return BatchSummary(
+        files=[results[index] for index in range(len(items))],
+        duration_sec=time.perf_counter() - started,
+    )
+
+
+@click.command()
+@click.argument("inputs", nargs=-1, required=True)
+@click.option(
+    "-o",
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="出力ディレクトリ（デフォルト: 入力PDFと同じ場所）",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="ワーカープロセス数（デフォルト: CPU コア数）",
+)
+@click.option(
+    "-t",
+    "--template",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="PowerPointテンプレートファイルパス (.potx / .pptx)",
+)
+@click.option(
+    "--use-llm / --no-llm",
+    default=False,
+    help="LLM（Claude API）によるレイアウト解析を使用する",
+)
+@click.option(
+    "--merge-spans / --no-merge-spans",
+    default=True,
+    help="同一書式で連続するスパンを1つのテキストランに結合する",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    default=False,
+    help="出力が入力より新しい場合も変換し直す",
+)
+@click.option(
+    "--summary",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="結果サマリー JSON の出力先（デフォルト: 出力ディレクトリ/batch-summary.json）",
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default="INFO",
+    help="ログレベル",
+)
+def cli(
+    inputs: tuple[str, ...],
+    output_dir: Optional[Path],
+    jobs: Optional[int],
+    template: Optional[Path],
+    use_llm: bool,
+    merge_spans: bool,
+    force: bool,
+    summary: Optional[Path],
+    log_level: str,
+) -> None:
+    """複数のPDFをまとめてPowerPointに変換します.
+
+    INPUTS: PDFファイル・ディレクトリ・glob パターン（例: "input/**/*.pdf"）
+    """
+    from src.main import console, setup_logging
+
+    setup_logging(log_level)
+    try:
+        items = collect_inputs(list(inputs), output_dir)
+    except ValueError as e:
+        console.print(f"\n[bold red]エラー:[/bold red] {e}\n")
+        sys.exit(1)
+    if not items:
+        console.print("\n[bold red]エラー:[/bold red] 変換対象のPDFが見つかりません\n")
+        sys.exit(1)
+
+    with Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+    ) as progress:
+        result = run_batch(
+            items,
+            workers=jobs or os.cpu_count() or 1,
+            force=force,
+            template_path=template,
+            use_llm=use_llm,
+            merge_spans=merge_spans,
+            progress=progress,
+        )
+
+    summary_path = result.write(summary or (output_dir or Path.cwd()) / "batch-summary.json")
+    console.print(
+        f"\n[bold]バッチ変換完了[/bold]: 成功 {result.count(STATUS_SUCCEEDED)} / "
+        f"失敗 {result.count(STATUS_FAILED)} / スキップ {result.count(STATUS_SKIPPED)} "
+        f"（{result.duration_sec:.1f} 秒）"
+    )
+    console.print(f"  サマリー: {summary_path}\n")
+    if result.count(STATUS_FAILED):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
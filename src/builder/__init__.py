@@ -1,5 +1,19 @@
 """PPTX構築モジュール - python-pptxによるスライド再構築."""
 
 from src.builder.pptx_builder import PPTXBuilder
+from src.builder.template import PresentationTemplate, load_template
+from src.builder.xml_builder import XMLSlideBuilder
 
-__all__ = ["PPTXBuilder"]
+# 設定値 PPTX_BACKEND → 構築クラス（出力はどちらも同一）
+BUILDER_BACKENDS: dict[str, type[PPTXBuilder]] = {
+    "python-pptx": PPTXBuilder,
+    "xml": XMLSlideBuilder,
+}
+
+__all__ = [
+    "BUILDER_BACKENDS",
+    "PPTXBuilder",
+    "PresentationTemplate",
+    "XMLSlideBuilder",
+    "load_template",
+]
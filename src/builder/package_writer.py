@@ -0,0 +1,187 @@
+"""PPTX パッケージをスライド単位で ZIP に書き出すストリーミングライター.
+
+python-pptx の Presentation.save() はすべてのスライドと画像をメモリに保持したまま、
+最後にパッケージ全体を一度に書き出す。StreamingPackageWriter はスライドを構築した直後に
+そのスライドのパーツ・リレーションシップと、まだ書き出していない画像を ZIP に追加し、
+メモリ上のスライドの XML と画像のバイト列を解放する。[Content_Types].xml・
+presentation.xml・レイアウト・マスター・パッケージのリレーションシップは最後に書き出す。
+
+書き出したパーツのオブジェクト自体はパッケージのリレーションシップに残すため、パーツ名の
+採番と画像の重複判定（SHA1）は python-pptx のまま機能する。ZIP の圧縮と書き込みは
+1本のワーカースレッドで行い、次のページの抽出・構築と並行させる。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import OpcPackage, Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml.slide import CT_Slide
+from pptx.parts.image import ImagePart
+from pptx.util import Length
+
+logger = logging.getLogger(__name__)
+
+# 書き込み待ちにできるメンバー数（超えた分は書き込みの完了を待つ）
+DEFAULT_MAX_PENDING = 8
+
+# 一時ファイルを通常のファイルと同じ権限にするための umask（取得は import 時の1回だけ）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class _WrittenImagePart(ImagePart):
+    """書き出し済みの画像パーツ.
+
+    バイト列を持たず、後続のスライドで同じ画像を再利用するために python-pptx が参照する
+    SHA1 と元のサイズだけを保持する。
+    """
+
+    _written_sha1: str
+    _written_size: tuple[Length, Length]
+
+    @classmethod
+    def release(cls, part: ImagePart) -> None:
+        """画像パーツのバイト列を解放し、このクラスのインスタンスに切り替える."""
+        sha1, size = part.sha1, part._native_size
+        part.__class__ = cls
+        part._blob = b""
+        part._written_sha1 = sha1  # type: ignore[attr-defined]
+        part._written_size = size  # type: ignore[attr-defined]
+
+    @property
+    def sha1(self) -> str:
+        return self._written_sha1
+
+    @property
+    def _native_size(self) -> tuple[Length, Length]:
+        return self._written_size
+
+
+class StreamingPackageWriter:
+    """構築済みのスライドから順に PPTX の ZIP へ書き出すライター.
+
+    出力先と同じディレクトリの一意な一時ファイル（.<ファイル名>.XXXX.tmp）に書き込み、
+    finish() で出力先に置き換える。同じ出力先への書き出しが並行しても一時ファイルは衝突しない。
+    """
+
+    def __init__(self, output_path: str | Path, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        """StreamingPackageWriterを初期化し、一時ファイルを開く.
+
+        Args:
+            output_path: 出力先の .pptx パス（親ディレクトリは自動作成する）
+            max_pending: 書き込み待ちにできるメンバー数の上限
+
+        Raises:
+            OSError: ディレクトリ作成または一時ファイルの作成に失敗した場合
+        """
+        self.path = Path(output_path)
+        self.max_pending = max_pending
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        os.close(fd)
+        self._tmp_path = Path(tmp_name)
+        try:
+            # mkstemp は 0600 で作成するため、通常の open と同じ権限に戻す
+            os.chmod(self._tmp_path, 0o666 & ~_UMASK)
+            self._zip = zipfile.ZipFile(
+                self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED, strict_timestamps=False
+            )
+        except BaseException:
+            self._tmp_path.unlink(missing_ok=True)
+            raise
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pptx-writer")
+        self._pending: deque[Future[None]] = deque()
+        self._written: set[PackURI] = set()
+        self.slides_written = 0
+
+    def write_slide(self, slide_part: Part) -> None:
+        """スライドのパーツと、まだ書き出していない画像を書き出してメモリから解放する.
+
+        スライドの XML は空のスライドに置き換え、画像パーツはバイト列を空にする
+        （重複判定用の SHA1 と元のサイズは保持する）。
+
+        Args:
+            slide_part: 構築を終えたスライドのパーツ
+        """
+        for rel in slide_part.rels.values():
+            if rel.is_external or rel.reltype != RT.IMAGE:
+                continue
+            image_part = rel.target_part
+            if not isinstance(image_part, ImagePart) or image_part.partname in self._written:
+                continue
+            self._write(image_part.partname, image_part.blob)
+            _WrittenImagePart.release(image_part)
+
+        self._write(slide_part.partname, slide_part.blob)
+        self._write(slide_part.partname.rels_uri, slide_part.rels.xml)
+        slide_part._element = CT_Slide.new()  # type: ignore[attr-defined]
+        slide_part.__dict__.pop("slide", None)
+        self.slides_written += 1
+
+    def finish(self, package: OpcPackage) -> Path:
+        """残りのパーツとコンテンツタイプを書き出し、出力先にファイルを置く.
+
+        Args:
+            package: 書き出すプレゼンテーションのパッケージ
+
+        Returns:
+            出力先の Path
+
+        Raises:
+            OSError: 書き込みまたは置き換えに失敗した場合
+        """
+        try:
+            parts = tuple(package.iter_parts())
+            for part in parts:
+                if part.partname in self._written:
+                    continue
+                self._write(part.partname, part.blob)
+                if part._rels:
+                    self._write(part.partname.rels_uri, part.rels.xml)
+            self._write(PACKAGE_URI.rels_uri, package._rels.xml)
+            self._write(CONTENT_TYPES_URI, serialize_part_xml(_ContentTypesItem.xml_for(parts)))
+            while self._pending:
+                self._pending.popleft().result()
+            self._close()
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self.abort()
+            raise
+        logger.debug("パッケージを書き出し: %d スライドを逐次書き出し済み", self.slides_written)
+        return self.path
+
+    def abort(self) -> None:
+        """書き出しを中止し、一時ファイルを削除する."""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        try:
+            self._close()
+        except Exception:
+            logger.debug("中止したパッケージのクローズに失敗", exc_info=True)
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._zip.fp is not None:
+            self._zip.close()
+
+    def _write(self, pack_uri: PackURI, blob: bytes) -> None:
+        """メンバーの書き込みをワーカースレッドに渡す（待ちが上限を超えたら完了を待つ）."""
+        self._written.add(pack_uri)
+        self._pending.append(self._executor.submit(self._zip.writestr, pack_uri.membername, blob))
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft().result()
@@ -2,16 +2,25 @@
 
 from __future__ import annotations
 
+import copy
 import io
 import logging
+import uuid
 from pathlib import Path
 from typing import Optional
 
 from pptx import Presentation
-from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN
-from pptx.util import Emu, Pt
-
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.parts.slide import SlideLayoutPart
+from pptx.shapes.shapetree import SlideShapes
+from pptx.slide import Slide, SlideLayout
+from pptx.util import Emu
+
+from src.analyzer.recurring import PAGE_NUMBER_TOKEN, RecurringElements
+from src.builder.package_writer import StreamingPackageWriter
+from src.builder.template import PresentationTemplate, load_template
 from src.models import (
     ElementType,
     ImageBlock,
@@ -21,6 +30,8 @@ from src.models import (
     TextSpan,
 )
 from src.utils.coordinate import pt_to_emu
+from src.utils.progress import PageProgressCallback, notify
+from src.utils.style_table import StyleTable
 
 logger = logging.getLogger(__name__)
 
@@ -39,17 +50,36 @@ class PPTXBuilder:
     座標を維持しながらテキストボックスと画像を配置する。
     """
 
-    def __init__(self, template_path: Optional[str | Path] = None) -> None:
+    def __init__(
+        self,
+        template_path: Optional[str | Path] = None,
+        style_table: Optional[StyleTable] = None,
+        template: Optional[PresentationTemplate] = None,
+    ) -> None:
         """PPTXBuilderを初期化する.
 
         Args:
             template_path: PowerPointテンプレート(.potx/.pptx)のパス。
                           Noneの場合は空のプレゼンテーションを作成。
+            style_table: 書式ごとのフォント設定をキャッシュするテーブル。
+                          Extractor と同じものを渡すと書式の解決結果を共有できる
+            template: 読み込み済みのテンプレート。指定した場合は template_path より優先し、
+                          ファイルを読まずに複製して使う
         """
+        self.template = template
+        if template is not None and template_path is None:
+            template_path = template.path
         self.template_path = Path(template_path) if template_path else None
+        self.styles = style_table or StyleTable()
         self._prs: Optional[Presentation] = None
-
-    def build(self, data: PresentationData) -> Presentation:
+        self._writer: Optional[StreamingPackageWriter] = None
+
+    def build(
+        self,
+        data: PresentationData,
+        on_progress: Optional[PageProgressCallback] = None,
+        recurring: Optional[RecurringElements] = None,
+    ) -> Presentation:
         """PresentationDataからPowerPointプレゼンテーションを構築する.
 
         スライドサイズ・各スライドのテキストボックス・画像を座標維持で配置する。
@@ -57,35 +87,106 @@ class PPTXBuilder:
 
         Args:
             data: 抽出・解析済みプレゼンテーションデータ
+            on_progress: 構築済みスライド数を (完了数, 総数) で受け取るコールバック
+            recurring: find_recurring_elements() で検出した繰り返し要素。指定した場合は
+                それらを1つのスライドレイアウトに配置し、該当スライドはそのレイアウトを
+                使って繰り返し要素を省いて構築する
 
         Returns:
             python-pptx の Presentation オブジェクト（save() で保存するまでメモリ上のみ）
         """
         logger.info("PowerPoint構築を開始: %d スライド", len(data.slides))
+        prs = self.begin(data.slide_width, data.slide_height)
 
-        # プレゼンテーション初期化
-        if self.template_path and self.template_path.exists():
-            logger.info("テンプレートを使用: %s", self.template_path)
-            self._prs = Presentation(str(self.template_path))
-        else:
-            self._prs = Presentation()
-
-        # スライドサイズ設定（PDF座標に合わせる）
-        self._prs.slide_width = Emu(pt_to_emu(data.slide_width))
-        self._prs.slide_height = Emu(pt_to_emu(data.slide_height))
+        recurring = recurring or RecurringElements()
+        recurring_layout = self._add_recurring_layout(recurring) if recurring else None
 
         # 各スライドを構築
-        for slide_data in data.slides:
-            self._build_slide(slide_data)
+        total = len(data.slides)
+        for index, slide_data in enumerate(data.slides, start=1):
+            position = index - 1
+            if position in recurring.slide_indices:
+                self._build_slide(
+                    slide_data,
+                    layout=recurring_layout,
+                    skip_text=recurring.skipped_text.get(position, frozenset()),
+                    skip_images=recurring.skipped_images.get(position, frozenset()),
+                )
+            else:
+                self._build_slide(slide_data)
+            notify(on_progress, index, total)
 
         logger.info("PowerPoint構築完了")
+        return prs
+
+    def begin(
+        self,
+        slide_width: float,
+        slide_height: float,
+        stream_to: Optional[str | Path] = None,
+    ) -> Presentation:
+        """空のプレゼンテーションを初期化する.
+
+        ストリーミング構築では begin() の後に add_slide() を1枚ずつ呼び出す。
+        テンプレートが指定されていればそのマスターを利用する。
+
+        Args:
+            slide_width: スライド幅 (pt)
+            slide_height: スライド高さ (pt)
+            stream_to: 指定した場合、add_slide() のたびにスライドと画像をこのパスの PPTX に
+                書き出してメモリから解放する。save() には同じパスを渡す
+
+        Returns:
+            初期化された python-pptx の Presentation オブジェクト
+
+        Raises:
+            OSError: stream_to の出力ディレクトリまたは一時ファイルの作成に失敗した場合
+        """
+        self.close()
+        # プレゼンテーション初期化（テンプレートのパースは load_template() のキャッシュで1回だけ）
+        template = self.template
+        if template is None:
+            use_file = self.template_path is not None and self.template_path.exists()
+            template = load_template(self.template_path if use_file else None)
+        if template.path is not None:
+            logger.info("テンプレートを使用: %s", template.path)
+        self._prs = template.open()
+
+        # スライドサイズ設定（PDF座標に合わせる）
+        self._prs.slide_width = Emu(pt_to_emu(slide_width))
+        self._prs.slide_height = Emu(pt_to_emu(slide_height))
+
+        if stream_to is not None:
+            self._writer = StreamingPackageWriter(stream_to)
+            logger.info("スライドを逐次書き出し: %s", self._writer.path)
         return self._prs
 
+    def add_slide(self, slide_data: SlideData) -> None:
+        """1スライド分を構築して追加する.
+
+        SlideData への参照は保持しないため、呼び出し後に破棄してよい。
+        begin() に stream_to を渡した場合は、構築したスライドをすぐに書き出す。
+
+        Args:
+            slide_data: 解析済みの1スライド分のデータ
+
+        Raises:
+            RuntimeError: begin() または build() が呼ばれていない場合
+        """
+        if self._prs is None:
+            raise RuntimeError(
+                "プレゼンテーションが初期化されていません。begin()を先に呼び出してください。"
+            )
+        slide = self._build_slide(slide_data)
+        if self._writer is not None:
+            self._writer.write_slide(slide.part)
+
     def save(self, output_path: str | Path) -> Path:
         """構築したプレゼンテーションを保存する.
 
         出力先の親ディレクトリが存在しない場合は自動作成する。
-        既存ファイルは上書きする。
+        既存ファイルは上書きする。begin() に stream_to を渡した場合は、
+        書き出し済みのスライド以外のパーツを書き出してファイルを完成させる。
 
         Args:
             output_path: 保存先ファイルパス（.pptx）
@@ -95,12 +196,21 @@ class PPTXBuilder:
 
         Raises:
             RuntimeError: build() が呼ばれていない場合
+            ValueError: stream_to と異なるパスを指定した場合
             OSError: ディレクトリ作成またはファイル書き込みに失敗した場合
         """
         if self._prs is None:
             raise RuntimeError("プレゼンテーションが構築されていません。build()を先に呼び出してください。")
 
         path = Path(output_path)
+        if self._writer is not None:
+            if path.resolve() != self._writer.path.resolve():
+                raise ValueError(f"逐次書き出し中の出力先と異なります: {path}")
+            writer, self._writer = self._writer, None
+            writer.finish(self._prs.part.package)
+            logger.info("PowerPointを保存: %s", path)
+            return path
+
         parent = path.parent
         existed = parent.exists()
         try:
@@ -114,25 +224,113 @@ class PPTXBuilder:
         logger.info("PowerPointを保存: %s", path)
         return path
 
-    def _build_slide(self, slide_data: SlideData) -> None:
+    def close(self) -> None:
+        """保存せずに終える逐次書き出しを中止し、書きかけの一時ファイルを削除する.
+
+        save() の後や、逐次書き出しをしていない場合は何もしない。
+        """
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+    def to_bytes(self) -> bytes:
+        """構築したプレゼンテーションを PPTX のバイト列で返す（ファイルには書き出さない）.
+
+        Returns:
+            PPTX のバイト列
+
+        Raises:
+            RuntimeError: build() が呼ばれていない場合、または逐次書き出し中の場合
+        """
+        if self._prs is None:
+            raise RuntimeError(
+                "プレゼンテーションが構築されていません。build()を先に呼び出してください。"
+            )
+        if self._writer is not None:
+            raise RuntimeError("逐次書き出し中のプレゼンテーションはバイト列にできません。")
+        buffer = io.BytesIO()
+        self._prs.save(buffer)
+        return buffer.getvalue()
+
+    def _add_recurring_layout(self, recurring: RecurringElements) -> SlideLayout:
+        """繰り返し要素を配置したスライドレイアウトを追加する.
+
+        空白レイアウトを複製してマスターに登録し、そのシェイプツリーに繰り返し要素を
+        配置する。PAGE_NUMBER_TOKEN はスライド番号フィールドに置き換える。
+
+        Args:
+            recurring: 繰り返し要素
+
+        Returns:
+            追加したスライドレイアウト
+        """
+        assert self._prs is not None
+        blank_layout = self._prs.slide_layouts[6]
+        master = blank_layout.slide_master
+        package = self._prs.part.package
+
+        element = copy.deepcopy(blank_layout._element)
+        element.cSld.set("name", "Recurring Elements")
+        part = SlideLayoutPart(
+            package.next_partname("/ppt/slideLayouts/slideLayout%d.xml"),
+            blank_layout.part.content_type,
+            package,
+            element,
+        )
+        part.relate_to(master.part, RT.SLIDE_MASTER)
+        r_id = master.part.relate_to(part, RT.SLIDE_LAYOUT)
+
+        # マスター・レイアウトの ID はプレゼンテーション全体で一意にする
+        used_ids = [int(e.get("id")) for e in self._prs.part._element.xpath("//p:sldMasterId")]
+        for slide_master in self._prs.slide_masters:
+            used_ids += [int(e.get("id")) for e in slide_master._element.xpath("//p:sldLayoutId")]
+        layout_id = master._element.get_or_add_sldLayoutIdLst()._add_sldLayoutId()
+        layout_id.set("id", str(max(used_ids) + 1))
+        layout_id.rId = r_id
+
+        layout = part.slide_layout
+        shapes = SlideShapes(element.cSld.spTree, layout)
+        for text_block in recurring.text_blocks:
+            text_box = self._add_text_box(shapes, text_block)
+            _insert_slide_number_fields(text_box.text_frame)
+        for image_block in recurring.image_blocks:
+            self._add_image(shapes, image_block)
+        return layout
+
+    def _build_slide(
+        self,
+        slide_data: SlideData,
+        layout: Optional[SlideLayout] = None,
+        skip_text: frozenset[int] = frozenset(),
+        skip_images: frozenset[int] = frozenset(),
+    ) -> Slide:
         """1スライド分を構築する.
 
         Args:
             slide_data: 1スライド分のデータ
+            layout: 使用するスライドレイアウト（None の場合は空白レイアウト）
+            skip_text: レイアウト側に配置済みのため省くテキストブロックのインデックス
+            skip_images: レイアウト側に配置済みのため省く画像ブロックのインデックス
+
+        Returns:
+            追加したスライド
         """
         assert self._prs is not None
 
         # 空白レイアウトでスライド追加
-        blank_layout = self._prs.slide_layouts[6]  # 空白レイアウト
-        slide = self._prs.slides.add_slide(blank_layout)
+        if layout is None:
+            layout = self._prs.slide_layouts[6]  # 空白レイアウト
+        slide = self._prs.slides.add_slide(layout)
 
         # テキストブロックを配置
-        for text_block in slide_data.text_blocks:
-            self._add_text_box(slide, text_block)
+        for index, text_block in enumerate(slide_data.text_blocks):
+            if index not in skip_text:
+                self._add_text_box(slide.shapes, text_block)
 
         # 画像を配置
-        for image_block in slide_data.image_blocks:
-            self._add_image(slide, image_block)
+        for index, image_block in enumerate(slide_data.image_blocks):
+            if index not in skip_images:
+                self._add_image(slide.shapes, image_block)
 
         logger.debug(
             "スライド %d: テキスト %d個, 画像 %d個",
@@ -140,13 +338,17 @@ class PPTXBuilder:
             len(slide_data.text_blocks),
             len(slide_data.image_blocks),
         )
+        return slide
 
-    def _add_text_box(self, slide: object, block: TextBlock) -> None:
-        """スライドにテキストボックスを追加する.
+    def _add_text_box(self, shapes: SlideShapes, block: TextBlock) -> object:
+        """スライド（またはレイアウト）にテキストボックスを追加する.
 
         Args:
-            slide: python-pptxのSlideオブジェクト
+            shapes: 追加先のシェイプツリー
             block: テキストブロックデータ
+
+        Returns:
+            追加したテキストボックスのシェイプ
         """
         left = Emu(pt_to_emu(block.bbox.x0))
         top = Emu(pt_to_emu(block.bbox.y0))
@@ -154,43 +356,21 @@ class PPTXBuilder:
         height = Emu(pt_to_emu(block.bbox.height))
 
         # テキストボックスを追加
-        txBox = slide.shapes.add_textbox(left, top, width, height)  # type: ignore[attr-defined]
+        txBox = shapes.add_textbox(left, top, width, height)
         tf = txBox.text_frame
         tf.word_wrap = True
 
-        # 最初のスパンは既存の段落に追加
-        first_span = True
-        current_paragraph = tf.paragraphs[0]
-
-        # テキスト揃えを設定
+        # テキスト揃えを設定（最初の段落は既存のものを使う）
         alignment = ALIGNMENT_MAP.get(block.alignment, PP_ALIGN.LEFT)
-        current_paragraph.alignment = alignment
-
-        for span in block.spans:
-            if not span.text:
-                continue
+        for i, runs in enumerate(split_paragraphs(block)):
+            paragraph = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            paragraph.alignment = alignment
+            for text, span in runs:
+                run = paragraph.add_run()
+                run.text = text
+                self._apply_font(run, span)
 
-            if first_span:
-                run = current_paragraph.add_run()
-                first_span = False
-            else:
-                # 改行を含む場合は新しい段落を追加
-                if "\n" in span.text:
-                    lines = span.text.split("\n")
-                    for i, line in enumerate(lines):
-                        if i > 0:
-                            current_paragraph = tf.add_paragraph()
-                            current_paragraph.alignment = alignment
-                        if line.strip():
-                            run = current_paragraph.add_run()
-                            run.text = line
-                            self._apply_font(run, span)
-                    continue
-                else:
-                    run = current_paragraph.add_run()
-
-            run.text = span.text
-            self._apply_font(run, span)
+        return txBox
 
     def _apply_font(self, run: object, span: TextSpan) -> None:
         """Runオブジェクトにフォント設定を適用する.
@@ -199,30 +379,25 @@ class PPTXBuilder:
             run: python-pptxのRunオブジェクト
             span: フォント情報を含むTextSpan
         """
+        style = self.styles.run_style(span.font)
         font = run.font  # type: ignore[attr-defined]
-        font.size = Pt(span.font.size)
-        font.bold = span.font.bold
-        font.italic = span.font.italic
+        font.size = style.size
+        font.bold = style.bold
+        font.italic = style.italic
 
         # フォント名設定
-        if span.font.name:
-            font.name = span.font.name
+        if style.name:
+            font.name = style.name
 
-        # 色設定
-        try:
-            color_hex = span.font.color.lstrip("#")
-            r = int(color_hex[0:2], 16)
-            g = int(color_hex[2:4], 16)
-            b = int(color_hex[4:6], 16)
-            font.color.rgb = RGBColor(r, g, b)
-        except (ValueError, IndexError) as e:
-            logger.warning("色の変換に失敗: %s (%s)", span.font.color, e)
+        # 色設定（パース済みの色を書式ごとに共有する）
+        if style.color is not None:
+            font.color.rgb = style.color
 
-    def _add_image(self, slide: object, image_block: ImageBlock) -> None:
-        """スライドに画像を追加する.
+    def _add_image(self, shapes: SlideShapes, image_block: ImageBlock) -> None:
+        """スライド（またはレイアウト）に画像を追加する.
 
         Args:
-            slide: python-pptxのSlideオブジェクト
+            shapes: 追加先のシェイプツリー
             image_block: 画像ブロックデータ
         """
         left = Emu(pt_to_emu(image_block.bbox.x0))
@@ -230,16 +405,73 @@ class PPTXBuilder:
         width = Emu(pt_to_emu(image_block.bbox.width))
         height = Emu(pt_to_emu(image_block.bbox.height))
 
-        if image_block.source_path:
-            # ファイルパスから画像を追加
-            slide.shapes.add_picture(  # type: ignore[attr-defined]
-                image_block.source_path, left, top, width, height
-            )
-        elif image_block.image_data:
-            # バイトデータから画像を追加
-            image_stream = io.BytesIO(image_block.image_data)
-            slide.shapes.add_picture(  # type: ignore[attr-defined]
-                image_stream, left, top, width, height
-            )
-        else:
+        if not image_block.has_payload:
             logger.warning("画像データが空です")
+            return
+
+        # 保存済みファイルは mmap、それ以外はバイト列を共有するストリームで渡す
+        with image_block.open_payload() as image_stream:
+            shapes.add_picture(image_stream, left, top, width, height)
+
+
+def split_paragraphs(block: TextBlock) -> list[list[tuple[str, TextSpan]]]:
+    """テキストブロックを段落ごとの (テキスト, スパン) のランに分ける.
+
+    最初の空でないスパンは改行を含んでもそのまま1つのランにする。以降のスパンは改行で
+    段落を分け、空白のみの行はランにしない（段落は残す）。
+
+    Args:
+        block: テキストブロックデータ
+
+    Returns:
+        段落ごとのランのリスト（少なくとも1段落）
+    """
+    paragraphs: list[list[tuple[str, TextSpan]]] = [[]]
+    first_span = True
+    for span in block.spans:
+        if not span.text:
+            continue
+        if first_span or "\n" not in span.text:
+            paragraphs[-1].append((span.text, span))
+            first_span = False
+            continue
+        for i, line in enumerate(span.text.split("\n")):
+            if i > 0:
+                paragraphs.append([])
+            if line.strip():
+                paragraphs[-1].append((line, span))
+    return paragraphs
+
+
+def _insert_slide_number_fields(text_frame: object) -> None:
+    """テキスト中の PAGE_NUMBER_TOKEN をスライド番号フィールドに置き換える.
+
+    レイアウト上のフィールドは、そのレイアウトを使う各スライドで自身の番号として表示される。
+
+    Args:
+        text_frame: python-pptx の TextFrame
+    """
+    for paragraph in text_frame.paragraphs:  # type: ignore[attr-defined]
+        for run in list(paragraph._p.r_lst):
+            text = run.text
+            if PAGE_NUMBER_TOKEN not in text:
+                continue
+            anchor = run
+            for i, part in enumerate(text.split(PAGE_NUMBER_TOKEN)):
+                if i > 0:
+                    fld = OxmlElement("a:fld")
+                    fld.set("id", f"{{{str(uuid.uuid4()).upper()}}}")
+                    fld.set("type", "slidenum")
+                    if run.rPr is not None:
+                        fld.append(copy.deepcopy(run.rPr))
+                    t = OxmlElement("a:t")
+                    t.text = PAGE_NUMBER_TOKEN
+                    fld.append(t)
+                    anchor.addnext(fld)
+                    anchor = fld
+                if part:
+                    piece = copy.deepcopy(run)
+                    piece.text = part
+                    anchor.addnext(piece)
+                    anchor = piece
+            paragraph._p.remove(run)
@@ -0,0 +1,177 @@
+"""読み込み済みのテンプレートを変換ごとに複製して使うためのキャッシュ.
+
+python-pptx の Presentation(path) は呼び出すたびに ZIP を展開し、すべてのパーツの XML と
+リレーションシップをパースする。PresentationTemplate はテンプレートを1度だけ読み込んで
+パーツ（パース済みの XML 要素・画像などのバイト列）とリレーションシップを保持し、
+open() では XML 要素を複製して新しいパッケージを組み立てる。画像・メディアなど XML 以外の
+パーツのバイト列は変更されないため、複製せずに共有する。
+
+保持している要素は読み取るだけなので、1つの PresentationTemplate を複数のスレッドから
+同時に open() してよい。load_template() はパス・更新時刻・サイズをキーに読み込み結果を
+キャッシュするため、テンプレートの更新は次の呼び出しで反映される。
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.oxml import CT_Relationships
+from pptx.opc.package import Part, XmlPart
+from pptx.opc.packuri import PACKAGE_URI, PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.xmlchemy import BaseOxmlElement
+from pptx.package import Package
+from pptx.presentation import Presentation
+
+logger = logging.getLogger(__name__)
+
+# 複製時に通常のプレゼンテーション (.pptx) として扱うメインパーツのコンテンツタイプ
+_PRESENTATION_TYPES = frozenset(
+    {CT.PML_PRESENTATION_MAIN, CT.PML_TEMPLATE_MAIN, CT.PML_SLIDESHOW_MAIN}
+)
+_VALID_MAIN_TYPES = _PRESENTATION_TYPES | {CT.PML_PRES_MACRO_MAIN}
+
+# load_template() が保持するテンプレートの数
+DEFAULT_MAX_TEMPLATES = 8
+
+
+@dataclass(frozen=True)
+class _PartSource:
+    """複製元のパーツ（XML パーツは element、それ以外は blob を持つ）."""
+
+    part_class: type[Part]
+    partname: PackURI
+    content_type: str
+    element: Optional[BaseOxmlElement]
+    blob: Optional[bytes]
+    rels: Optional[CT_Relationships]
+
+
+class PresentationTemplate:
+    """1度だけ読み込み、変換ごとに独立した Presentation を複製して返すテンプレート."""
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        """テンプレートを読み込む.
+
+        Args:
+            path: PowerPointテンプレート(.potx/.pptx)のパス。
+                  Noneの場合は python-pptx 既定の空のプレゼンテーション
+
+        Raises:
+            OSError: ファイルの読み込みに失敗した場合
+            ValueError: PowerPoint のファイルではない場合
+        """
+        self.path = Path(path) if path is not None else None
+        source = self.path.read_bytes() if self.path is not None else _default_template_bytes()
+        # 変換結果キャッシュのキーに使う、読み込んだ内容の SHA-256（既定のテンプレートは None）
+        self.digest = hashlib.sha256(source).hexdigest() if self.path is not None else None
+        package = Package.open(io.BytesIO(source))
+        main_type = package.main_document_part.content_type
+        if main_type not in _VALID_MAIN_TYPES:
+            raise ValueError(
+                f"PowerPoint のテンプレートではありません: {self.path}（{main_type}）"
+            )
+
+        parts = []
+        for part in package.iter_parts():
+            content_type = part.content_type
+            if content_type in _PRESENTATION_TYPES:
+                # .potx / .ppsx から作るプレゼンテーションは通常の .pptx として保存する
+                content_type = CT.PML_PRESENTATION_MAIN
+            element = part._element if isinstance(part, XmlPart) else None
+            parts.append(
+                _PartSource(
+                    part_class=type(part),
+                    partname=part.partname,
+                    content_type=content_type,
+                    element=element,
+                    blob=part.blob if element is None else None,
+                    rels=parse_xml(part.rels.xml) if part.rels else None,
+                )
+            )
+        self._parts = tuple(parts)
+        self._package_rels: CT_Relationships = parse_xml(package._rels.xml)
+
+    def open(self) -> Presentation:
+        """テンプレートを複製した新しい Presentation を返す.
+
+        Returns:
+            ほかの open() の結果と要素を共有しない python-pptx の Presentation
+        """
+        package = Package(str(self.path) if self.path is not None else "")
+        parts: dict[PackURI, Part] = {}
+        for source in self._parts:
+            if source.element is not None:
+                part: Part = source.part_class(
+                    source.partname,
+                    source.content_type,
+                    package,
+                    copy.deepcopy(source.element),
+                )
+            else:
+                assert source.blob is not None
+                part = source.part_class.load(
+                    source.partname, source.content_type, package, source.blob
+                )
+            parts[source.partname] = part
+        for source in self._parts:
+            if source.rels is not None:
+                parts[source.partname].load_rels_from_xml(source.rels, parts)
+        package._rels.load_from_xml(PACKAGE_URI, self._package_rels, parts)
+        presentation: Presentation = package.presentation_part.presentation
+        return presentation
+
+
+def _default_template_bytes() -> bytes:
+    """python-pptx 既定の空のプレゼンテーションのバイト列を返す."""
+    import pptx
+
+    return Path(pptx.__file__).with_name("templates").joinpath("default.pptx").read_bytes()
+
+
+# (絶対パス, 更新時刻, サイズ) → 読み込み済みテンプレート（None は既定のテンプレート）
+_templates: OrderedDict[Optional[tuple[str, int, int]], PresentationTemplate] = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+def load_template(path: Optional[str | Path] = None) -> PresentationTemplate:
+    """テンプレートを読み込む（同じファイルは2回目以降キャッシュから返す）.
+
+    最近使った DEFAULT_MAX_TEMPLATES 個のテンプレートを保持する。スレッドセーフ。
+
+    Args:
+        path: PowerPointテンプレート(.potx/.pptx)のパス。Noneの場合は既定のテンプレート
+
+    Returns:
+        読み込み済みの PresentationTemplate
+
+    Raises:
+        OSError: ファイルの読み込みに失敗した場合
+        ValueError: PowerPoint のファイルではない場合
+    """
+    key = None
+    if path is not None:
+        stat = os.stat(path)
+        key = (str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+            return template
+        # 読み込み中も同じキーの重複読み込みを防ぐため、ロックを保持したまま読み込む
+        template = PresentationTemplate(path)
+        _templates[key] = template
+        while len(_templates) > DEFAULT_MAX_TEMPLATES:
+            _templates.popitem(last=False)
+    logger.debug("テンプレートを読み込み: %s", path or "既定")
+    return template
@@ -0,0 +1,140 @@
+"""テキストボックスの OOXML を SlideData から直接生成する高速な構築バックエンド.
+
+PPTXBuilder はテキストブロックごとに add_textbox → text_frame → add_paragraph /
+add_run → font.* の各プロキシを経由して lxml のツリーを少しずつ変更する。
+XMLSlideBuilder は p:sp / a:p / a:r を文字列として組み立てて1回だけパースし、
+シェイプツリーに追加する。ラン書式 (a:rPr) の XML は書式ごとに1回だけ生成して共有する。
+
+出力は PPTXBuilder とシェイプ単位で同一（シェイプ ID・名前・要素と属性の順序まで一致）。
+スライド・レイアウト・画像のパーツ管理は python-pptx に任せる。
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.shapes.shapetree import SlideShapes
+
+from src.builder.pptx_builder import PPTXBuilder, split_paragraphs
+from src.builder.template import PresentationTemplate
+from src.models import FontInfo, TextBlock
+from src.utils.coordinate import pt_to_emu
+from src.utils.style_table import StyleTable
+
+# a:pPr の algn 属性（PPTXBuilder.ALIGNMENT_MAP と同じ対応）
+_ALGN = {"left": "l", "center": "ctr", "right": "r"}
+
+# python-pptx の _Run.text と同じく、タブ・改行以外の制御文字を _xHHHH_ に置き換える
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+_ATTR_ENTITIES = {'"': "&quot;"}
+
+_SP_OPEN = (
+    f"<p:sp {nsdecls('a', 'p')}>"
+    '<p:nvSpPr><p:cNvPr id="{id}" name="TextBox {index}"/><p:cNvSpPr txBox="1"/><p:nvPr/>'
+    "</p:nvSpPr>"
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="square"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+)
+_SP_CLOSE = "</p:txBody></p:sp>"
+
+
+def _escape_text(text: str) -> str:
+    """ランのテキストを a:t の内容としてエスケープする."""
+    text = _CTRL_CHARS.sub(lambda match: f"_x{ord(match.group(1)):04X}_", text)
+    return escape(text)
+
+
+class XMLSlideBuilder(PPTXBuilder):
+    """テキストボックスを OOXML の文字列から直接生成する PPTXBuilder.
+
+    インターフェース・出力は PPTXBuilder と同じで、テキストボックスの追加だけが異なる。
+    """
+
+    def __init__(
+        self,
+        template_path: Optional[str | Path] = None,
+        style_table: Optional[StyleTable] = None,
+        template: Optional[PresentationTemplate] = None,
+    ) -> None:
+        """XMLSlideBuilderを初期化する.
+
+        Args:
+            template_path: PowerPointテンプレート(.potx/.pptx)のパス
+            style_table: 書式ごとのフォント設定をキャッシュするテーブル
+            template: 読み込み済みのテンプレート（template_path より優先）
+        """
+        super().__init__(template_path, style_table, template)
+        # FontInfo → a:rPr の XML
+        self._rpr_xml: dict[FontInfo, str] = {}
+
+    def _add_text_box(self, shapes: SlideShapes, block: TextBlock) -> object:
+        """スライド（またはレイアウト）にテキストボックスの p:sp を直接追加する.
+
+        Args:
+            shapes: 追加先のシェイプツリー
+            block: テキストブロックデータ
+
+        Returns:
+            追加したテキストボックスのシェイプ
+        """
+        # シェイプ ID はツリーの最大値を1度だけ調べ、以降は加算する
+        if not shapes.turbo_add_enabled:
+            shapes.turbo_add_enabled = True
+        shape_id = shapes._next_shape_id
+
+        parts = [
+            _SP_OPEN.format(
+                id=shape_id,
+                index=shape_id - 1,
+                x=pt_to_emu(block.bbox.x0),
+                y=pt_to_emu(block.bbox.y0),
+                cx=pt_to_emu(block.bbox.width),
+                cy=pt_to_emu(block.bbox.height),
+            )
+        ]
+        ppr = f'<a:pPr algn="{_ALGN.get(block.alignment, "l")}"/>'
+        for runs in split_paragraphs(block):
+            parts.append("<a:p>")
+            parts.append(ppr)
+            for text, span in runs:
+                parts.append("<a:r>")
+                parts.append(self._run_properties(span.font))
+                parts.append(f"<a:t>{_escape_text(text)}</a:t></a:r>")
+            parts.append("</a:p>")
+        parts.append(_SP_CLOSE)
+
+        sp = parse_xml("".join(parts))
+        shapes._spTree.insert_element_before(sp, "p:extLst")
+        return shapes._shape_factory(sp)
+
+    def _run_properties(self, font: FontInfo) -> str:
+        """FontInfo に対応する a:rPr の XML を返す（書式ごとに1回だけ生成する）.
+
+        Args:
+            font: フォント情報
+
+        Returns:
+            a:rPr 要素の XML 文字列
+        """
+        xml = self._rpr_xml.get(font)
+        if xml is None:
+            style = self.styles.run_style(font)
+            children = ""
+            if style.color is not None:
+                children += f'<a:solidFill><a:srgbClr val="{style.color}"/></a:solidFill>'
+            if style.name:
+                children += f'<a:latin typeface="{escape(style.name, _ATTR_ENTITIES)}"/>'
+            xml = (
+                f'<a:rPr sz="{style.size.centipoints:d}" b="{style.bold:d}"'
+                f' i="{style.italic:d}"'
+            )
+            xml += f">{children}</a:rPr>" if children else "/>"
+            self._rpr_xml[font] = xml
+        return xml
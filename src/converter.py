@@ -0,0 +1,136 @@
+"""常駐サービス向けの再利用可能な変換器.
+
+convert_pdf_to_pptx() / convert_bytes() はテンプレートをパスで受け取り、変換のたびに
+load_template() のキャッシュを引く。Converter は生成時にテンプレートを読み込んで保持し、
+変換のたびにそれを複製して使う。
+
+変換ごとの状態（Extractor・Analyzer・Builder）は呼び出しごとに作り、Converter が保持する
+テンプレートは読み取るだけなので、1つの Converter を複数のスレッドから同時に使ってよい。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+from config.settings import get_settings
+from src.builder import PresentationTemplate
+from src.main import convert_bytes, convert_pdf_to_pptx
+from src.utils.progress import ProgressCallback
+
+
+class Converter:
+    """テンプレートと変換オプションを固定して、PDF の変換を繰り返し実行するクラス."""
+
+    def __init__(
+        self,
+        template_path: Optional[str | Path] = None,
+        use_llm: bool = False,
+        jobs: int = 1,
+        stream: bool = False,
+        merge_spans: bool = True,
+        use_cache: Optional[bool] = None,
+        extract_images: Optional[bool] = None,
+        optimize_images: Optional[bool] = None,
+    ) -> None:
+        """Converterを初期化し、テンプレートを読み込む.
+
+        Args:
+            template_path: テンプレートファイルパス（.potx/.pptx）。None の場合は空白プレゼン
+            use_llm: LLM（Claude API）によるレイアウト解析を使用するか
+            jobs: PDF解析に使うプロセス数
+            stream: True の場合、1ページずつ抽出→解析→構築するストリーミング変換を行う
+            merge_spans: 同一書式で同じ行に連続するスパンを構築前に1つのランへ結合するか
+            use_cache: 同じPDF・設定の変換結果をキャッシュから返すか。None の場合は設定値
+            extract_images: 画像を抽出するか。None の場合は設定値
+            optimize_images: 画像を表示サイズに合わせて縮小・切り抜きし、再圧縮するか。
+                None の場合は設定値
+
+        Raises:
+            OSError: テンプレートの読み込みに失敗した場合
+            ValueError: テンプレートが PowerPoint のファイルではない場合
+        """
+        # 設定も生成時に読み込み、最初の変換で .env の読み込みを待たないようにする
+        get_settings()
+        self.template = PresentationTemplate(template_path)
+        self.use_llm = use_llm
+        self.jobs = jobs
+        self.stream = stream
+        self.merge_spans = merge_spans
+        self.use_cache = use_cache
+        self.extract_images = extract_images
+        self.optimize_images = optimize_images
+
+    def convert(
+        self,
+        pdf_path: str | Path,
+        output_path: str | Path,
+        save_images: bool = False,
+        on_progress: Optional[ProgressCallback] = None,
+        pages: Optional[str] = None,
+    ) -> Path:
+        """PDFファイルを変換して output_path に保存する.
+
+        Args:
+            pdf_path: 入力PDFファイルパス
+            output_path: 出力PPTXファイルパス
+            save_images: 画像を出力先の images/ に中間保存するか
+            on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック
+            pages: 変換するページ（「1-10,25」形式）。None の場合は全ページ
+
+        Returns:
+            保存されたPPTXファイルの Path
+
+        Raises:
+            FileNotFoundError: 入力PDFが存在しない場合
+            ValueError: PDFが破損している、読み込みに失敗した、またはページ指定が不正な場合
+            OSError: 出力ディレクトリの作成またはファイル書き込みに失敗した場合
+        """
+        return convert_pdf_to_pptx(
+            pdf_path,
+            output_path,
+            template_path=self.template,
+            use_llm=self.use_llm,
+            save_images=save_images,
+            jobs=self.jobs,
+            stream=self.stream,
+            merge_spans=self.merge_spans,
+            on_progress=on_progress,
+            use_cache=self.use_cache,
+            pages=pages,
+            extract_images=self.extract_images,
+            optimize_images=self.optimize_images,
+        )
+
+    def convert_bytes(
+        self,
+        pdf: bytes | bytearray | memoryview,
+        on_progress: Optional[ProgressCallback] = None,
+        pages: Optional[str] = None,
+    ) -> bytes:
+        """PDF のバイト列を PPTX のバイト列に変換する（一時ファイルは作らない）.
+
+        Args:
+            pdf: 入力PDFのバイト列
+            on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック
+            pages: 変換するページ（「1-10,25」形式）。None の場合は全ページ
+
+        Returns:
+            PPTX のバイト列
+
+        Raises:
+            ValueError: PDFが破損している、読み込みに失敗した、またはページ指定が不正な場合
+        """
+        return convert_bytes(
+            pdf,
+            template_path=self.template,
+            use_llm=self.use_llm,
+            jobs=self.jobs,
+            stream=self.stream,
+            merge_spans=self.merge_spans,
+            on_progress=on_progress,
+            use_cache=self.use_cache,
+            pages=pages,
+            extract_images=self.extract_images,
+            optimize_images=self.optimize_images,
+        )
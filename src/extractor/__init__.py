@@ -1,5 +1,7 @@
 """PDF解析モジュール - PyMuPDFによるテキスト・画像・座標の抽出."""
 
+from src.extractor.image_optimizer import ImageOptimizer
+from src.extractor.page_cache import PageCache
 from src.extractor.pdf_extractor import PDFExtractor
 
-__all__ = ["PDFExtractor"]
+__all__ = ["ImageOptimizer", "PDFExtractor", "PageCache"]
@@ -0,0 +1,91 @@
+"""PDF内画像の xref 単位キャッシュ.
+
+NotebookLM のデッキではロゴや背景画像が全ページで同じ xref を参照するため、
+一度抽出した画像データをドキュメント単位で共有し、再デコードを避ける。
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.utils.cache_stats import CacheStats
+
+logger = logging.getLogger(__name__)
+
+# デフォルトのキャッシュ上限（バイト）
+DEFAULT_IMAGE_CACHE_BYTES: int = 64 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    """抽出済み画像データ（複数の ImageBlock で共有される）."""
+
+    data: bytes
+    ext: str
+
+
+class ImageCache:
+    """xref → 抽出済み画像の LRU キャッシュ.
+
+    保持する画像データの合計サイズが max_bytes を超えると、
+    最も長く参照されていないものから追い出す。
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_IMAGE_CACHE_BYTES) -> None:
+        """ImageCacheを初期化する.
+
+        Args:
+            max_bytes: 保持する画像データの合計サイズ上限。0 以下でキャッシュ無効
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.stats = CacheStats()
+        self._entries: OrderedDict[int, CachedImage] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, xref: int) -> CachedImage | None:
+        """キャッシュから画像を取得する.
+
+        Args:
+            xref: 画像の xref 番号
+
+        Returns:
+            キャッシュ済みの画像。未登録の場合は None
+        """
+        image = self._entries.get(xref)
+        if image is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(xref)
+        self.stats.hits += 1
+        return image
+
+    def put(self, xref: int, image: CachedImage) -> None:
+        """画像をキャッシュに登録する.
+
+        単体で上限を超える画像は登録しない。
+
+        Args:
+            xref: 画像の xref 番号
+            image: 抽出済み画像
+        """
+        size = len(image.data)
+        if size > self.max_bytes or xref in self._entries:
+            return
+        self._entries[xref] = image
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            evicted_xref, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted.data)
+            self.stats.evictions += 1
+            logger.debug("画像キャッシュから追い出し: xref=%d", evicted_xref)
+
+    def clear(self) -> None:
+        """キャッシュを空にする（統計は保持する）."""
+        self._entries.clear()
+        self.current_bytes = 0
@@ -0,0 +1,371 @@
+"""抽出画像を表示サイズに合わせて縮小・再圧縮する最適化ステージ.
+
+PDF の画像は表示サイズにかかわらず元の解像度のまま抽出されるため、4000×3000 の写真を
+200×150 pt で表示しているだけでも PPTX には元のサイズで埋め込まれる。ImageOptimizer は
+各画像ブロックをスライドの外にはみ出した部分を切り落とし、表示サイズと目標 DPI から
+求めたピクセル数まで縮小してから再圧縮する。
+
+デコード・縮小・エンコードは Pillow が GIL を解放するため、スレッドプールで並列に行う。
+画像データの読み込み（遅延読み込みのローダー）は PyMuPDF のドキュメントがスレッドセーフで
+ないため、呼び出し元のスレッドで行う。同じ xref を同じ位置・サイズで表示する画像
+（全ページ共通のロゴなど）は1度だけ処理し、同一のバイト列を共有する。
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import math
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image
+
+from src.models import BoundingBox, ImageBlock, SlideData
+
+logger = logging.getLogger(__name__)
+
+# 再圧縮の形式（auto: 色数の多い写真は JPEG、それ以外は PNG）
+IMAGE_ENCODINGS = ("auto", "jpeg", "png")
+
+DEFAULT_IMAGE_DPI = 300
+DEFAULT_JPEG_QUALITY = 85
+DEFAULT_OPTIMIZE_WORKERS = 4
+
+# 目標のピクセル数をこの比率以上上回る場合だけ縮小する（わずかな縮小での再圧縮を避ける）
+_DOWNSCALE_THRESHOLD = 1.1
+
+# auto で PNG（可逆）を選ぶ色数の上限。これを超える画像は写真として JPEG にする
+_MAX_GRAPHIC_COLORS = 256
+
+# 1ワーカーあたりの処理待ちの画像数（読み込み済みの元画像を保持する数の上限）
+_PENDING_PER_WORKER = 2
+
+# (xref, 表示領域, 切り抜き範囲) → 最適化結果
+_ResultKey = tuple[int, tuple[float, ...], tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class OptimizedImage:
+    """最適化後の画像データ（同じキーの ImageBlock で共有される）."""
+
+    data: bytes
+    ext: str
+    source_size: int
+
+
+_OptimizeFuture = Future[Optional[OptimizedImage]]
+_PendingImage = tuple[ImageBlock, BoundingBox, Optional[_ResultKey], _OptimizeFuture]
+
+
+@dataclass
+class ImageOptimizerStats:
+    """最適化した画像の数と、最適化した画像の最適化前後の合計サイズ."""
+
+    optimized: int = 0
+    unchanged: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+class ImageOptimizer:
+    """画像ブロックを表示サイズ・目標 DPI に合わせて縮小・切り抜き・再圧縮するクラス.
+
+    close() でスレッドプールを終了する（with 文でも使用できる）。
+    """
+
+    def __init__(
+        self,
+        dpi: int = DEFAULT_IMAGE_DPI,
+        jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+        encoding: str = "auto",
+        workers: int = DEFAULT_OPTIMIZE_WORKERS,
+    ) -> None:
+        """ImageOptimizerを初期化する.
+
+        Args:
+            dpi: 表示サイズ 1 インチあたりのピクセル数の上限。これを超える画像を縮小する
+            jpeg_quality: JPEG で再圧縮するときの品質（1〜95）
+            encoding: 再圧縮の形式。auto（色数の多い写真は JPEG、それ以外は PNG）/ jpeg / png。
+                透過のある画像・パレット画像は常に PNG にする
+            workers: デコード・縮小・エンコードを行うスレッド数
+
+        Raises:
+            ValueError: 設定値が範囲外の場合
+        """
+        if encoding not in IMAGE_ENCODINGS:
+            raise ValueError(
+                f"不明な画像の再圧縮形式です: {encoding}（{', '.join(IMAGE_ENCODINGS)}）"
+            )
+        if dpi <= 0 or not 1 <= jpeg_quality <= 95 or workers < 1:
+            raise ValueError(
+                f"画像最適化の設定が不正です: dpi={dpi}, quality={jpeg_quality}, workers={workers}"
+            )
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self.encoding = encoding
+        self.workers = workers
+        self.stats = ImageOptimizerStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._results: dict[_ResultKey, Optional[OptimizedImage]] = {}
+
+    def __enter__(self) -> ImageOptimizer:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    @property
+    def cache_token(self) -> str:
+        """出力に影響する設定を表す文字列（変換結果キャッシュのキー用）."""
+        return f"{self.dpi}dpi/q{self.jpeg_quality}/{self.encoding}"
+
+    def close(self) -> None:
+        """スレッドプールを終了する."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def optimize_slide(self, slide: SlideData) -> None:
+        """1スライドの画像ブロックを最適化する（ストリーミング変換用）.
+
+        Args:
+            slide: 最適化する SlideData（画像ブロックをその場で書き換える）
+        """
+        self.optimize_slides([slide])
+
+    def optimize_slides(self, slides: Iterable[SlideData]) -> None:
+        """スライドの画像ブロックを最適化する.
+
+        縮小・切り抜きした画像ブロックは image_data・image_format を最適化後の画像に、
+        bbox をスライド内に収まる表示領域に置き換える。デコードできない画像や、
+        最適化しても小さくならない画像はそのまま残す。
+
+        Args:
+            slides: 最適化する SlideData（画像ブロックをその場で書き換える）
+        """
+        executor = self._executor
+        if executor is None:
+            executor = self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="image-optimizer"
+            )
+        pending: deque[_PendingImage] = deque()
+        in_flight: dict[_ResultKey, _OptimizeFuture] = {}
+
+        for slide in slides:
+            for image_block in slide.image_blocks:
+                region = _visible_region(image_block.bbox, slide.width, slide.height)
+                if region is None or not image_block.has_payload:
+                    continue
+                visible, crop = region
+                key: Optional[_ResultKey] = None
+                if image_block.xref is not None:
+                    key = (image_block.xref, _rounded(visible), _rounded(crop))
+                    if key in self._results:
+                        self._apply(image_block, visible, self._results[key])
+                        continue
+                    future = in_flight.get(key)
+                    if future is not None:
+                        pending.append((image_block, visible, key, future))
+                        continue
+
+                try:
+                    data = image_block.load_payload()
+                except Exception as e:
+                    logger.warning("画像の読み込みに失敗したため最適化しません: %s", e)
+                    continue
+                future = executor.submit(
+                    _optimize_image,
+                    data,
+                    crop,
+                    _target_size(visible, self.dpi),
+                    self.encoding,
+                    self.jpeg_quality,
+                )
+                pending.append((image_block, visible, key, future))
+                if key is not None:
+                    in_flight[key] = future
+
+                while len(pending) > self.workers * _PENDING_PER_WORKER:
+                    self._finish(*pending.popleft())
+
+        while pending:
+            self._finish(*pending.popleft())
+
+    def _finish(
+        self,
+        image_block: ImageBlock,
+        visible: BoundingBox,
+        key: Optional[_ResultKey],
+        future: _OptimizeFuture,
+    ) -> None:
+        """最適化の完了を待ち、結果を画像ブロックに反映する."""
+        if key is not None and key in self._results:
+            self._apply(image_block, visible, self._results[key])
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning("画像の最適化に失敗したため元の画像を使います: %s", e)
+            result = None
+        if result is None:
+            self.stats.unchanged += 1
+        else:
+            self.stats.optimized += 1
+            self.stats.bytes_before += result.source_size
+            self.stats.bytes_after += len(result.data)
+        if key is not None:
+            self._results[key] = result
+        self._apply(image_block, visible, result)
+
+    @staticmethod
+    def _apply(
+        image_block: ImageBlock, visible: BoundingBox, result: Optional[OptimizedImage]
+    ) -> None:
+        if result is None:
+            return
+        image_block.image_data = result.data
+        image_block.image_format = result.ext
+        image_block.bbox = visible
+
+
+def _visible_region(
+    bbox: BoundingBox, width: float, height: float
+) -> Optional[tuple[BoundingBox, tuple[float, float, float, float]]]:
+    """画像のうちスライド内に表示される領域を求める.
+
+    Args:
+        bbox: 画像の表示位置 (pt)
+        width: スライド幅 (pt)
+        height: スライド高さ (pt)
+
+    Returns:
+        (表示領域, 画像に対する切り抜き範囲（0〜1 の比率で x0, y0, x1, y1）)。
+        画像がスライド内にない場合は None
+    """
+    if bbox.width <= 0 or bbox.height <= 0:
+        return None
+    x0, y0 = max(bbox.x0, 0.0), max(bbox.y0, 0.0)
+    x1, y1 = min(bbox.x1, width), min(bbox.y1, height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    crop = (
+        (x0 - bbox.x0) / bbox.width,
+        (y0 - bbox.y0) / bbox.height,
+        (x1 - bbox.x0) / bbox.width,
+        (y1 - bbox.y0) / bbox.height,
+    )
+    return BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1), crop
+
+
+def _target_size(visible: BoundingBox, dpi: int) -> tuple[int, int]:
+    """表示領域を dpi で表示するのに必要なピクセル数を返す."""
+    scale = dpi / 72.0
+    return max(1, math.ceil(visible.width * scale)), max(1, math.ceil(visible.height * scale))
+
+
+def _rounded(values: BoundingBox | tuple[float, ...]) -> tuple[float, ...]:
+    if isinstance(values, BoundingBox):
+        values = (values.x0, values.y0, values.x1, values.y1)
+    return tuple(round(v, 3) for v in values)
+
+
+def _optimize_image(
+    data: bytes,
+    crop: tuple[float, float, float, float],
+    target: tuple[int, int],
+    encoding: str,
+    quality: int,
+) -> Optional[OptimizedImage]:
+    """画像を切り抜き・縮小して再圧縮する（ワーカースレッドで実行する）.
+
+    Args:
+        data: 元の画像のバイト列
+        crop: 切り抜き範囲（0〜1 の比率で x0, y0, x1, y1）
+        target: 切り抜いた領域の表示に必要なピクセル数 (幅, 高さ)
+        encoding: 再圧縮の形式（auto / jpeg / png）
+        quality: JPEG の品質
+
+    Returns:
+        最適化後の画像。デコードできない場合、または切り抜き・縮小が不要で
+        再圧縮しても小さくならない場合は None
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            image: Image.Image = source
+            width, height = image.size
+            crop_width = (crop[2] - crop[0]) * width
+            crop_height = (crop[3] - crop[1]) * height
+            new_size = (
+                min(target[0], max(1, round(crop_width))),
+                min(target[1], max(1, round(crop_height))),
+            )
+            downscale = (
+                crop_width > target[0] * _DOWNSCALE_THRESHOLD
+                or crop_height > target[1] * _DOWNSCALE_THRESHOLD
+            )
+            if downscale and image.format == "JPEG":
+                # JPEG は DCT の段階で縮小してデコードする（必要なサイズ以上を保つ）
+                image.draft(
+                    image.mode,
+                    (
+                        math.ceil(width * new_size[0] / crop_width),
+                        math.ceil(height * new_size[1] / crop_height),
+                    ),
+                )
+                width, height = image.size
+
+            box = (
+                round(crop[0] * width),
+                round(crop[1] * height),
+                round(crop[2] * width),
+                round(crop[3] * height),
+            )
+            cropped = box != (0, 0, width, height)
+            if not cropped and not downscale and image.format == "JPEG" and encoding != "png":
+                # 表示サイズに見合った JPEG は再圧縮しても劣化するだけなのでそのまま使う
+                return None
+
+            if cropped:
+                image = image.crop(box)
+            if downscale:
+                image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            ext = _choose_format(image, encoding)
+            encoded = _encode(image, ext, quality)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.debug("画像をデコードできないため最適化しません: %s", e)
+        return None
+
+    if not cropped and not downscale and len(encoded) >= len(data):
+        return None
+    return OptimizedImage(data=encoded, ext=ext, source_size=len(data))
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+
+
+def _choose_format(image: Image.Image, encoding: str) -> str:
+    """再圧縮の形式（jpeg / png）を決める."""
+    if _has_alpha(image) or image.mode in ("1", "P"):
+        return "png"
+    if encoding != "auto":
+        return encoding
+    # 色数の少ない図版・スクリーンショットは可逆の PNG のほうが小さく劣化もない
+    return "png" if image.getcolors(maxcolors=_MAX_GRAPHIC_COLORS) is not None else "jpeg"
+
+
+def _encode(image: Image.Image, ext: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if ext == "jpeg":
+        if image.mode not in ("L", "RGB", "CMYK"):
+            image = image.convert("RGB")
+        image.save(buffer, "JPEG", quality=quality, optimize=True)
+    else:
+        if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA", "I", "I;16"):
+            image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+        image.save(buffer, "PNG")
+    return buffer.getvalue()
@@ -0,0 +1,175 @@
+"""ページ単位の抽出キャッシュ - 改訂されたPDFで変更のないページの抽出を省略する.
+
+各ページのフィンガープリントは、コンテンツストリームと、ページが参照する
+リソース（画像・フォント・フォーム XObject）の内容から計算する。xref 番号には
+依存しないため、数ページだけ差し替えて再生成したPDFでも変更のないページは一致する。
+
+キャッシュには抽出済み SlideData を JSON で保存する。画像のバイト列は保存せず、
+ページ内の画像の並び順で xref を対応付けて、現在のドキュメントから読み直す。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+from src import __version__
+from src.models import SlideData
+from src.utils.cache_stats import CacheStats
+from src.utils.disk_cache import evict_lru_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_CACHE_BYTES = 512 * 1024 * 1024
+
+# 抽出処理や保存形式を変えたときに上げる（古いエントリと一致しなくなる）
+_FORMAT_VERSION = 3
+_SUFFIX = ".json"
+
+
+class PageFingerprinter:
+    """ページのフィンガープリントを計算する（リソースのハッシュはドキュメント内で共有）."""
+
+    def __init__(self, doc: fitz.Document) -> None:
+        """PageFingerprinterを初期化する.
+
+        Args:
+            doc: 対象のドキュメント
+        """
+        self.doc = doc
+        self._digests: dict[tuple[str, int], bytes] = {}
+
+    def _digest(self, kind: str, xref: int) -> bytes:
+        """リソースの内容のハッシュを返す（同じ xref は1度だけ計算する）."""
+        key = (kind, xref)
+        digest = self._digests.get(key)
+        if digest is None:
+            try:
+                if kind == "font":
+                    data = self.doc.extract_font(xref)[-1] or b""
+                else:
+                    # 圧縮のやり直しで変わらないよう、展開後のストリームを使う
+                    data = self.doc.xref_stream(xref) or b""
+            except Exception:
+                # 内容を読めないリソースは xref の定義そのものを代わりに使う
+                data = self.doc.xref_object(xref).encode()
+            digest = hashlib.sha256(data).digest()
+            self._digests[key] = digest
+        return digest
+
+    def fingerprint(self, page: fitz.Page) -> tuple[str, list[int]]:
+        """ページのフィンガープリントと、ページ内の画像 xref の並びを返す.
+
+        Args:
+            page: 対象のページ
+
+        Returns:
+            (フィンガープリント, page.get_images() 順の画像 xref のリスト)
+        """
+        h = hashlib.sha256()
+        h.update(f"{_FORMAT_VERSION}:{__version__}:{tuple(page.rect)}:{page.rotation}".encode())
+        h.update(page.read_contents())
+
+        image_xrefs: list[int] = []
+        for img in page.get_images(full=True):
+            xref, smask, name = img[0], img[1], img[7]
+            image_xrefs.append(xref)
+            # 幅・高さ・bpc・色空間
+            h.update(f"image:{name}:{img[2:6]}".encode())
+            h.update(self._digest("stream", xref))
+            if smask:
+                h.update(self._digest("stream", smask))
+
+        for font in page.get_fonts(full=True):
+            xref, font_type, basefont, name, encoding = font[0], font[2], font[3], font[4], font[5]
+            h.update(f"font:{name}:{basefont}:{font_type}:{encoding}".encode())
+            if xref:
+                h.update(self._digest("font", xref))
+
+        for xobject in page.get_xobjects():
+            h.update(f"xobject:{xobject[1]}".encode())
+            h.update(self._digest("stream", xobject[0]))
+
+        return h.hexdigest(), image_xrefs
+
+
+class PageCache:
+    """抽出済み SlideData をページのフィンガープリントごとに保存するディスクキャッシュ."""
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = DEFAULT_PAGE_CACHE_BYTES) -> None:
+        """PageCacheを初期化する.
+
+        Args:
+            cache_dir: キャッシュディレクトリ（存在しない場合は作成する）
+            max_bytes: キャッシュ全体の上限サイズ（バイト）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}{_SUFFIX}"
+
+    def get(self, fingerprint: str) -> Optional[tuple[SlideData, list[int]]]:
+        """キャッシュ済みのスライドを返す.
+
+        Args:
+            fingerprint: ページのフィンガープリント
+
+        Returns:
+            (画像データを含まない SlideData, 保存時の画像 xref の並び)。ミスの場合は None
+        """
+        path = self._path(fingerprint)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            slide = SlideData.model_validate(entry["slide"])
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        except (ValueError, KeyError) as e:
+            logger.warning("ページキャッシュのエントリが壊れています: %s (%s)", path.name, e)
+            path.unlink(missing_ok=True)
+            self.stats.misses += 1
+            return None
+        os.utime(path)
+        self.stats.hits += 1
+        return slide, entry["image_xrefs"]
+
+    def evict(self) -> None:
+        """合計サイズが上限以下になるまで、最終利用時刻の古いエントリを削除する."""
+        if self.cache_dir.exists():
+            self.stats.evictions += evict_lru_files(self.cache_dir, f"*{_SUFFIX}", self.max_bytes)
+
+    def put(self, fingerprint: str, slide: SlideData, image_xrefs: list[int]) -> None:
+        """抽出したスライドを保存する（画像のバイト列と保存先パスは含めない）.
+
+        上限を超えた分の削除は evict() でまとめて行う。
+
+        Args:
+            fingerprint: ページのフィンガープリント
+            slide: 抽出済みのスライド
+            image_xrefs: ページ内の画像 xref の並び
+        """
+        entry = {
+            "image_xrefs": image_xrefs,
+            "slide": slide.model_dump(
+                mode="json",
+                exclude={"image_blocks": {"__all__": {"image_data", "source_path"}}},
+            ),
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_name, self._path(fingerprint))
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
@@ -3,23 +3,55 @@
 from __future__ import annotations
 
 import logging
+import re
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import fitz  # PyMuPDF
 
+from src.extractor.image_cache import DEFAULT_IMAGE_CACHE_BYTES, CachedImage, ImageCache
+from src.extractor.page_cache import PageCache, PageFingerprinter
 from src.models import (
     BoundingBox,
-    FontInfo,
+    ElementType,
     ImageBlock,
     PresentationData,
     SlideData,
     TextBlock,
     TextSpan,
+    construct_trusted,
 )
+from src.utils.cache_stats import CacheStats
+from src.utils.page_ranges import PageRanges, select_pages
+from src.utils.progress import PageProgressCallback, notify
+from src.utils.style_table import StyleTable
 
 logger = logging.getLogger(__name__)
 
+# 並列抽出時、1ワーカーあたりに割り当てるページ範囲の数（負荷の偏りを抑える）
+_CHUNKS_PER_WORKER = 4
+
+# 遅延読み込み時、デコードせずに推定する画像フォーマット（PDFフィルタ名 → 拡張子）
+_FILTER_TO_EXT = {
+    "DCTDecode": "jpeg",
+    "JPXDecode": "jpx",
+}
+
+# テキスト抽出時の TextPage のフラグ（画像は含めない）
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE
+
+# コンテンツストリーム中のインライン画像の開始オペレータ（文字列中の一致は誤検出として許容する）
+_INLINE_IMAGE_RE = re.compile(rb"\bBI\b")
+
+# メモリ上の PDF を抽出したときの PresentationData.source_path
+MEMORY_SOURCE = "<memory>"
+
+# 抽出元: PDF ファイルのパス、または PDF のバイト列
+PDFSource = str | Path | bytes | bytearray | memoryview
+
 
 class PDFExtractor:
     """PDFファイルからスライド構造データを抽出するクラス.
@@ -28,16 +60,48 @@ class PDFExtractor:
     正確に抽出し、PresentationDataモデルに格納する。
     """
 
-    def __init__(self, pdf_path: str | Path) -> None:
+    def __init__(
+        self,
+        pdf_path: PDFSource,
+        image_cache_bytes: int = DEFAULT_IMAGE_CACHE_BYTES,
+        lazy_images: bool = False,
+        page_cache: Optional[PageCache] = None,
+        pages: Optional[PageRanges] = None,
+        extract_images: bool = True,
+    ) -> None:
         """PDFExtractorを初期化する.
 
         Args:
-            pdf_path: 読み込むPDFファイルのパス
+            pdf_path: 読み込むPDFファイルのパス、または PDF のバイト列
+                （バイト列の場合はファイルを介さずメモリ上で開く）
+            image_cache_bytes: ページ間で共有する画像キャッシュの上限（バイト）。0 で無効
+            lazy_images: True の場合、画像データを抽出時に読み込まず xref 参照だけを保持し、
+                ImageBlock.load_payload() などで必要になった時点で読み込む。
+                ドキュメントを閉じた後は読み込めないため、構築が終わるまで open のままにすること
+            page_cache: ページ単位の抽出キャッシュ。指定した場合、内容の変わらないページは
+                抽出せずキャッシュから復元する
+            pages: 抽出するページの範囲（parse_page_ranges() の戻り値）。None の場合は全ページ。
+                範囲外のページは開くことも解析することもしない
+            extract_images: False の場合、画像の一覧取得・デコードを行わずテキストだけを抽出する
+                （ページキャッシュは画像を含む抽出結果を保持するため使わない）
         """
-        self.pdf_path = Path(pdf_path)
-        if not self.pdf_path.exists():
-            raise FileNotFoundError(f"PDFファイルが見つかりません: {self.pdf_path}")
+        self._stream: Optional[bytes | bytearray | memoryview] = None
+        if isinstance(pdf_path, (bytes, bytearray, memoryview)):
+            self._stream = pdf_path
+            self.pdf_path: Optional[Path] = None
+        else:
+            self.pdf_path = Path(pdf_path)
+            if not self.pdf_path.exists():
+                raise FileNotFoundError(f"PDFファイルが見つかりません: {self.pdf_path}")
         self._doc: Optional[fitz.Document] = None
+        self.image_cache = ImageCache(max_bytes=image_cache_bytes)
+        self.lazy_images = lazy_images
+        self.page_cache = page_cache if extract_images else None
+        self.pages = pages
+        self.extract_images = extract_images
+        self.styles = StyleTable()
+        self._fingerprinter: Optional[PageFingerprinter] = None
+        self._page_numbers: Optional[list[int]] = None
 
     def open(self) -> None:
         """PDFドキュメントを開く.
@@ -46,27 +110,43 @@ class PDFExtractor:
             FileNotFoundError: ファイルが存在しない場合（__init__で検証済み）
             ValueError: PDFが破損している、またはPDFでない場合
         """
-        logger.info("PDFを開いています: %s", self.pdf_path)
+        logger.info("PDFを開いています: %s", self.source_name)
         try:
-            self._doc = fitz.open(str(self.pdf_path))
+            if self._stream is not None:
+                self._doc = fitz.open(stream=self._stream, filetype="pdf")
+            else:
+                self._doc = fitz.open(str(self.pdf_path))
         except (RuntimeError, ValueError) as e:
             raise ValueError(
-                f"PDFの読み込みに失敗しました（破損または非PDFの可能性）: {self.pdf_path}"
+                f"PDFの読み込みに失敗しました（破損または非PDFの可能性）: {self.source_name}"
             ) from e
         except Exception as e:
             err_msg = str(e).lower()
             if "cannot open" in err_msg or "invalid" in err_msg or "pdf" in err_msg:
                 raise ValueError(
-                    f"PDFの読み込みに失敗しました: {self.pdf_path}"
+                    f"PDFの読み込みに失敗しました: {self.source_name}"
                 ) from e
             raise
-        logger.info("ページ数: %d", len(self._doc))
+        page_count = len(self._doc)
+        self._page_numbers = select_pages(self.pages, page_count)
+        if not self._page_numbers:
+            self.close()
+            raise ValueError(f"指定したページがPDFにありません（全 {page_count} ページ）")
+        if self.pages is None:
+            logger.info("ページ数: %d", page_count)
+        else:
+            logger.info("ページ数: %d（うち %d ページを変換）", page_count, len(self._page_numbers))
 
     def close(self) -> None:
         """PDFドキュメントを閉じる."""
         if self._doc:
             self._doc.close()
             self._doc = None
+        self._page_numbers = None
+        self._fingerprinter = None
+        self.image_cache.clear()
+        if self.page_cache is not None:
+            self.page_cache.evict()
 
     def __enter__(self) -> PDFExtractor:
         self.open()
@@ -75,6 +155,11 @@ class PDFExtractor:
     def __exit__(self, *args: object) -> None:
         self.close()
 
+    @property
+    def source_name(self) -> str:
+        """ログと PresentationData.source_path に使う抽出元の名前."""
+        return MEMORY_SOURCE if self.pdf_path is None else str(self.pdf_path)
+
     @property
     def doc(self) -> fitz.Document:
         """開かれたドキュメントを返す."""
@@ -82,11 +167,27 @@ class PDFExtractor:
             raise RuntimeError("PDFが開かれていません。open()を先に呼び出してください。")
         return self._doc
 
-    def extract_all(self) -> PresentationData:
-        """全ページからスライドデータを抽出する.
+    @property
+    def page_numbers(self) -> list[int]:
+        """抽出するページの番号（0始まり、昇順）."""
+        if self._page_numbers is None:
+            raise RuntimeError("PDFが開かれていません。open()を先に呼び出してください。")
+        return self._page_numbers
 
-        open() 済みのドキュメントに対して全ページを走査し、
+    def extract_all(
+        self, workers: int = 1, on_progress: Optional[PageProgressCallback] = None
+    ) -> PresentationData:
+        """全ページ（pages を指定した場合はその範囲）からスライドデータを抽出する.
+
+        open() 済みのドキュメントに対して対象ページを走査し、
         テキストブロック・画像・座標を PresentationData に格納して返す。
+        workers が 2 以上の場合はページ範囲ごとに別プロセスで抽出し、
+        ページ順に再構成する（結果は逐次実行と同一）。
+
+        Args:
+            workers: 抽出に使うプロセス数。1 以下の場合は逐次実行
+            on_progress: 抽出済みページ数を (完了数, 総数) で受け取るコールバック。
+                並列抽出ではページ範囲の完了ごとに呼ばれる
 
         Returns:
             PresentationData: プレゼンテーション全体の構造データ（スライド幅・高さ含む）
@@ -94,21 +195,114 @@ class PDFExtractor:
         Raises:
             RuntimeError: open() が呼ばれていない場合
         """
-        slides: list[SlideData] = []
-        for page_num in range(len(self.doc)):
-            logger.debug("ページ %d を処理中...", page_num + 1)
-            slide = self._extract_page(page_num)
-            slides.append(slide)
-
-        first_page = self.doc[0]
+        page_numbers = self.page_numbers
+        page_count = len(page_numbers)
+        if workers > 1 and page_count > 1:
+            slides = self._extract_parallel(page_numbers, workers, on_progress)
+        else:
+            slides = []
+            for done, page_num in enumerate(page_numbers, start=1):
+                logger.debug("ページ %d を処理中...", page_num + 1)
+                slides.append(self._extract_page(page_num))
+                notify(on_progress, done, page_count)
+
+        first_page = self.doc[page_numbers[0]]
         return PresentationData(
-            source_path=str(self.pdf_path),
+            source_path=self.source_name,
             total_pages=len(self.doc),
             slides=slides,
             slide_width=first_page.rect.width,
             slide_height=first_page.rect.height,
         )
 
+    @property
+    def slide_size(self) -> tuple[float, float]:
+        """最初に抽出するページのサイズ (幅, 高さ) をポイント単位で返す."""
+        rect = self.doc[self.page_numbers[0]].rect
+        return rect.width, rect.height
+
+    def iter_slides(self) -> Iterator[SlideData]:
+        """ページを1枚ずつ抽出して SlideData を逐次返すジェネレータ.
+
+        extract_all() と異なり全ページ分を保持しないため、呼び出し側が
+        スライドを処理後に破棄すればメモリ使用量は最大ページ分に収まる。
+
+        Yields:
+            ページ順の SlideData
+
+        Raises:
+            RuntimeError: open() が呼ばれていない場合
+        """
+        for page_num in self.page_numbers:
+            logger.debug("ページ %d を処理中...", page_num + 1)
+            yield self._extract_page(page_num)
+
+    def _extract_parallel(
+        self,
+        page_numbers: list[int],
+        workers: int,
+        on_progress: Optional[PageProgressCallback] = None,
+    ) -> list[SlideData]:
+        """ページ範囲を複数プロセスに分配して抽出する.
+
+        各ワーカーは自前の fitz.Document を開き、担当範囲の SlideData を返す。
+
+        Args:
+            page_numbers: 抽出するページ番号（0始まり、昇順）
+            workers: プロセス数
+            on_progress: 抽出済みページ数を受け取るコールバック
+
+        Returns:
+            ページ順に並んだ SlideData のリスト
+        """
+        page_count = len(page_numbers)
+        ranges = _split_page_ranges(page_count, workers * _CHUNKS_PER_WORKER)
+        workers = min(workers, len(ranges))
+        logger.info("%d プロセスで %d ページを並列抽出", workers, page_count)
+
+        slides: list[SlideData] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = [page_numbers[start:stop] for start, stop in ranges]
+            # メモリ上の PDF は各ワーカーにバイト列を渡す
+            source = str(self.pdf_path) if self._stream is None else bytes(self._stream)
+            sources = [source] * len(ranges)
+            cache_sizes = [self.image_cache.max_bytes] * len(ranges)
+            lazy_flags = [self.lazy_images] * len(ranges)
+            image_flags = [self.extract_images] * len(ranges)
+            page_cache_args = [self._page_cache_args()] * len(ranges)
+            # map() は投入順に結果を返すため、そのままページ順になる
+            for chunk, cache_stats, page_cache_stats in executor.map(
+                _extract_pages,
+                sources,
+                chunks,
+                cache_sizes,
+                lazy_flags,
+                image_flags,
+                page_cache_args,
+            ):
+                slides.extend(chunk)
+                self.image_cache.stats.merge(cache_stats)
+                if self.page_cache is not None and page_cache_stats is not None:
+                    self.page_cache.stats.merge(page_cache_stats)
+                notify(on_progress, len(slides), page_count)
+
+        for slide in slides:
+            # プロセス間で複製された書式を親プロセスの共有オブジェクトに戻す
+            for text_block in slide.text_blocks:
+                for span in text_block.spans:
+                    span.font = self.styles.intern(span.font)
+            # ローダーはプロセス間で受け渡せないため、親プロセスのドキュメントに結び直す
+            if self.lazy_images:
+                for image_block in slide.image_blocks:
+                    image_block.bind_loader(self._load_image_data)
+        return slides
+
+    def _page_cache_args(self) -> Optional[tuple[str, int]]:
+        """ワーカープロセスでページキャッシュを開くための (ディレクトリ, 上限バイト)."""
+        if self.page_cache is None:
+            return None
+        return str(self.page_cache.cache_dir), self.page_cache.max_bytes
+
     def _extract_page(self, page_num: int) -> SlideData:
         """1ページ分のスライドデータを抽出する.
 
@@ -119,9 +313,38 @@ class PDFExtractor:
             SlideData: 1スライド分の構造データ
         """
         page = self.doc[page_num]
+        if self.page_cache is None:
+            return self._extract_page_uncached(page, page_num)
+
+        if self._fingerprinter is None:
+            self._fingerprinter = PageFingerprinter(self.doc)
+        fingerprint, image_xrefs = self._fingerprinter.fingerprint(page)
+        cached = self.page_cache.get(fingerprint)
+        if cached is not None:
+            slide, cached_xrefs = cached
+            xref_map = dict(zip(cached_xrefs, image_xrefs, strict=True))
+            return self._restore_cached_slide(slide, page_num, xref_map)
+
+        slide = self._extract_page_uncached(page, page_num)
+        self.page_cache.put(fingerprint, slide, image_xrefs)
+        return slide
 
-        text_blocks = self._extract_text_blocks(page)
-        image_blocks = self._extract_images(page, page_num)
+    def _extract_page_uncached(self, page: fitz.Page, page_num: int) -> SlideData:
+        """ページからテキストブロックと画像を抽出する.
+
+        テキストは画像を含まない TextPage の辞書出力から、画像の配置は画像だけを保持する
+        TextPage の画像情報（extractIMGINFO()）から取り出す。画像を保持した TextPage の
+        辞書出力は画像を再エンコードして埋め込むため、テキストの抽出には使わない。
+
+        Args:
+            page: PyMuPDFのPageオブジェクト
+            page_num: ページ番号（0始まり）
+
+        Returns:
+            SlideData: 1スライド分の構造データ
+        """
+        text_blocks = self._extract_text_blocks(page.get_textpage(flags=_TEXT_FLAGS).extractDICT())
+        image_blocks = self._extract_images(page, page_num) if self.extract_images else []
 
         return SlideData(
             page_number=page_num + 1,
@@ -131,68 +354,94 @@ class PDFExtractor:
             image_blocks=image_blocks,
         )
 
-    def _extract_text_blocks(self, page: fitz.Page) -> list[TextBlock]:
-        """ページからテキストブロックを抽出する.
+    def _restore_cached_slide(
+        self, slide: SlideData, page_num: int, xref_map: dict[int, int]
+    ) -> SlideData:
+        """ページキャッシュから読み込んだスライドを現在のドキュメントに結び付ける.
+
+        Args:
+            slide: キャッシュから読み込んだ SlideData（画像データなし）
+            page_num: ページ番号（0始まり）
+            xref_map: キャッシュ保存時の画像 xref → 現在のドキュメントの xref
+
+        Returns:
+            抽出した場合と同等の SlideData
+        """
+        slide.page_number = page_num + 1
+        for text_block in slide.text_blocks:
+            for span in text_block.spans:
+                span.font = self.styles.intern(span.font)
+
+        image_blocks: list[ImageBlock] = []
+        for image_block in slide.image_blocks:
+            xref = xref_map.get(image_block.xref) if image_block.xref is not None else None
+            if xref is None:
+                continue
+            image_block.xref = xref
+            if self.lazy_images:
+                image_block.bind_loader(self._load_image_data)
+            else:
+                image = self._load_image(xref)
+                if image is None:
+                    continue
+                image_block.image_data = image.data
+                image_block.image_format = image.ext
+            image_blocks.append(image_block)
+        slide.image_blocks = image_blocks
+        return slide
+
+    def _extract_text_blocks(self, page_dict: dict[str, Any]) -> list[TextBlock]:
+        """ページの辞書出力からテキストブロックを抽出する.
 
-        PyMuPDFの `get_text("dict")` を使用して、フォント情報付きで
-        テキストを抽出する。
+        PyMuPDFの TextPage の辞書出力（`get_text("dict")` と同じ形式）から、
+        フォント情報付きでテキストを抽出する。PyMuPDF の出力は型が保証されているため、
+        モデルは construct_trusted() で検証を省略して生成する。
+        書式はドキュメント単位の StyleTable で共有 FontInfo に解決する。
 
         Args:
-            page: PyMuPDFのPageオブジェクト
+            page_dict: TextPage.extractDICT() の戻り値
 
         Returns:
             テキストブロックのリスト
         """
         blocks: list[TextBlock] = []
-        page_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        resolve_style = self.styles.resolve
 
         for block in page_dict.get("blocks", []):
             if block.get("type") != 0:  # type 0 = テキストブロック
                 continue
 
-            block_bbox = BoundingBox(
-                x0=block["bbox"][0],
-                y0=block["bbox"][1],
-                x1=block["bbox"][2],
-                y1=block["bbox"][3],
-            )
-
             spans: list[TextSpan] = []
             for line in block.get("lines", []):
                 for span in line.get("spans", []):
-                    color_int = span.get("color", 0)
-                    color_hex = f"#{color_int:06x}"
-
-                    font_info = FontInfo(
-                        name=span.get("font", "Arial"),
-                        size=round(span.get("size", 12.0), 1),
-                        bold="Bold" in span.get("font", "")
-                        or "bold" in span.get("font", "").lower(),
-                        italic="Italic" in span.get("font", "")
-                        or "italic" in span.get("font", "").lower(),
-                        color=color_hex,
+                    font_info = resolve_style(
+                        span.get("font", "Arial"),
+                        span.get("size", 12.0),
+                        span.get("flags", 0),
+                        span.get("color", 0),
                     )
-
-                    span_bbox = BoundingBox(
-                        x0=span["bbox"][0],
-                        y0=span["bbox"][1],
-                        x1=span["bbox"][2],
-                        y1=span["bbox"][3],
-                    )
-
                     spans.append(
-                        TextSpan(
-                            text=span.get("text", ""),
-                            font=font_info,
-                            bbox=span_bbox,
+                        construct_trusted(
+                            TextSpan,
+                            {
+                                "text": span.get("text", ""),
+                                "font": font_info,
+                                "bbox": _trusted_bbox(span["bbox"]),
+                            },
                         )
                     )
 
             if spans:
                 blocks.append(
-                    TextBlock(
-                        spans=spans,
-                        bbox=block_bbox,
+                    construct_trusted(
+                        TextBlock,
+                        {
+                            "spans": spans,
+                            "bbox": _trusted_bbox(block["bbox"]),
+                            "element_type": ElementType.UNKNOWN,
+                            "line_spacing": 1.0,
+                            "alignment": "left",
+                        },
                     )
                 )
 
@@ -200,7 +449,12 @@ class PDFExtractor:
         return blocks
 
     def _extract_images(self, page: fitz.Page, page_num: int) -> list[ImageBlock]:
-        """ページから画像を抽出する.
+        """画像だけを保持する TextPage の画像情報から画像を抽出する.
+
+        同じ画像が複数の位置に配置されている場合は、配置ごとに ImageBlock を作る。
+        インライン画像など xref を持たない画像は抽出しない。辞書出力（extractDICT()）は
+        ページからはみ出した画像を含まず、画像のデコード・再エンコードも行うため、
+        画像情報（extractIMGINFO()）を使う。
 
         Args:
             page: PyMuPDFのPageオブジェクト
@@ -209,37 +463,47 @@ class PDFExtractor:
         Returns:
             画像ブロックのリスト
         """
+        textpage = page.get_textpage(flags=fitz.TEXT_PRESERVE_IMAGES)
+        placements = textpage.extractIMGINFO()
+        if not placements:
+            return []
+
         images: list[ImageBlock] = []
+        resolved = _resolve_image_xrefs(page, textpage, placements)
 
-        for img_index, img_info in enumerate(page.get_images(full=True)):
-            xref = img_info[0]
+        for img_index, (placement, image_ref) in enumerate(
+            zip(placements, resolved, strict=True)
+        ):
+            if image_ref is None:
+                continue
+            xref, pdf_filter = image_ref
 
             try:
-                base_image = self.doc.extract_image(xref)
-                if base_image is None:
+                x0, y0, x1, y1 = placement["bbox"]
+                if x1 <= x0 or y1 <= y0:
                     continue
+                bbox = BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1)
 
-                image_data = base_image.get("image", b"")
-                image_ext = base_image.get("ext", "png")
-
-                # 画像の表示位置を取得
-                img_rects = page.get_image_rects(xref)
-                if not img_rects:
+                if self.lazy_images:
+                    image_block = ImageBlock(
+                        bbox=bbox,
+                        image_format=_FILTER_TO_EXT.get(pdf_filter, "png"),
+                        xref=xref,
+                    )
+                    image_block.bind_loader(self._load_image_data)
+                    images.append(image_block)
                     continue
 
-                rect = img_rects[0]
-                bbox = BoundingBox(
-                    x0=rect.x0,
-                    y0=rect.y0,
-                    x1=rect.x1,
-                    y1=rect.y1,
-                )
+                image = self._load_image(xref)
+                if image is None:
+                    continue
 
                 images.append(
                     ImageBlock(
                         bbox=bbox,
-                        image_data=image_data,
-                        image_format=image_ext,
+                        image_data=image.data,
+                        image_format=image.ext,
+                        xref=xref,
                     )
                 )
 
@@ -254,6 +518,48 @@ class PDFExtractor:
         logger.debug("画像 %d 個を抽出", len(images))
         return images
 
+    def _load_image(self, xref: int) -> Optional[CachedImage]:
+        """xref の画像データを取得する（ページ間キャッシュ経由）.
+
+        同じ xref を参照する ImageBlock はすべて同一の bytes オブジェクトを共有する。
+
+        Args:
+            xref: 画像の xref 番号
+
+        Returns:
+            抽出済み画像。抽出できない場合は None
+        """
+        image = self.image_cache.get(xref)
+        if image is not None:
+            return image
+
+        base_image = self.doc.extract_image(xref)
+        if base_image is None:
+            return None
+        image = CachedImage(
+            data=base_image.get("image", b""),
+            ext=base_image.get("ext", "png"),
+        )
+        self.image_cache.put(xref, image)
+        return image
+
+    def _load_image_data(self, xref: int) -> bytes:
+        """遅延読み込み用ローダー: xref の画像データを返す.
+
+        Args:
+            xref: 画像の xref 番号
+
+        Returns:
+            画像のバイト列
+
+        Raises:
+            ValueError: 画像を抽出できない場合
+        """
+        image = self._load_image(xref)
+        if image is None:
+            raise ValueError(f"画像を抽出できません: xref={xref}")
+        return image.data
+
     def save_images(self, presentation: PresentationData, output_dir: str | Path) -> None:
         """抽出した画像をファイルに保存する.
 
@@ -261,13 +567,191 @@ class PDFExtractor:
             presentation: 抽出済みプレゼンテーションデータ
             output_dir: 画像保存先ディレクトリ
         """
+        for slide in presentation.slides:
+            self.save_slide_images(slide, output_dir)
+
+    def save_slide_images(self, slide: SlideData, output_dir: str | Path) -> None:
+        """1スライド分の画像をファイルに保存する.
+
+        保存後、各 ImageBlock の source_path に保存先パスを設定する。
+
+        Args:
+            slide: 抽出済みスライドデータ
+            output_dir: 画像保存先ディレクトリ
+        """
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        for slide in presentation.slides:
-            for idx, img_block in enumerate(slide.image_blocks):
-                filename = f"slide{slide.page_number:03d}_img{idx:03d}.{img_block.image_format}"
-                filepath = output_path / filename
-                filepath.write_bytes(img_block.image_data)
-                img_block.source_path = str(filepath)
-                logger.info("画像を保存: %s", filepath)
+        for idx, img_block in enumerate(slide.image_blocks):
+            image_data = img_block.image_data
+            if not image_data and img_block.xref is not None:
+                # 遅延読み込みの画像は保存時に読み込み、以降はファイル参照に切り替える
+                image = self._load_image(img_block.xref)
+                if image is None:
+                    logger.warning("画像を抽出できません: xref=%d", img_block.xref)
+                    continue
+                image_data = image.data
+                img_block.image_format = image.ext
+
+            filename = f"slide{slide.page_number:03d}_img{idx:03d}.{img_block.image_format}"
+            filepath = output_path / filename
+            filepath.write_bytes(image_data)
+            img_block.source_path = str(filepath)
+            logger.info("画像を保存: %s", filepath)
+
+
+def _trusted_bbox(rect: tuple[float, float, float, float]) -> BoundingBox:
+    """PyMuPDF の bbox タプルから検証なしで BoundingBox を生成する.
+
+    Args:
+        rect: (x0, y0, x1, y1)
+
+    Returns:
+        BoundingBox
+    """
+    x0, y0, x1, y1 = rect
+    return construct_trusted(BoundingBox, {"x0": x0, "y0": y0, "x1": x1, "y1": y1})
+
+
+def _resolve_image_xrefs(
+    page: fitz.Page, textpage: fitz.TextPage, placements: list[dict[str, Any]]
+) -> list[Optional[tuple[int, str]]]:
+    """TextPage の画像情報を、ページが参照する画像の xref に対応付ける.
+
+    画像情報は xref を持たないため、page.get_images()（リソースの参照のみで
+    コンテンツストリームは解釈しない）の画像と幅・高さ・ビット深度・色空間で照合する。
+    照合する画像が複数ある場合と、インライン画像のあるページで同じ画像に照合する配置が
+    複数ある場合に限り、画素の MD5 で確かめる。配置側の MD5 は同じ TextPage から
+    取り出すため、コンテンツストリームを再び解釈しない（ページ内の画像はすべてデコードする）。
+
+    Args:
+        page: PyMuPDFのPageオブジェクト
+        textpage: placements を取り出した、画像を保持する TextPage
+        placements: 画像の配置ごとの情報（TextPage.extractIMGINFO() の戻り値）
+
+    Returns:
+        配置ごとの (xref, PDFフィルタ名)。対応する xref がない場合は None
+    """
+    filters: dict[int, str] = {}
+    colorspaces: dict[int, str] = {}
+    by_shape: dict[tuple[int, int, int], list[int]] = {}
+    for img_info in page.get_images(full=True):
+        xref = img_info[0]
+        if xref in filters:
+            continue
+        filters[xref] = img_info[8]
+        colorspaces[xref] = img_info[5]
+        by_shape.setdefault((img_info[2], img_info[3], img_info[4]), []).append(xref)
+
+    matches: list[list[int]] = []
+    for placement in placements:
+        shape = (placement["width"], placement["height"], placement["bpc"])
+        family = placement["cs-name"].partition("(")[0]
+        # 色空間を辞書に持たない画像（ステンシルマスク・JPX）は色空間を問わない
+        matches.append(
+            [xref for xref in by_shape.get(shape, []) if colorspaces[xref] in ("", family)]
+        )
+    placement_counts = Counter(xref for candidates in matches for xref in candidates)
+
+    inline_images: Optional[bool] = None
+    digests: Optional[list[bytes]] = None
+    xref_digests: dict[int, bytes] = {}
+    resolved: list[Optional[tuple[int, str]]] = []
+    for index, candidates in enumerate(matches):
+        if not candidates:
+            # インライン画像（BI/ID/EI）はリソースに現れず、対応する xref がない
+            resolved.append(None)
+            continue
+        if len(candidates) == 1:
+            xref = candidates[0]
+            if placement_counts[xref] == 1:
+                resolved.append((xref, filters[xref]))
+                continue
+            # 同じ画像の再配置か、同じ寸法のインライン画像かは寸法では区別できない
+            if inline_images is None:
+                inline_images = _has_inline_images(page)
+            if not inline_images:
+                resolved.append((xref, filters[xref]))
+                continue
+        # 寸法だけでは決まらない: 画素の MD5 が一致する画像を探す
+        if digests is None:
+            digests = [info["digest"] for info in textpage.extractIMGINFO(hashes=True)]
+        match = None
+        for xref in candidates:
+            if xref not in xref_digests:
+                xref_digests[xref] = fitz.Pixmap(page.parent, xref).digest
+            if xref_digests[xref] == digests[index]:
+                match = xref
+                break
+        resolved.append((match, filters[match]) if match is not None else None)
+    return resolved
+
+
+def _has_inline_images(page: fitz.Page) -> bool:
+    """ページまたはページが参照するフォーム XObject がインライン画像を含み得るか.
+
+    コンテンツストリームを解釈せず、展開したバイト列に BI オペレータがあるかだけを見る。
+    """
+    if _INLINE_IMAGE_RE.search(page.read_contents()):
+        return True
+    doc = page.parent
+    return any(
+        _INLINE_IMAGE_RE.search(doc.xref_stream(xobject[0]) or b"")
+        for xobject in page.get_xobjects()
+    )
+
+
+def _split_page_ranges(page_count: int, chunks: int) -> list[tuple[int, int]]:
+    """ページを連続した範囲に分割する.
+
+    Args:
+        page_count: 総ページ数
+        chunks: 分割数の上限
+
+    Returns:
+        (開始, 終了) の半開区間リスト（ページ番号は0始まり）
+    """
+    chunks = max(1, min(chunks, page_count))
+    size, rest = divmod(page_count, chunks)
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < rest else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_pages(
+    pdf_path: str | bytes,
+    page_numbers: list[int],
+    image_cache_bytes: int,
+    lazy_images: bool,
+    extract_images: bool,
+    page_cache_args: Optional[tuple[str, int]] = None,
+) -> tuple[list[SlideData], CacheStats, Optional[CacheStats]]:
+    """ワーカープロセスで指定したページを抽出する.
+
+    lazy_images の場合、画像データはプロセス間で転送せず xref 参照のみを返す。
+
+    Args:
+        pdf_path: PDFファイルのパス、または PDF のバイト列
+        page_numbers: 抽出するページ番号（0始まり）
+        image_cache_bytes: ワーカー内の画像キャッシュ上限（バイト）
+        lazy_images: 画像データを遅延読み込みにするか
+        extract_images: 画像を抽出するか
+        page_cache_args: ページキャッシュの (ディレクトリ, 上限バイト)。None の場合は使わない
+
+    Returns:
+        指定ページの SlideData のリストと、ワーカー内の画像キャッシュ・ページキャッシュの統計
+    """
+    page_cache = PageCache(*page_cache_args) if page_cache_args else None
+    with PDFExtractor(
+        pdf_path,
+        image_cache_bytes=image_cache_bytes,
+        lazy_images=lazy_images,
+        page_cache=page_cache,
+        extract_images=extract_images,
+    ) as extractor:
+        slides = [extractor._extract_page(page_num) for page_num in page_numbers]
+        return slides, extractor.image_cache.stats, page_cache.stats if page_cache else None
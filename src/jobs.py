@@ -0,0 +1,162 @@
+"""非同期変換ジョブの管理.
+
+大きなPDFの変換は HTTP リクエストの寿命（Web UI のタイムアウト等）を超えることがあるため、
+変換をジョブとして投入し、ジョブIDで進捗の確認と結果の取得を行えるようにする。
+
+進捗はワーカープロセスから multiprocessing.Manager の共有辞書に書き込まれ、
+工程（extract / analyze / build）ごとの完了ページ数として参照できる。
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from src.server import ConversionService
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """ジョブの状態."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """投入された変換ジョブ."""
+
+    id: str
+    result_path: Path
+    future: Future[Path]
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """ジョブが終了（成功・失敗）しているか."""
+        return self.future.done()
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """失敗したジョブの例外（未完了・成功時は None）."""
+        if not self.future.done():
+            return None
+        if self.future.cancelled():
+            return CancelledError("ジョブはキャンセルされました")
+        return self.future.exception()
+
+
+class JobManager:
+    """ConversionService のワーカーでジョブを実行し、状態と結果を保持する."""
+
+    def __init__(self, service: ConversionService, ttl_sec: int = 3600) -> None:
+        """JobManagerを初期化する.
+
+        Args:
+            service: 変換を実行するサービス
+            ttl_sec: 完了したジョブと結果ファイルを保持する秒数
+        """
+        self.service = service
+        self.ttl_sec = ttl_sec
+        self._manager = multiprocessing.get_context("spawn").Manager()
+        self._progress: Any = self._manager.dict()
+        self._work_dir = Path(tempfile.mkdtemp(prefix="pdf2pptx-jobs-"))
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, pdf_bytes: bytes, use_llm: bool = False) -> Job:
+        """変換ジョブを投入する.
+
+        Args:
+            pdf_bytes: 入力PDFのバイト列
+            use_llm: LLM によるレイアウト解析を使用するか
+
+        Returns:
+            投入されたジョブ
+        """
+        self.prune()
+        job_id = uuid.uuid4().hex
+        result_path = self._work_dir / f"{job_id}.pptx"
+        future = self.service.submit_job(
+            job_id, pdf_bytes, result_path, self._progress, use_llm=use_llm
+        )
+        job = Job(id=job_id, result_path=result_path, future=future)
+        with self._lock:
+            self._jobs[job_id] = job
+        future.add_done_callback(lambda _: self._on_done(job))
+        logger.info("ジョブ %s を投入しました", job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """ジョブを取得する（存在しない・期限切れの場合は None）."""
+        self.prune()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job: Job) -> JobStatus:
+        """ジョブの現在の状態を返す."""
+        if job.done:
+            return JobStatus.FAILED if job.error else JobStatus.SUCCEEDED
+        # ワーカーが処理を開始した時点で進捗エントリが作られる
+        return JobStatus.RUNNING if job.id in self._progress else JobStatus.QUEUED
+
+    def snapshot(self, job: Job) -> dict[str, Any]:
+        """ジョブの状態・進捗を JSON 化できる辞書で返す.
+
+        Args:
+            job: 対象のジョブ
+
+        Returns:
+            job_id, status, progress（工程ごとの completed / total）, error を含む辞書
+        """
+        error = job.error
+        return {
+            "job_id": job.id,
+            "status": self.status(job).value,
+            "progress": dict(self._progress.get(job.id, {})),
+            "error": str(error) if error else None,
+        }
+
+    def prune(self) -> None:
+        """保持期限を過ぎたジョブと結果ファイルを削除する."""
+        deadline = time.time() - self.ttl_sec
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job.finished_at is not None and job.finished_at < deadline
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            self._progress.pop(job.id, None)
+            job.result_path.unlink(missing_ok=True)
+            logger.debug("期限切れのジョブ %s を削除しました", job.id)
+
+    def shutdown(self) -> None:
+        """共有辞書のプロセスを停止し、結果ファイルを削除する."""
+        self._manager.shutdown()
+        shutil.rmtree(self._work_dir, ignore_errors=True)
+
+    def _on_done(self, job: Job) -> None:
+        """ジョブ終了時に完了時刻を記録する."""
+        job.finished_at = time.time()
+        if job.error:
+            logger.warning("ジョブ %s が失敗しました: %s", job.id, job.error)
+        else:
+            logger.info("ジョブ %s が完了しました", job.id)
@@ -6,7 +6,9 @@ CLIインターフェースを提供し、PDF→PPTX変換パイプラインを
 from __future__ import annotations
 
 import logging
+import os
 import sys
+from contextlib import ExitStack, closing
 from pathlib import Path
 from typing import Optional
 
@@ -14,17 +16,49 @@ import click
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.logging import RichHandler
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn,
+    MofNCompleteColumn,
+    Progress,
+    SpinnerColumn,
+    TaskID,
+    TextColumn,
+)
 
-from src.analyzer import LayoutAnalyzer
-from src.builder import PPTXBuilder
-from src.extractor import PDFExtractor
+from config.settings import get_settings
+from src.analyzer import (
+    LayoutAnalyzer,
+    LLMLayoutCache,
+    RateLimiter,
+    find_recurring_elements,
+    normalize_presentation,
+    normalize_slide,
+)
+from src.builder import BUILDER_BACKENDS, PPTXBuilder, PresentationTemplate
+from src.extractor import ImageOptimizer, PageCache, PDFExtractor
+from src.extractor.pdf_extractor import PDFSource
+from src.result_cache import ResultCache, result_key
+from src.utils.page_ranges import PageRanges, format_page_ranges, parse_page_ranges
+from src.utils.progress import (
+    STAGE_ANALYZE,
+    STAGE_BUILD,
+    STAGE_EXTRACT,
+    PageProgressCallback,
+    ProgressCallback,
+)
+from src.utils.style_table import StyleTable
 
 # 環境変数の読み込み（config より前に .env を読む）
 load_dotenv()
 
 console = Console()
 
+# CLI で標準入力・標準出力を表すパス
+STDIO_PATH = "-"
+
+# テンプレートの指定（ファイルパス、または読み込み済みの PresentationTemplate）
+TemplateSource = str | Path | PresentationTemplate
+
 
 def setup_logging(level: str | None = None) -> None:
     """ログの設定を行う.
@@ -46,12 +80,242 @@ def setup_logging(level: str | None = None) -> None:
     )
 
 
+def _create_analyzer(use_llm: bool) -> LayoutAnalyzer:
+    """設定に応じて LayoutAnalyzer を生成する.
+
+    Args:
+        use_llm: LLM（Claude API）によるレイアウト解析を使用するか
+
+    Returns:
+        LayoutAnalyzer インスタンス（APIキー未設定時はヒューリスティックのみ）
+    """
+    logger = logging.getLogger(__name__)
+    if not use_llm:
+        return LayoutAnalyzer()
+
+    try:
+        from config.settings import get_settings
+        import anthropic
+
+        settings = get_settings()
+        api_key = (settings.anthropic_api_key or "").strip()
+        if api_key:
+            client = anthropic.AsyncAnthropic(api_key=api_key)
+            cache = None
+            if settings.llm_cache:
+                cache = LLMLayoutCache(
+                    settings.llm_cache_path,
+                    ttl_sec=settings.llm_cache_ttl_days * 24 * 3600,
+                    max_entries=settings.llm_cache_max_entries,
+                )
+            logger.info("LLMレイアウト解析を使用（同時実行数 %d）", settings.llm_concurrency)
+            return LayoutAnalyzer(
+                anthropic_client=client,
+                model=settings.llm_model,
+                concurrency=settings.llm_concurrency,
+                rate_limiter=RateLimiter(
+                    requests_per_minute=settings.llm_requests_per_minute,
+                    tokens_per_minute=settings.llm_tokens_per_minute,
+                ),
+                cache=cache,
+                batch_tokens=settings.llm_batch_tokens,
+                escalation_threshold=settings.llm_escalation_threshold,
+            )
+        logger.warning(
+            "ANTHROPIC_API_KEY が未設定です。ヒューリスティック解析を使用します。"
+        )
+    except ImportError:
+        logger.warning("anthropicパッケージが見つかりません。ルールベース解析を使用します。")
+    return LayoutAnalyzer()
+
+
+def _open_extractor(
+    pdf_path: PDFSource, pages: Optional[PageRanges] = None, extract_images: bool = True
+) -> PDFExtractor:
+    """設定値を反映した PDFExtractor を生成する.
+
+    Args:
+        pdf_path: 入力PDFファイルパス、または PDF のバイト列
+        pages: 抽出するページの範囲。None の場合は全ページ
+        extract_images: 画像を抽出するか
+
+    Returns:
+        未オープンの PDFExtractor（with 文で使用する）
+    """
+    settings = get_settings()
+    page_cache = None
+    if settings.page_cache:
+        page_cache = PageCache(settings.page_cache_dir, settings.page_cache_mb * 1024 * 1024)
+    return PDFExtractor(
+        pdf_path,
+        image_cache_bytes=settings.image_cache_mb * 1024 * 1024,
+        lazy_images=settings.lazy_images,
+        page_cache=page_cache,
+        pages=pages,
+        extract_images=extract_images,
+    )
+
+
+def _create_image_optimizer() -> ImageOptimizer:
+    """設定値を反映した ImageOptimizer を生成する.
+
+    Returns:
+        ImageOptimizer（使い終わったら close() する）
+
+    Raises:
+        ValueError: 画像最適化の設定値が不正な場合
+    """
+    settings = get_settings()
+    return ImageOptimizer(
+        dpi=settings.image_dpi,
+        jpeg_quality=settings.image_jpeg_quality,
+        encoding=settings.image_encoding,
+        workers=settings.image_optimize_workers,
+    )
+
+
+def _create_builder(
+    template_path: Optional[TemplateSource], style_table: StyleTable
+) -> PPTXBuilder:
+    """設定値 pptx_backend に応じた構築クラスの PPTXBuilder を生成する.
+
+    Args:
+        template_path: テンプレートファイルパス（.potx/.pptx）、または読み込み済みのテンプレート
+        style_table: Extractor と共有する書式テーブル
+
+    Returns:
+        PPTXBuilder（または出力が同一の派生クラス）のインスタンス
+
+    Raises:
+        ValueError: 未知のバックエンドが設定されている場合
+    """
+    backend = get_settings().pptx_backend
+    builder_class = BUILDER_BACKENDS.get(backend)
+    if builder_class is None:
+        raise ValueError(
+            f"不明なPPTX構築バックエンドです: {backend}（{', '.join(BUILDER_BACKENDS)}）"
+        )
+    if isinstance(template_path, PresentationTemplate):
+        return builder_class(template=template_path, style_table=style_table)
+    return builder_class(template_path=template_path, style_table=style_table)
+
+
+def _log_image_cache_stats(extractor: PDFExtractor) -> None:
+    """画像キャッシュ・ページキャッシュの統計をログ出力する.
+
+    Args:
+        extractor: 抽出を終えた PDFExtractor
+    """
+    logger = logging.getLogger(__name__)
+    stats = extractor.image_cache.stats
+    logger.info(
+        "画像キャッシュ: ヒット %d / ミス %d / 追い出し %d",
+        stats.hits,
+        stats.misses,
+        stats.evictions,
+    )
+    if extractor.page_cache is not None:
+        page_stats = extractor.page_cache.stats
+        logger.info(
+            "ページキャッシュ: 再利用 %d ページ / 抽出 %d ページ",
+            page_stats.hits,
+            page_stats.misses,
+        )
+
+
+def _log_image_optimizer_stats(optimizer: ImageOptimizer) -> None:
+    """画像の最適化の統計をログ出力する.
+
+    Args:
+        optimizer: 最適化を終えた ImageOptimizer
+    """
+    stats = optimizer.stats
+    logging.getLogger(__name__).info(
+        "画像の最適化: %d 個を縮小・再圧縮 (%.1f MB → %.1f MB) / %d 個はそのまま",
+        stats.optimized,
+        stats.bytes_before / (1024 * 1024),
+        stats.bytes_after / (1024 * 1024),
+        stats.unchanged,
+    )
+
+
+def _log_llm_cache_stats(analyzer: LayoutAnalyzer) -> None:
+    """LLM判定キャッシュの統計をログ出力する.
+
+    Args:
+        analyzer: 解析を終えた LayoutAnalyzer
+    """
+    if analyzer.cache is None:
+        return
+    stats = analyzer.cache.stats
+    logging.getLogger(__name__).info(
+        "LLMキャッシュ: ヒット %d / ミス %d (ヒット率 %.0f%%)",
+        stats.hits,
+        stats.misses,
+        stats.hit_rate * 100,
+    )
+
+
+def _create_progress(show: bool) -> Progress:
+    """ページ数付きのプログレス表示を生成する.
+
+    rich の Live 表示はコンソールごとに1つしか開始できないため、ライブラリとして
+    （複数スレッドから）呼ばれる場合は表示を無効にし、Live を開始しない。
+
+    Args:
+        show: プログレス表示をコンソールに描画するか
+    """
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        disable=not show,
+    )
+
+
+def _stage_reporter(
+    progress: Progress,
+    task_id: TaskID,
+    stage: str,
+    on_progress: Optional[ProgressCallback],
+) -> PageProgressCallback:
+    """工程内の進捗をプログレス表示と on_progress の両方に反映する関数を返す.
+
+    Args:
+        progress: rich のプログレス表示
+        task_id: 工程に対応するタスク
+        stage: 工程名（STAGE_EXTRACT など）
+        on_progress: 呼び出し側の進捗コールバック
+
+    Returns:
+        (完了ページ数, 総ページ数) を受け取るコールバック
+    """
+
+    def report(completed: int, total: int) -> None:
+        progress.update(task_id, completed=completed, total=total)
+        if on_progress is not None:
+            on_progress(stage, completed, total)
+
+    return report
+
+
 def convert_pdf_to_pptx(
     pdf_path: str | Path,
     output_path: str | Path,
-    template_path: Optional[str | Path] = None,
+    template_path: Optional[TemplateSource] = None,
     use_llm: bool = False,
     save_images: bool = True,
+    jobs: int = 1,
+    stream: bool = False,
+    merge_spans: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+    use_cache: Optional[bool] = None,
+    pages: Optional[str] = None,
+    extract_images: Optional[bool] = None,
+    optimize_images: Optional[bool] = None,
+    show_progress: bool = False,
 ) -> Path:
     """PDFファイルをPowerPointに変換する.
 
@@ -61,92 +325,466 @@ def convert_pdf_to_pptx(
     Args:
         pdf_path: 入力PDFファイルパス
         output_path: 出力PPTXファイルパス
-        template_path: テンプレートファイルパス（.potx/.pptx）。None の場合は空白プレゼン
+        template_path: テンプレートファイルパス（.potx/.pptx）、または読み込み済みの
+            PresentationTemplate。None の場合は空白プレゼン
         use_llm: LLM（Claude API）によるレイアウト解析を使用するか。未設定時はヒューリスティックのみ
         save_images: 画像を出力先の images/ に中間保存するか
+        jobs: PDF解析に使うプロセス数。2 以上でページ範囲ごとに並列抽出する
+        stream: True の場合、1ページずつ抽出→解析→構築して破棄するストリーミング変換を行う
+            （jobs は無視される）
+        merge_spans: 同一書式で同じ行に連続するスパンを構築前に1つのランへ結合するか
+        on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック。
+            工程名は "extract" / "analyze" / "build"
+        use_cache: 同じPDF・設定の変換結果をキャッシュから返すか。None の場合は設定値
+            result_cache に従う。キャッシュにヒットした場合は PPTX をコピーするだけで、
+            中間画像の保存と on_progress の通知は行わない
+        pages: 変換するページ（「1-10,25」形式、1始まり）。None の場合は全ページ。
+            指定外のページは解析しない
+        extract_images: 画像を抽出するか。None の場合は設定値 extract_images に従う。
+            False の場合は画像の一覧取得・デコードを行わずテキストだけを変換する
+        optimize_images: 画像を表示サイズと設定値 image_dpi に合わせて縮小・切り抜きし、
+            再圧縮するか。None の場合は設定値 optimize_images に従う
+        show_progress: プログレス表示をコンソールに描画するか（CLI 用）
 
     Returns:
         保存されたPPTXファイルの Path
 
     Raises:
         FileNotFoundError: 入力PDFが存在しない場合
-        ValueError: PDFが破損している、または読み込みに失敗した場合
+        ValueError: PDFが破損している、または読み込みに失敗した場合、
+            またはページ指定が不正な場合
         OSError: 出力ディレクトリの作成またはファイル書き込みに失敗した場合
     """
     logger = logging.getLogger(__name__)
+    page_ranges = parse_page_ranges(pages) if pages is not None else None
+    if extract_images is None:
+        extract_images = get_settings().extract_images
+    if optimize_images is None:
+        optimize_images = get_settings().optimize_images
+    optimize_images = optimize_images and extract_images
+    cache, key = _open_result_cache(
+        pdf_path,
+        template_path,
+        use_llm,
+        merge_spans,
+        stream,
+        use_cache,
+        page_ranges=page_ranges,
+        extract_images=extract_images,
+        optimize_images=optimize_images,
+    )
+    if cache is not None:
+        cached = cache.get(key, output_path)
+        if cached is not None:
+            logger.info("変換キャッシュにヒット: %s", key[:12])
+            return cached
+        logger.info("変換キャッシュにミス: %s", key[:12])
+
+    if stream:
+        result_path = _convert_streaming(
+            pdf_path,
+            output_path,
+            template_path,
+            use_llm,
+            save_images,
+            merge_spans,
+            on_progress,
+            page_ranges=page_ranges,
+            extract_images=extract_images,
+            optimize_images=optimize_images,
+            show_progress=show_progress,
+        )
+    else:
+        result_path = _convert_in_memory(
+            pdf_path,
+            output_path,
+            template_path,
+            use_llm,
+            save_images,
+            jobs,
+            merge_spans,
+            on_progress,
+            page_ranges=page_ranges,
+            extract_images=extract_images,
+            optimize_images=optimize_images,
+            show_progress=show_progress,
+        )
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        # ステップ1: PDF解析
-        task1 = progress.add_task("PDFを解析中...", total=None)
-        with PDFExtractor(pdf_path) as extractor:
-            presentation_data = extractor.extract_all()
+    # output_path を渡しているので、内部関数は保存先の Path を返す
+    assert isinstance(result_path, Path)
+    if cache is not None:
+        cache.put(key, result_path)
+    return result_path
 
-            if save_images:
-                images_dir = Path(output_path).parent / "images"
-                extractor.save_images(presentation_data, images_dir)
 
-        progress.update(task1, completed=True, description="[green]PDF解析完了")
-        logger.info(
-            "抽出完了: %d スライド, テキスト %d ブロック, 画像 %d 個",
-            len(presentation_data.slides),
-            sum(len(s.text_blocks) for s in presentation_data.slides),
-            sum(len(s.image_blocks) for s in presentation_data.slides),
+def convert_bytes(
+    pdf: bytes | bytearray | memoryview,
+    template_path: Optional[TemplateSource] = None,
+    use_llm: bool = False,
+    jobs: int = 1,
+    stream: bool = False,
+    merge_spans: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+    use_cache: Optional[bool] = None,
+    pages: Optional[str] = None,
+    extract_images: Optional[bool] = None,
+    optimize_images: Optional[bool] = None,
+    show_progress: bool = False,
+) -> bytes:
+    """PDF のバイト列を PowerPoint のバイト列に変換する.
+
+    convert_pdf_to_pptx() と同じパイプラインを、入力は fitz.open(stream=...)、
+    出力は BytesIO への保存で実行する。一時ファイルは作らず、中間画像も保存しない。
+
+    Args:
+        pdf: 入力PDFのバイト列
+        template_path: テンプレートファイルパス（.potx/.pptx）、または読み込み済みの
+            PresentationTemplate。None の場合は空白プレゼン
+        use_llm: LLM（Claude API）によるレイアウト解析を使用するか
+        jobs: PDF解析に使うプロセス数（各ワーカーには PDF のバイト列を渡す）
+        stream: True の場合、1ページずつ抽出→解析→構築するストリーミング変換を行う
+        merge_spans: 同一書式で同じ行に連続するスパンを構築前に1つのランへ結合するか
+        on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック
+        use_cache: 同じPDF・設定の変換結果をキャッシュから返すか。None の場合は設定値
+            result_cache に従う
+        pages: 変換するページ（「1-10,25」形式、1始まり）。None の場合は全ページ。
+            指定外のページは解析しない
+        extract_images: 画像を抽出するか。None の場合は設定値 extract_images に従う。
+            False の場合は画像の一覧取得・デコードを行わずテキストだけを変換する
+        optimize_images: 画像を表示サイズと設定値 image_dpi に合わせて縮小・切り抜きし、
+            再圧縮するか。None の場合は設定値 optimize_images に従う
+        show_progress: プログレス表示をコンソールに描画するか（CLI 用）
+
+    Returns:
+        PPTX のバイト列
+
+    Raises:
+        ValueError: PDFが破損している、または読み込みに失敗した場合、
+            またはページ指定が不正な場合
+    """
+    logger = logging.getLogger(__name__)
+    page_ranges = parse_page_ranges(pages) if pages is not None else None
+    if extract_images is None:
+        extract_images = get_settings().extract_images
+    if optimize_images is None:
+        optimize_images = get_settings().optimize_images
+    optimize_images = optimize_images and extract_images
+    cache, key = _open_result_cache(
+        pdf,
+        template_path,
+        use_llm,
+        merge_spans,
+        stream,
+        use_cache,
+        page_ranges=page_ranges,
+        extract_images=extract_images,
+        optimize_images=optimize_images,
+    )
+    if cache is not None:
+        cached = cache.get_bytes(key)
+        if cached is not None:
+            logger.info("変換キャッシュにヒット: %s", key[:12])
+            return cached
+        logger.info("変換キャッシュにミス: %s", key[:12])
+
+    if stream:
+        result = _convert_streaming(
+            pdf,
+            None,
+            template_path,
+            use_llm,
+            False,
+            merge_spans,
+            on_progress,
+            page_ranges=page_ranges,
+            extract_images=extract_images,
+            optimize_images=optimize_images,
+            show_progress=show_progress,
         )
+    else:
+        result = _convert_in_memory(
+            pdf,
+            None,
+            template_path,
+            use_llm,
+            False,
+            jobs,
+            merge_spans,
+            on_progress,
+            page_ranges=page_ranges,
+            extract_images=extract_images,
+            optimize_images=optimize_images,
+            show_progress=show_progress,
+        )
+    assert isinstance(result, bytes)
 
-        # ステップ2: レイアウト解析
-        task2 = progress.add_task("レイアウトを解析中...", total=None)
-
-        analyzer: LayoutAnalyzer
-        if use_llm:
-            try:
-                from config.settings import get_settings
-                import anthropic
-
-                settings = get_settings()
-                api_key = (settings.anthropic_api_key or "").strip()
-                if api_key:
-                    client = anthropic.Anthropic(api_key=api_key)
-                    analyzer = LayoutAnalyzer(
-                        anthropic_client=client,
-                        model=settings.llm_model,
-                    )
-                    logger.info("LLMレイアウト解析を使用")
-                else:
-                    logger.warning(
-                        "ANTHROPIC_API_KEY が未設定です。ヒューリスティック解析を使用します。"
-                    )
-                    analyzer = LayoutAnalyzer()
-            except ImportError:
-                logger.warning("anthropicパッケージが見つかりません。ルールベース解析を使用します。")
-                analyzer = LayoutAnalyzer()
-        else:
-            analyzer = LayoutAnalyzer()
+    if cache is not None:
+        cache.put_bytes(key, result)
+    return result
 
-        presentation_data = analyzer.analyze_presentation(presentation_data)
-        progress.update(task2, completed=True, description="[green]レイアウト解析完了")
 
-        # ステップ3: PPTX構築
-        task3 = progress.add_task("PowerPointを構築中...", total=None)
-        builder = PPTXBuilder(template_path=template_path)
-        builder.build(presentation_data)
-        result_path = builder.save(output_path)
-        progress.update(task3, completed=True, description="[green]PowerPoint構築完了")
+def _open_result_cache(
+    pdf_path: PDFSource,
+    template_path: Optional[TemplateSource],
+    use_llm: bool,
+    merge_spans: bool,
+    stream: bool,
+    use_cache: Optional[bool],
+    page_ranges: Optional[PageRanges] = None,
+    extract_images: bool = True,
+    optimize_images: bool = False,
+) -> tuple[Optional[ResultCache], str]:
+    """変換結果キャッシュと、この変換のキャッシュキーを返す.
 
-    return result_path
+    Args:
+        pdf_path: 入力PDFファイルパス、または PDF のバイト列
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+        merge_spans: 同一書式スパンを結合するか
+        stream: ストリーミング変換か（繰り返し要素のレイアウト化を行わない）
+        use_cache: キャッシュを使うか。None の場合は設定値 result_cache に従う
+        page_ranges: 変換するページの範囲。None の場合は全ページ
+        extract_images: 画像を抽出するか
+        optimize_images: 画像を最適化するか（最適化の設定もキーに含める）
+
+    Returns:
+        (ResultCache, キー)。キャッシュを使わない場合は (None, "")
+    """
+    settings = get_settings()
+    if use_cache is None:
+        use_cache = settings.result_cache
+    if not use_cache:
+        return None, ""
+    cache = ResultCache(settings.result_cache_dir, settings.result_cache_mb * 1024 * 1024)
+    template_digest = None
+    if isinstance(template_path, PresentationTemplate):
+        # 読み込み時に計算したハッシュを使い、変換のたびにテンプレートを読み直さない
+        template_digest = template_path.digest
+        template_path = template_path.path
+    key = result_key(
+        pdf_path,
+        template_path,
+        use_llm,
+        settings.llm_model,
+        merge_spans,
+        promote_recurring=settings.promote_recurring and not stream,
+        pages=format_page_ranges(page_ranges) if page_ranges is not None else None,
+        extract_images=extract_images,
+        image_optimization=_create_image_optimizer().cache_token if optimize_images else None,
+        escalation_threshold=settings.llm_escalation_threshold,
+        batch_tokens=settings.llm_batch_tokens,
+        template_digest=template_digest,
+    )
+    return cache, key
+
+
+def _convert_in_memory(
+    pdf_path: PDFSource,
+    output_path: Optional[str | Path],
+    template_path: Optional[TemplateSource],
+    use_llm: bool,
+    save_images: bool,
+    jobs: int,
+    merge_spans: bool,
+    on_progress: Optional[ProgressCallback] = None,
+    page_ranges: Optional[PageRanges] = None,
+    extract_images: bool = True,
+    optimize_images: bool = False,
+    show_progress: bool = False,
+) -> Path | bytes:
+    """全ページを PresentationData に抽出してから解析・構築する通常の変換を行う.
+
+    Args:
+        pdf_path: 入力PDFファイルパス、または PDF のバイト列
+        output_path: 出力PPTXファイルパス。None の場合はファイルに書き出さずバイト列で返す
+        template_path: テンプレートファイルパス（.potx/.pptx）
+        use_llm: LLM（Claude API）によるレイアウト解析を使用するか
+        save_images: 画像を出力先の images/ に中間保存するか
+        jobs: PDF解析に使うプロセス数
+        merge_spans: 同一書式で同じ行に連続するスパンを結合するか
+        on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック
+        page_ranges: 変換するページの範囲。None の場合は全ページ
+        extract_images: 画像を抽出するか
+        optimize_images: 画像を表示サイズに合わせて縮小・切り抜きし、再圧縮するか
+        show_progress: プログレス表示をコンソールに描画するか
+
+    Returns:
+        保存されたPPTXファイルの Path（output_path が None の場合は PPTX のバイト列）
+    """
+    logger = logging.getLogger(__name__)
+
+    with _create_progress(show_progress) as progress:
+        # 画像を遅延読み込みする場合に備え、構築が終わるまでPDFを開いたままにする
+        with _open_extractor(pdf_path, page_ranges, extract_images) as extractor:
+            page_count = len(extractor.page_numbers)
+
+            # ステップ1: PDF解析
+            task1 = progress.add_task("PDFを解析中...", total=page_count)
+            presentation_data = extractor.extract_all(
+                workers=jobs,
+                on_progress=_stage_reporter(progress, task1, STAGE_EXTRACT, on_progress),
+            )
+
+            if save_images and extract_images and output_path is not None:
+                images_dir = Path(output_path).parent / "images"
+                extractor.save_images(presentation_data, images_dir)
+
+            if optimize_images:
+                with closing(_create_image_optimizer()) as optimizer:
+                    optimizer.optimize_slides(presentation_data.slides)
+                _log_image_optimizer_stats(optimizer)
+
+            progress.update(task1, description="[green]PDF解析完了")
+            logger.info(
+                "抽出完了: %d スライド, テキスト %d ブロック, 画像 %d 個",
+                len(presentation_data.slides),
+                sum(len(s.text_blocks) for s in presentation_data.slides),
+                sum(len(s.image_blocks) for s in presentation_data.slides),
+            )
+
+            # ステップ2: レイアウト解析
+            task2 = progress.add_task("レイアウトを解析中...", total=page_count)
+            analyzer = _create_analyzer(use_llm)
+            with closing(analyzer):
+                presentation_data = analyzer.analyze_presentation(
+                    presentation_data,
+                    on_progress=_stage_reporter(progress, task2, STAGE_ANALYZE, on_progress),
+                )
+            _log_llm_cache_stats(analyzer)
+            if merge_spans:
+                normalize_presentation(presentation_data)
+            progress.update(task2, description="[green]レイアウト解析完了")
+
+            # ステップ3: PPTX構築（繰り返し要素はスライドレイアウトに1度だけ配置する）
+            task3 = progress.add_task("PowerPointを構築中...", total=page_count)
+            recurring = None
+            if get_settings().promote_recurring:
+                recurring = find_recurring_elements(presentation_data)
+            builder = _create_builder(template_path, extractor.styles)
+            builder.build(
+                presentation_data,
+                on_progress=_stage_reporter(progress, task3, STAGE_BUILD, on_progress),
+                recurring=recurring,
+            )
+            _log_image_cache_stats(extractor)
+
+        result = builder.to_bytes() if output_path is None else builder.save(output_path)
+        progress.update(task3, description="[green]PowerPoint構築完了")
+
+    return result
+
+
+def _convert_streaming(
+    pdf_path: PDFSource,
+    output_path: Optional[str | Path],
+    template_path: Optional[TemplateSource],
+    use_llm: bool,
+    save_images: bool,
+    merge_spans: bool,
+    on_progress: Optional[ProgressCallback] = None,
+    page_ranges: Optional[PageRanges] = None,
+    extract_images: bool = True,
+    optimize_images: bool = False,
+    show_progress: bool = False,
+) -> Path | bytes:
+    """1ページずつ抽出・解析・構築するストリーミング変換を行う.
+
+    PresentationData を組み立てず、各 SlideData は PPTX に追加した時点で破棄する。
+    そのため抽出データのピークメモリはデッキ全体ではなく最大スライド分に比例する。
+    設定 stream_package が有効な場合は、構築したスライドと画像もすぐに出力ファイルへ
+    書き出して解放する。
+
+    Args:
+        pdf_path: 入力PDFファイルパス、または PDF のバイト列
+        output_path: 出力PPTXファイルパス。None の場合はファイルに書き出さずバイト列で返す
+        template_path: テンプレートファイルパス（.potx/.pptx）
+        use_llm: LLM（Claude API）によるレイアウト解析を使用するか
+        save_images: 画像を出力先の images/ に中間保存するか
+        merge_spans: 同一書式で同じ行に連続するスパンを結合するか
+        on_progress: 進捗を (工程名, 完了ページ数, 総ページ数) で受け取るコールバック。
+            ページごとに extract → analyze → build の順で通知される
+        page_ranges: 変換するページの範囲。None の場合は全ページ
+        extract_images: 画像を抽出するか
+        optimize_images: 画像を表示サイズに合わせて縮小・切り抜きし、再圧縮するか
+        show_progress: プログレス表示をコンソールに描画するか
+
+    Returns:
+        保存されたPPTXファイルの Path（output_path が None の場合は PPTX のバイト列）
+    """
+    logger = logging.getLogger(__name__)
+    analyzer = _create_analyzer(use_llm)
+    if output_path is None or not extract_images:
+        save_images = False
+    images_dir = Path(output_path).parent / "images" if output_path is not None else None
+
+    def report(stage: str, completed: int, total: int) -> None:
+        if on_progress is not None:
+            on_progress(stage, completed, total)
+
+    stream_to = output_path if get_settings().stream_package else None
+
+    with _create_progress(show_progress) as progress, closing(analyzer), ExitStack() as stack:
+        with _open_extractor(pdf_path, page_ranges, extract_images) as extractor:
+            total = len(extractor.page_numbers)
+            task = progress.add_task("スライドを変換中...", total=total)
+            # 変換が途中で失敗した場合は、逐次書き出し中の一時ファイルを削除する
+            builder = stack.enter_context(closing(_create_builder(template_path, extractor.styles)))
+            builder.begin(*extractor.slide_size, stream_to=stream_to)
+            optimizer = (
+                stack.enter_context(closing(_create_image_optimizer()))
+                if optimize_images
+                else None
+            )
+
+            for index, slide in enumerate(extractor.iter_slides(), start=1):
+                report(STAGE_EXTRACT, index, total)
+                if save_images and images_dir is not None:
+                    extractor.save_slide_images(slide, images_dir)
+                if optimizer is not None:
+                    optimizer.optimize_slide(slide)
+                analyzer.analyze_slide(slide)
+                report(STAGE_ANALYZE, index, total)
+                if merge_spans:
+                    normalize_slide(slide)
+                builder.add_slide(slide)
+                report(STAGE_BUILD, index, total)
+                progress.advance(task)
+
+        progress.update(task, description="[green]スライド変換完了")
+        logger.info("ストリーミング変換完了: %d スライド", total)
+        _log_image_cache_stats(extractor)
+        if optimizer is not None:
+            _log_image_optimizer_stats(optimizer)
+        _log_llm_cache_stats(analyzer)
+        result = builder.to_bytes() if output_path is None else builder.save(output_path)
+
+    return result
+
+
+def _validate_pages(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[str]:
+    """--pages の書式を変換前に検証する."""
+    if value is None:
+        return None
+    try:
+        parse_page_ranges(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+    return value
 
 
 @click.command()
-@click.argument("pdf_path", type=click.Path(exists=True, path_type=Path))
+@click.argument("pdf_path", type=click.Path(exists=True, allow_dash=True, path_type=Path))
 @click.option(
     "-o",
     "--output",
-    type=click.Path(path_type=Path),
+    type=click.Path(allow_dash=True, path_type=Path),
     default=None,
-    help="出力PPTXファイルパス（デフォルト: 入力ファイル名.pptx）",
+    help=(
+        "出力PPTXファイルパス。- で標準出力"
+        "（デフォルト: 入力ファイル名.pptx、標準入力の場合は -）"
+    ),
 )
 @click.option(
     "-t",
@@ -171,6 +809,52 @@ def convert_pdf_to_pptx(
     default=True,
     help="中間画像ファイルを保存する",
 )
+@click.option(
+    "--stream / --no-stream",
+    default=False,
+    help="1ページずつ変換してメモリ使用量を抑える（大きなPDF向け）",
+)
+@click.option(
+    "--merge-spans / --no-merge-spans",
+    default=True,
+    help="同一書式で連続するスパンを1つのテキストランに結合する",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="PDF解析に使う並列プロセス数",
+)
+@click.option(
+    "--cache / --no-cache",
+    default=None,
+    help="同じPDF・設定の変換結果をキャッシュから返す（デフォルト: 設定値 RESULT_CACHE）",
+)
+@click.option(
+    "--pages",
+    default=None,
+    callback=_validate_pages,
+    metavar="RANGES",
+    help="変換するページ（例: 1-10,25,30-）。指定外のページは解析しない",
+)
+@click.option(
+    "--no-images",
+    "--text-only",
+    "no_images",
+    is_flag=True,
+    default=False,
+    help="画像を抽出せずテキストだけを変換する（デフォルト: 設定値 EXTRACT_IMAGES）",
+)
+@click.option(
+    "--optimize-images / --no-optimize-images",
+    default=None,
+    help=(
+        "画像を表示サイズに合わせて縮小・切り抜きし再圧縮する"
+        "（デフォルト: 設定値 OPTIMIZE_IMAGES）"
+    ),
+)
 @click.version_option(version="0.1.0")
 def cli(
     pdf_path: Path,
@@ -179,34 +863,92 @@ def cli(
     use_llm: bool,
     log_level: str,
     save_images: bool,
+    stream: bool,
+    merge_spans: bool,
+    jobs: int,
+    cache: Optional[bool],
+    pages: Optional[str],
+    no_images: bool,
+    optimize_images: Optional[bool],
 ) -> None:
     """NotebookLM PDFスライドを編集可能なPowerPointに変換します.
 
-    PDF_PATH: 変換するPDFファイルのパス
+    PDF_PATH: 変換するPDFファイルのパス（- で標準入力から読み込む）
     """
-    setup_logging(log_level)
-
     # 出力パスのデフォルト設定
+    from_stdin = str(pdf_path) == STDIO_PATH
     if output is None:
-        output = pdf_path.with_suffix(".pptx")
+        output = Path(STDIO_PATH) if from_stdin else pdf_path.with_suffix(".pptx")
+    to_stdout = str(output) == STDIO_PATH
+    if to_stdout:
+        # 標準出力には PPTX だけを書き出すため、表示とログは標準エラーに出す
+        console.stderr = True
+
+    setup_logging(log_level)
 
     console.print(f"\n[bold blue]NotebookLM PDF → PowerPoint 変換ツール[/bold blue]\n")
-    console.print(f"  入力: {pdf_path}")
-    console.print(f"  出力: {output}")
+    console.print(f"  入力: {'標準入力' if from_stdin else pdf_path}")
+    console.print(f"  出力: {'標準出力' if to_stdout else output}")
     if template:
         console.print(f"  テンプレート: {template}")
     console.print(f"  LLM解析: {'有効' if use_llm else '無効'}")
+    if pages:
+        console.print(f"  ページ: {pages}")
+    extract_images = False if no_images else None
+    if extract_images is False:
+        console.print("  画像: 抽出しない")
     console.print()
 
     logger = logging.getLogger(__name__)
+    pptx_out = None
+    if to_stdout:
+        # PyMuPDF のメッセージなど標準出力への書き込みで PPTX が壊れないよう、
+        # fd 1 を標準エラーに向け、元の標準出力は PPTX の書き出し専用にする
+        sys.stdout.flush()
+        pptx_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    result: str | Path
     try:
-        result = convert_pdf_to_pptx(
-            pdf_path=pdf_path,
-            output_path=output,
-            template_path=template,
-            use_llm=use_llm,
-            save_images=save_images,
-        )
+        if from_stdin or to_stdout:
+            # 標準入出力はファイルを介さずバイト列のまま変換する（中間画像は保存しない）
+            pdf_bytes = sys.stdin.buffer.read() if from_stdin else pdf_path.read_bytes()
+            pptx_bytes = convert_bytes(
+                pdf_bytes,
+                template_path=template,
+                use_llm=use_llm,
+                jobs=jobs,
+                stream=stream,
+                merge_spans=merge_spans,
+                use_cache=cache,
+                pages=pages,
+                extract_images=extract_images,
+                optimize_images=optimize_images,
+                show_progress=True,
+            )
+            if pptx_out is not None:
+                with pptx_out:
+                    pptx_out.write(pptx_bytes)
+                result = "標準出力"
+            else:
+                output.parent.mkdir(parents=True, exist_ok=True)
+                output.write_bytes(pptx_bytes)
+                result = output
+        else:
+            result = convert_pdf_to_pptx(
+                pdf_path=pdf_path,
+                output_path=output,
+                template_path=template,
+                use_llm=use_llm,
+                save_images=save_images,
+                jobs=jobs,
+                stream=stream,
+                merge_spans=merge_spans,
+                use_cache=cache,
+                pages=pages,
+                extract_images=extract_images,
+                optimize_images=optimize_images,
+                show_progress=True,
+            )
         console.print(f"\n[bold green]変換完了![/bold green] → {result}\n")
     except FileNotFoundError as e:
         console.print(f"\n[bold red]エラー:[/bold red] {e}\n")
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import io
+import mmap
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from enum import Enum
-from typing import Optional
+from typing import Any, BinaryIO, Optional, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
 
 
 class ElementType(str, Enum):
@@ -53,7 +59,12 @@ class BoundingBox(BaseModel):
 
 
 class FontInfo(BaseModel):
-    """フォント情報."""
+    """フォント情報.
+
+    同じ書式のスパン間で共有されるため不変（frozen）で、ハッシュ可能。
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     name: str = "Arial"
     size: float = Field(default=12.0, description="フォントサイズ (pt)")
@@ -86,13 +97,89 @@ class TextBlock(BaseModel):
 
 
 class ImageBlock(BaseModel):
-    """画像ブロック."""
+    """画像ブロック.
+
+    画像データは次のいずれかで保持する:
+
+    - image_data: 抽出済みのバイト列
+    - source_path: 保存済みファイル（読み込み時に mmap する）
+    - xref: PDF内の画像参照（bind_loader() で登録したローダーが必要時に読み込む）
+    """
 
     bbox: BoundingBox
     image_data: bytes = Field(default=b"", repr=False)
     image_format: str = Field(default="png", description="画像フォーマット: png, jpeg等")
     element_type: ElementType = ElementType.IMAGE
     source_path: Optional[str] = Field(default=None, description="保存先パス")
+    xref: Optional[int] = Field(default=None, description="PDF内の画像xref（遅延読み込み用）")
+
+    _loader: Optional[Callable[[int], bytes]] = PrivateAttr(default=None)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """pickle 用の状態を返す（ローダーはプロセス間で受け渡せないため除外する）."""
+        state = super().__getstate__()
+        private = state.get("__pydantic_private__")
+        if private and private.get("_loader") is not None:
+            state["__pydantic_private__"] = {**private, "_loader": None}
+        return state
+
+    def bind_loader(self, loader: Callable[[int], bytes]) -> None:
+        """xref から画像データを読み込むローダーを登録する.
+
+        Args:
+            loader: xref を受け取り画像のバイト列を返す関数
+        """
+        self._loader = loader
+
+    @property
+    def has_payload(self) -> bool:
+        """画像データを取得可能か."""
+        return bool(
+            self.image_data
+            or self.source_path
+            or (self.xref is not None and self._loader is not None)
+        )
+
+    def load_payload(self) -> bytes:
+        """画像データをバイト列で返す.
+
+        image_data → source_path → xref の順に参照する。
+
+        Returns:
+            画像のバイト列
+
+        Raises:
+            ValueError: 画像データを取得できない場合
+        """
+        if self.image_data:
+            return self.image_data
+        if self.source_path:
+            with open(self.source_path, "rb") as f:
+                return f.read()
+        if self.xref is not None and self._loader is not None:
+            return self._loader(self.xref)
+        raise ValueError("画像データがありません")
+
+    @contextmanager
+    def open_payload(self) -> Iterator[BinaryIO]:
+        """画像データを読み取り用ストリームとして開く.
+
+        ファイル保存済みの場合は mmap を、それ以外はバイト列を共有する
+        BytesIO を返すため、呼び出し側に渡すまでにデータはコピーされない。
+
+        Yields:
+            画像データの読み取り用ストリーム
+
+        Raises:
+            ValueError: 画像データを取得できない場合
+        """
+        if self.source_path and not self.image_data:
+            with open(self.source_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                yield mapped  # type: ignore[misc]
+            return
+        yield io.BytesIO(self.load_payload())
 
 
 class SlideData(BaseModel):
@@ -114,3 +201,29 @@ class PresentationData(BaseModel):
     slides: list[SlideData] = Field(default_factory=list)
     slide_width: float = Field(default=720.0, description="標準スライド幅 (pt) - 10インチ")
     slide_height: float = Field(default=405.0, description="標準スライド高さ (pt) - 5.625インチ (16:9)")
+
+
+def construct_trusted(model_cls: type[_ModelT], values: dict[str, Any]) -> _ModelT:
+    """検証を行わずにモデルを生成する（形式が保証された入力専用の高速経路）.
+
+    model_construct() と同等だが、デフォルト値の補完やフィールド走査を行わないため
+    高速で（model_construct() は検証付きの生成より遅い）、PyMuPDF の出力のように型が
+    保証された大量のデータの変換に使う。pydantic の内部スロットを直接設定するため、
+    次の前提を満たすモデルにだけ使うこと（tests/test_models.py で確認している）。
+
+    - values にモデルの全フィールドを含める（省略したフィールドは存在しない状態になる）
+    - モデルがプライベート属性（PrivateAttr）を持たない
+
+    Args:
+        model_cls: 生成するモデルクラス
+        values: 全フィールドの値（そのまま __dict__ として使われる）
+
+    Returns:
+        生成されたモデルインスタンス
+    """
+    obj = model_cls.__new__(model_cls)
+    object.__setattr__(obj, "__dict__", values)
+    object.__setattr__(obj, "__pydantic_fields_set__", set(values))
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    object.__setattr__(obj, "__pydantic_private__", None)
+    return obj
@@ -0,0 +1,202 @@
+"""変換結果のキャッシュ - 同じ入力・設定の変換を PPTX のコピーで済ませる.
+
+キーは PDF のバイト列のハッシュと、出力に影響する設定（テンプレートのハッシュ、
+use_llm、LLM モデル名、スパン結合、繰り返し要素のレイアウト化、変換するページと画像の有無、
+変換ツールのバージョン）から導出する。
+完成した PPTX をキャッシュディレクトリに保存し、合計サイズが上限を超えたら
+最後に使われた時刻（ファイルの mtime）が古いものから削除する。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+from src import __version__
+from src.utils.cache_stats import CacheStats
+from src.utils.disk_cache import evict_lru_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+_SUFFIX = ".pptx"
+
+
+def file_digest(path: str | Path) -> str:
+    """ファイル内容の SHA-256 を16進文字列で返す."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def result_key(
+    pdf_path: str | Path | bytes | bytearray | memoryview,
+    template_path: Optional[str | Path] = None,
+    use_llm: bool = False,
+    model: Optional[str] = None,
+    merge_spans: bool = True,
+    promote_recurring: bool = True,
+    pages: Optional[str] = None,
+    extract_images: bool = True,
+    image_optimization: Optional[str] = None,
+    escalation_threshold: Optional[float] = None,
+    batch_tokens: Optional[int] = None,
+    template_digest: Optional[str] = None,
+) -> str:
+    """変換結果のキャッシュキーを計算する.
+
+    Args:
+        pdf_path: 入力PDFファイルパス、または PDF のバイト列
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+        model: LLM モデル名（use_llm が False の場合は無視）
+        merge_spans: 同一書式スパンを結合するか
+        promote_recurring: 繰り返し要素をスライドレイアウトに集約するか
+        pages: 変換するページの指定（「1-10,25」形式）。None の場合は全ページ
+        extract_images: 画像を抽出するか
+        image_optimization: 画像の最適化の設定（ImageOptimizer.cache_token）。
+            None の場合は最適化しない
+        escalation_threshold: LLM に送るスライドを選ぶ信頼度のしきい値
+            （use_llm が False の場合は無視）
+        batch_tokens: LLM の1リクエストにまとめる入力トークン数の目安
+            （use_llm が False の場合は無視）
+        template_digest: テンプレートの SHA-256。指定した場合は template_path を
+            読み直さずにこれを使う
+
+    Returns:
+        SHA-256 の16進文字列
+    """
+    if template_digest is None and template_path:
+        template_digest = file_digest(template_path)
+    parts = {
+        "pdf": (
+            hashlib.sha256(pdf_path).hexdigest()
+            if isinstance(pdf_path, (bytes, bytearray, memoryview))
+            else file_digest(pdf_path)
+        ),
+        "template": template_digest,
+        "use_llm": use_llm,
+        "model": model if use_llm else None,
+        "escalation_threshold": escalation_threshold if use_llm else None,
+        "batch_tokens": batch_tokens if use_llm else None,
+        "merge_spans": merge_spans,
+        "promote_recurring": promote_recurring,
+        "pages": pages,
+        "extract_images": extract_images,
+        "image_optimization": image_optimization,
+        "version": __version__,
+    }
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """完成した PPTX をキーごとに保存する、サイズ上限付きのディスクキャッシュ."""
+
+    def __init__(
+        self, cache_dir: str | Path, max_bytes: int = DEFAULT_RESULT_CACHE_BYTES
+    ) -> None:
+        """ResultCacheを初期化する.
+
+        Args:
+            cache_dir: キャッシュディレクトリ（存在しない場合は作成する）
+            max_bytes: キャッシュ全体の上限サイズ（バイト）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_SUFFIX}"
+
+    def get(self, key: str, output_path: str | Path) -> Optional[Path]:
+        """キャッシュ済みの PPTX を output_path にコピーする.
+
+        Args:
+            key: result_key() で計算したキー
+            output_path: コピー先の PPTX ファイルパス（親ディレクトリは自動作成）
+
+        Returns:
+            ヒットした場合は output_path の Path、ミスの場合は None
+        """
+        cached = self._path(key)
+        output_path = Path(output_path)
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(cached, output_path)
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        # 最終利用時刻を更新して LRU の順序に反映する
+        os.utime(cached)
+        self.stats.hits += 1
+        return output_path
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """キャッシュ済みの PPTX をバイト列で返す.
+
+        Args:
+            key: result_key() で計算したキー
+
+        Returns:
+            ヒットした場合は PPTX のバイト列、ミスの場合は None
+        """
+        cached = self._path(key)
+        try:
+            data = cached.read_bytes()
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        os.utime(cached)
+        self.stats.hits += 1
+        return data
+
+    def put(self, key: str, pptx_path: str | Path) -> None:
+        """変換結果をキャッシュに保存し、上限を超えた分を追い出す.
+
+        書き込みは一時ファイル経由で行い、並行する読み出しに途中のファイルを見せない。
+
+        Args:
+            key: result_key() で計算したキー
+            pptx_path: 保存する PPTX ファイルパス
+        """
+        self._store(key, lambda tmp_name: shutil.copyfile(pptx_path, tmp_name))
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        """PPTX のバイト列をキャッシュに保存し、上限を超えた分を追い出す.
+
+        Args:
+            key: result_key() で計算したキー
+            data: 保存する PPTX のバイト列
+        """
+        self._store(key, lambda tmp_name: Path(tmp_name).write_bytes(data))
+
+    def _store(self, key: str, write: Callable[[str], object]) -> None:
+        """一時ファイルに write() で書き込んでからキーのファイルに置き換える."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_name)
+            os.replace(tmp_name, self._path(key))
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        """合計サイズが上限以下になるまで、最終利用時刻の古いファイルから削除する."""
+        with self._lock:
+            self.stats.evictions += evict_lru_files(self.cache_dir, f"*{_SUFFIX}", self.max_bytes)
@@ -0,0 +1,506 @@
+"""変換サーバー - 常駐ワーカープロセスで PDF → PPTX 変換を提供する.
+
+リクエストごとに `python -m src.main` を起動すると、インタプリタの起動と
+fitz / python-pptx / pydantic / rich 等の import を毎回支払うことになる。
+本サーバーは起動時に import 済み（ウォームアップ済み）のワーカープロセスを
+プールしておき、HTTP で受け取った PDF をそのまま変換して PPTX を返す。
+
+エンドポイント:
+    GET  /health             稼働状況（ワーカー数など）を JSON で返す
+    POST /convert            リクエストボディの PDF を変換し、PPTX を返す（?use_llm=1 で LLM 解析）
+    POST /jobs               変換ジョブを投入し、ジョブIDを返す（202）
+    GET  /jobs/{id}          ジョブの状態と工程ごとの進捗を JSON で返す
+    GET  /jobs/{id}/events   状態と進捗を Server-Sent Events で完了まで配信する
+    GET  /jobs/{id}/result   完了したジョブの PPTX を返す
+
+使い方:
+    python -m src.server --port 8765 --workers 4
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+from urllib.parse import parse_qs, urlparse
+
+import click
+
+from config.settings import get_settings
+from src.jobs import Job, JobManager, JobStatus
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# /jobs/{id} 系のパス
+_JOB_PATH = re.compile(r"^/jobs/(?P<job_id>[0-9a-f]{32})(?P<action>/result|/events)?$")
+
+# /jobs/{id}/events で進捗を確認する間隔（秒）
+_EVENTS_INTERVAL_SEC = 0.5
+
+
+def _warm_up_worker(log_level: Optional[str] = None) -> None:
+    """ワーカープロセスの初期化: 重いモジュールを事前に import する.
+
+    変換リクエストの処理時間に import コストが乗らないよう、
+    プール起動時に各ワーカーで1回だけ実行される。
+
+    Args:
+        log_level: ワーカーのログレベル（None の場合は設定値 LOG_LEVEL）
+    """
+    import fitz  # noqa: F401
+    import pptx  # noqa: F401
+
+    from src import main
+
+    # 変換の進捗表示はサーバーのコンソールに不要なため抑止する
+    main.console.quiet = True
+    level = log_level or get_settings().log_level
+    logging.basicConfig(level=level.upper(), format="%(message)s")
+
+
+def _ping() -> bool:
+    """ワーカーの起動確認用の空タスク."""
+    return True
+
+
+def _convert_job(pdf_bytes: bytes, template_path: Optional[str], use_llm: bool) -> bytes:
+    """ワーカープロセスで1件の変換を実行する.
+
+    Args:
+        pdf_bytes: 入力PDFのバイト列
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+
+    Returns:
+        生成された PPTX のバイト列
+    """
+    from src.main import convert_bytes
+
+    return convert_bytes(pdf_bytes, template_path=template_path, use_llm=use_llm)
+
+
+def _convert_job_to_file(
+    job_id: str,
+    pdf_bytes: bytes,
+    output_path: str,
+    template_path: Optional[str],
+    use_llm: bool,
+    progress_store: Any,
+) -> Path:
+    """ワーカープロセスで1件のジョブを変換し、進捗を共有辞書に書き込む.
+
+    Args:
+        job_id: ジョブID（progress_store のキー）
+        pdf_bytes: 入力PDFのバイト列
+        output_path: PPTX の出力先
+        template_path: テンプレートファイルパス
+        use_llm: LLM によるレイアウト解析を使用するか
+        progress_store: multiprocessing.Manager の共有辞書
+
+    Returns:
+        保存されたPPTXファイルの Path
+    """
+    from src.main import convert_bytes
+
+    # 共有辞書の値は入れ子の更新が伝わらないため、工程ごとの進捗を丸ごと書き戻す
+    stages: dict[str, dict[str, int]] = {}
+    progress_store[job_id] = stages
+
+    def on_progress(stage: str, completed: int, total: int) -> None:
+        stages[stage] = {"completed": completed, "total": total}
+        progress_store[job_id] = stages
+
+    pptx_bytes = convert_bytes(
+        pdf_bytes, template_path=template_path, use_llm=use_llm, on_progress=on_progress
+    )
+    path = Path(output_path)
+    path.write_bytes(pptx_bytes)
+    return path
+
+
+class ConversionService:
+    """ウォームアップ済みワーカープロセスのプールで変換を実行するサービス.
+
+    ワーカープロセスが異常終了するとプールは以降の投入をすべて拒否するため、
+    投入時に壊れたプールを検出したら新しいプールに置き換えてから投入し直す。
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        template_path: Optional[str | Path] = None,
+        log_level: Optional[str] = None,
+    ) -> None:
+        """ConversionServiceを初期化し、全ワーカーを起動する.
+
+        Args:
+            workers: ワーカープロセス数（同時に実行できる変換数）
+            template_path: 全変換に適用するテンプレートファイルパス
+            log_level: ワーカーのログレベル（None の場合は設定値 LOG_LEVEL）
+        """
+        self.workers = workers
+        self.template_path = str(template_path) if template_path else None
+        self.log_level = log_level
+        self._lock = threading.Lock()
+        self._executor = self._start_executor()
+        logger.info("ワーカー %d 個を起動しました", workers)
+
+    def _start_executor(self) -> ProcessPoolExecutor:
+        """ワーカープールを生成し、全ワーカーを起動・ウォームアップする."""
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up_worker,
+            initargs=(self.log_level,),
+        )
+        # 空タスクを同時投入して全ワーカーを起動・ウォームアップしておく
+        for future in [executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+        return executor
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        """ワーカープールに投入する（壊れたプールは作り直してから投入する）."""
+        with self._lock:
+            executor = self._executor
+            try:
+                return executor.submit(fn, *args)
+            except BrokenProcessPool:
+                logger.warning("ワーカープロセスが異常終了したため、ワーカープールを作り直します")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start_executor()
+            return self._executor.submit(fn, *args)
+
+    def submit(self, pdf_bytes: bytes, use_llm: bool = False) -> Future[bytes]:
+        """変換を投入する.
+
+        Args:
+            pdf_bytes: 入力PDFのバイト列
+            use_llm: LLM によるレイアウト解析を使用するか
+
+        Returns:
+            PPTX のバイト列を返す Future
+        """
+        return self._submit(_convert_job, pdf_bytes, self.template_path, use_llm)
+
+    def submit_job(
+        self,
+        job_id: str,
+        pdf_bytes: bytes,
+        output_path: Path,
+        progress_store: Any,
+        use_llm: bool = False,
+    ) -> Future[Path]:
+        """進捗を共有辞書に書き込むジョブとして変換を投入する.
+
+        Args:
+            job_id: ジョブID
+            pdf_bytes: 入力PDFのバイト列
+            output_path: PPTX の出力先
+            progress_store: 進捗を書き込む multiprocessing.Manager の共有辞書
+            use_llm: LLM によるレイアウト解析を使用するか
+
+        Returns:
+            保存されたPPTXファイルの Path を返す Future
+        """
+        return self._submit(
+            _convert_job_to_file,
+            job_id,
+            pdf_bytes,
+            str(output_path),
+            self.template_path,
+            use_llm,
+            progress_store,
+        )
+
+    def shutdown(self) -> None:
+        """ワーカープロセスを停止する."""
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ConversionHTTPServer(ThreadingHTTPServer):
+    """ConversionService と JobManager を保持する HTTP サーバー."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: ConversionService,
+        max_upload_bytes: int,
+        job_ttl_sec: int = 3600,
+    ) -> None:
+        """ConversionHTTPServerを初期化する.
+
+        Args:
+            address: 待ち受けアドレス (host, port)
+            service: 変換サービス
+            max_upload_bytes: 受け付けるPDFの最大サイズ（バイト）
+            job_ttl_sec: 完了したジョブの結果を保持する秒数
+        """
+        super().__init__(address, _RequestHandler)
+        self.service = service
+        self.jobs = JobManager(service, ttl_sec=job_ttl_sec)
+        self.max_upload_bytes = max_upload_bytes
+
+    def server_close(self) -> None:
+        """ソケットを閉じ、ワーカープロセスとジョブの結果を破棄する."""
+        super().server_close()
+        self.service.shutdown()
+        self.jobs.shutdown()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """変換サーバーのリクエストハンドラ."""
+
+    server: ConversionHTTPServer
+
+    def do_GET(self) -> None:  # noqa: N802
+        """GET リクエストを処理する."""
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok", "workers": self.server.service.workers})
+            return
+
+        match = _JOB_PATH.match(path)
+        if match is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not Found"})
+            return
+        job = self.server.jobs.get(match["job_id"])
+        if job is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not Found"})
+        elif match["action"] == "/result":
+            self._send_job_result(job)
+        elif match["action"] == "/events":
+            self._send_job_events(job)
+        else:
+            self._send_json(HTTPStatus.OK, self._job_payload(job))
+
+    def do_POST(self) -> None:  # noqa: N802
+        """POST リクエストを処理する."""
+        url = urlparse(self.path)
+        if url.path not in ("/convert", "/jobs"):
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not Found"})
+            return
+
+        pdf_bytes = self._read_pdf_body()
+        if pdf_bytes is None:
+            return
+
+        use_llm = parse_qs(url.query).get("use_llm", ["0"])[0] in ("1", "true")
+        if url.path == "/jobs":
+            job = self.server.jobs.submit(pdf_bytes, use_llm=use_llm)
+            self._send_json(HTTPStatus.ACCEPTED, self._job_payload(job))
+            return
+
+        try:
+            pptx_bytes = self.server.service.submit(pdf_bytes, use_llm=use_llm).result()
+        except (FileNotFoundError, ValueError) as e:
+            self._send_json(
+                HTTPStatus.UNPROCESSABLE_ENTITY, {"error": "変換に失敗しました。", "detail": str(e)}
+            )
+            return
+        except Exception as e:
+            logger.exception("変換処理中にエラーが発生")
+            self._send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": "変換に失敗しました。", "detail": str(e)},
+            )
+            return
+
+        self._send_bytes(HTTPStatus.OK, pptx_bytes, PPTX_CONTENT_TYPE)
+
+    def _job_payload(self, job: Job) -> dict[str, Any]:
+        """ジョブの状態に参照用 URL を加えた辞書を返す."""
+        payload = self.server.jobs.snapshot(job)
+        payload["status_url"] = f"/jobs/{job.id}"
+        payload["events_url"] = f"/jobs/{job.id}/events"
+        payload["result_url"] = f"/jobs/{job.id}/result"
+        return payload
+
+    def _send_job_result(self, job: Job) -> None:
+        """完了したジョブの PPTX を返す（未完了は 409、失敗は 422）."""
+        status = self.server.jobs.status(job)
+        if status is JobStatus.SUCCEEDED:
+            self._send_bytes(HTTPStatus.OK, job.result_path.read_bytes(), PPTX_CONTENT_TYPE)
+        elif status is JobStatus.FAILED:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, self._job_payload(job))
+        else:
+            self._send_json(HTTPStatus.CONFLICT, self._job_payload(job))
+
+    def _send_job_events(self, job: Job) -> None:
+        """ジョブの状態が変わるたびに Server-Sent Events で送り、完了したら閉じる."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        last: Optional[dict[str, Any]] = None
+        while True:
+            done = job.done
+            payload = self._job_payload(job)
+            if payload != last:
+                data = json.dumps(payload, ensure_ascii=False)
+                try:
+                    self.wfile.write(f"data: {data}\n\n".encode())
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                last = payload
+            if done:
+                return
+            time.sleep(_EVENTS_INTERVAL_SEC)
+
+    def _read_pdf_body(self) -> Optional[bytes]:
+        """リクエストボディの PDF を読み込む（不正な場合はエラー応答を返して None）."""
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "PDFファイルを送信してください。"})
+            return None
+        if length > self.server.max_upload_bytes:
+            self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "PDFファイルが大きすぎます。"}
+            )
+            return None
+        body = self.rfile.read(length)
+        if not body.startswith(b"%PDF"):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "PDFファイルを選択してください。"})
+            return None
+        return body
+
+    def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        """JSON レスポンスを返す."""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self._send_bytes(status, body, "application/json; charset=utf-8")
+
+    def _send_bytes(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        """バイト列のレスポンスを返す."""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """アクセスログを logging に出力する."""
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def create_server(
+    host: str,
+    port: int,
+    workers: int,
+    template_path: Optional[str | Path] = None,
+    max_upload_mb: int = 100,
+    job_ttl_sec: int = 3600,
+    log_level: Optional[str] = None,
+) -> ConversionHTTPServer:
+    """ワーカープールを起動し、HTTP サーバーを生成する.
+
+    Args:
+        host: 待ち受けホスト
+        port: 待ち受けポート（0 の場合は空きポート）
+        workers: ワーカープロセス数
+        template_path: 全変換に適用するテンプレートファイルパス
+        max_upload_mb: 受け付けるPDFの最大サイズ (MB)
+        job_ttl_sec: 完了したジョブの結果を保持する秒数
+        log_level: ワーカーのログレベル（None の場合は設定値 LOG_LEVEL）
+
+    Returns:
+        serve_forever() 前の ConversionHTTPServer
+    """
+    service = ConversionService(
+        workers=workers, template_path=template_path, log_level=log_level
+    )
+    return ConversionHTTPServer(
+        (host, port), service, max_upload_mb * 1024 * 1024, job_ttl_sec=job_ttl_sec
+    )
+
+
+def run_in_thread(server: ConversionHTTPServer) -> threading.Thread:
+    """サーバーをバックグラウンドスレッドで起動する（テスト・組み込み用）.
+
+    Args:
+        server: create_server() で生成したサーバー
+
+    Returns:
+        serve_forever() を実行中のスレッド
+    """
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@click.command()
+@click.option("--host", default=None, help="待ち受けホスト（デフォルト: 設定値 SERVER_HOST）")
+@click.option(
+    "--port", type=int, default=None, help="待ち受けポート（デフォルト: 設定値 SERVER_PORT）"
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="ウォームアップ済みワーカープロセス数（デフォルト: 設定値 SERVER_WORKERS）",
+)
+@click.option(
+    "-t",
+    "--template",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="全変換に適用するPowerPointテンプレート (.potx / .pptx)",
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default="INFO",
+    help="ログレベル",
+)
+def cli(
+    host: Optional[str],
+    port: Optional[int],
+    workers: Optional[int],
+    template: Optional[Path],
+    log_level: str,
+) -> None:
+    """PDF → PPTX 変換サーバーを起動します."""
+    from src.main import setup_logging
+
+    setup_logging(log_level)
+    settings = get_settings()
+    server = create_server(
+        host=host or settings.server_host,
+        port=port if port is not None else settings.server_port,
+        workers=workers or settings.server_workers,
+        template_path=template,
+        max_upload_mb=settings.server_max_upload_mb,
+        job_ttl_sec=settings.server_job_ttl_sec,
+        log_level=log_level,
+    )
+    bound_host, bound_port = server.server_address[:2]
+    logger.info("変換サーバーを起動: http://%s:%d", bound_host, bound_port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("変換サーバーを停止します")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,33 @@
+"""キャッシュ統計ユーティリティ.
+
+各種キャッシュのヒット・ミス・追い出し回数を集計する。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """キャッシュのヒット・ミス・追い出し回数."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率（0.0〜1.0）。参照が無い場合は 0.0."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def merge(self, other: CacheStats) -> None:
+        """別プロセス等で集計した統計を加算する.
+
+        Args:
+            other: 加算する統計
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
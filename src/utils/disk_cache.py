@@ -0,0 +1,41 @@
+"""ディスクキャッシュの共通処理."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def evict_lru_files(directory: Path, pattern: str, max_bytes: int) -> int:
+    """合計サイズが上限以下になるまで、mtime の古いファイルから削除する.
+
+    キャッシュのヒット時に os.utime() で mtime を更新しておくことで LRU として振る舞う。
+
+    Args:
+        directory: キャッシュディレクトリ
+        pattern: 対象ファイルの glob パターン
+        max_bytes: 合計サイズの上限（バイト）
+
+    Returns:
+        削除したファイル数
+    """
+    entries = []
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+        logger.debug("キャッシュから削除: %s", path.name)
+    return evicted
@@ -0,0 +1,66 @@
+"""変換するページの指定（「1-10,25」形式）の解析."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+# 1始まり・両端を含むページ範囲の列（終了が None の範囲は最終ページまで）
+PageRanges = tuple[tuple[int, Optional[int]], ...]
+
+
+def parse_page_ranges(spec: str) -> PageRanges:
+    """「1-10,25,30-」形式のページ指定を解析する.
+
+    Args:
+        spec: カンマ区切りのページ番号または範囲（1始まり）。「N-」は N ページ以降すべて
+
+    Returns:
+        (開始, 終了) のタプル（1始まり、両端を含む）
+
+    Raises:
+        ValueError: 書式が不正な場合、またはページ番号が 1 未満・範囲が逆順の場合
+    """
+    ranges: list[tuple[int, Optional[int]]] = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        first, sep, last = item.partition("-")
+        try:
+            start = int(first)
+            stop = (int(last) if last.strip() else None) if sep else start
+        except ValueError:
+            raise ValueError(f"ページ指定が不正です: {item}") from None
+        if start < 1 or (stop is not None and stop < start):
+            raise ValueError(f"ページ指定が不正です: {item}")
+        ranges.append((start, stop))
+    if not ranges:
+        raise ValueError(f"ページ指定が空です: {spec!r}")
+    return tuple(ranges)
+
+
+def select_pages(ranges: Optional[PageRanges], page_count: int) -> list[int]:
+    """ページ範囲に含まれるページ番号を返す.
+
+    Args:
+        ranges: parse_page_ranges() の戻り値。None の場合は全ページ
+        page_count: PDF の総ページ数
+
+    Returns:
+        0始まりのページ番号の昇順リスト（重複なし。総ページ数を超える番号は含まない）
+    """
+    if ranges is None:
+        return list(range(page_count))
+    selected: set[int] = set()
+    for start, stop in ranges:
+        last = page_count if stop is None else min(stop, page_count)
+        selected.update(range(start - 1, last))
+    return sorted(selected)
+
+
+def format_page_ranges(ranges: PageRanges) -> str:
+    """ページ範囲を「1-10,25,30-」形式の文字列に戻す（キャッシュキー用）."""
+    return ",".join(
+        str(start) if stop == start else f"{start}-{'' if stop is None else stop}"
+        for start, stop in ranges
+    )
@@ -0,0 +1,30 @@
+"""変換パイプラインの進捗通知."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Optional
+
+# 進捗を通知する工程名
+STAGE_EXTRACT = "extract"
+STAGE_ANALYZE = "analyze"
+STAGE_BUILD = "build"
+STAGES = (STAGE_EXTRACT, STAGE_ANALYZE, STAGE_BUILD)
+
+# 工程ごとの進捗コールバック: (工程名, 完了ページ数, 総ページ数)
+ProgressCallback = Callable[[str, int, int], None]
+
+# 工程内の進捗コールバック: (完了ページ数, 総ページ数)
+PageProgressCallback = Callable[[int, int], None]
+
+
+def notify(callback: Optional[PageProgressCallback], completed: int, total: int) -> None:
+    """コールバックが指定されていれば進捗を通知する.
+
+    Args:
+        callback: 進捗コールバック（None の場合は何もしない）
+        completed: 完了ページ数
+        total: 総ページ数
+    """
+    if callback is not None:
+        callback(completed, total)
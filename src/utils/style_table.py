@@ -0,0 +1,125 @@
+"""ドキュメント単位の書式テーブル（フライウェイト）.
+
+デッキ内の書式は通常数十種類しかないため、PyMuPDF のスパン書式
+(フォント名, サイズ, フラグ, 色) を1度だけ FontInfo に解決し、
+同じ書式のスパンには同一の（不変な）FontInfo を共有させる。
+Builder も同じテーブルを使い、色のパースやフォント設定を書式ごとに1回だけ行う。
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import NamedTuple, Optional
+
+from pptx.dml.color import RGBColor
+from pptx.util import Pt
+
+from src.models import FontInfo
+
+logger = logging.getLogger(__name__)
+
+
+class RunStyle(NamedTuple):
+    """python-pptx のランに適用するフォント設定（FontInfo から事前計算したもの）."""
+
+    name: str
+    size: Pt
+    bold: bool
+    italic: bool
+    color: Optional[RGBColor]
+
+
+class StyleTable:
+    """書式を共有オブジェクトに解決するテーブル."""
+
+    def __init__(self) -> None:
+        """StyleTableを初期化する."""
+        self._by_raw: dict[tuple[str, float, int, int], FontInfo] = {}
+        self._by_value: dict[FontInfo, FontInfo] = {}
+        self._run_styles: dict[FontInfo, RunStyle] = {}
+
+    def __len__(self) -> int:
+        """登録済みの書式数."""
+        return len(self._by_value)
+
+    def resolve(self, font_name: str, size: float, flags: int, color: int) -> FontInfo:
+        """PyMuPDF のスパン書式を共有 FontInfo に解決する.
+
+        太字・斜体はフォント名から判定する（flags はキーとしてのみ使用）。
+
+        Args:
+            font_name: フォント名
+            size: フォントサイズ (pt)
+            flags: PyMuPDF のフォントフラグ
+            color: sRGB の整数値
+
+        Returns:
+            同じ書式で共有される FontInfo
+        """
+        key = (font_name, size, flags, color)
+        font = self._by_raw.get(key)
+        if font is None:
+            lower_name = font_name.lower()
+            font = self.intern(
+                FontInfo(
+                    name=font_name,
+                    size=round(size, 1),
+                    bold="bold" in lower_name,
+                    italic="italic" in lower_name,
+                    color=f"#{color:06x}",
+                )
+            )
+            self._by_raw[key] = font
+        return font
+
+    def intern(self, font: FontInfo) -> FontInfo:
+        """値が等しい FontInfo を共有オブジェクトに置き換える.
+
+        Args:
+            font: 対象の FontInfo
+
+        Returns:
+            テーブルに登録済みの等価な FontInfo（未登録なら font 自身を登録して返す）
+        """
+        return self._by_value.setdefault(font, font)
+
+    def run_style(self, font: FontInfo) -> RunStyle:
+        """FontInfo に対応するランのフォント設定を返す（書式ごとに1回だけ計算する）.
+
+        Args:
+            font: フォント情報
+
+        Returns:
+            python-pptx に適用する RunStyle
+        """
+        style = self._run_styles.get(font)
+        if style is None:
+            style = RunStyle(
+                name=font.name,
+                size=Pt(font.size),
+                bold=font.bold,
+                italic=font.italic,
+                color=_parse_color(font.color),
+            )
+            self._run_styles[font] = style
+        return style
+
+
+def _parse_color(color: str) -> Optional[RGBColor]:
+    """16進数カラーコードを RGBColor に変換する.
+
+    Args:
+        color: "#RRGGBB" 形式のカラーコード
+
+    Returns:
+        RGBColor。変換できない場合は None
+    """
+    try:
+        color_hex = color.lstrip("#")
+        r = int(color_hex[0:2], 16)
+        g = int(color_hex[2:4], 16)
+        b = int(color_hex[4:6], 16)
+        return RGBColor(r, g, b)
+    except (ValueError, IndexError) as e:
+        logger.warning("色の変換に失敗: %s (%s)", color, e)
+        return None
@@ -34,3 +34,33 @@ def first_sample_pdf_required(first_sample_pdf: Path | None) -> Path:
     if first_sample_pdf is None:
         pytest.skip("サンプル PDF がありません（pdf/ または input/ に .pdf を配置してください）")
     return first_sample_pdf
+
+
+def _make_generated_pdf(path: Path, pages: int = 6) -> Path:
+    """テスト用の小さなスライド PDF を PyMuPDF で生成する.
+
+    各ページにタイトル・本文・箇条書き・フッターと、全ページ共通のロゴ画像を配置する。
+    """
+    import fitz
+
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), False)
+    logo.set_rect(logo.irect, (200, 40, 40))
+    logo_png = logo.tobytes("png")
+
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=720, height=405)
+        page.insert_text((50, 60), f"Slide Title {i + 1}", fontsize=28, fontname="hebo")
+        page.insert_text((50, 140), "Body text line", fontsize=14, fontname="helv")
+        page.insert_text((70, 180), "• Bullet item", fontsize=14, fontname="helv")
+        page.insert_text((300, 395), f"Page {i + 1}", fontsize=8, fontname="helv")
+        page.insert_image(fitz.Rect(640, 10, 700, 70), stream=logo_png)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def generated_pdf(tmp_path: Path) -> Path:
+    """PyMuPDF で生成した 6 ページのテスト用 PDF."""
+    return _make_generated_pdf(tmp_path / "generated.pdf")
@@ -0,0 +1,131 @@
+"""バッチ変換のテスト."""
+
+import json
+import multiprocessing
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src import main
+from src.batch import (
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_SUCCEEDED,
+    collect_inputs,
+    run_batch,
+)
+
+
+@pytest.fixture
+def input_dir(generated_pdf: Path, tmp_path: Path) -> Path:
+    """生成 PDF 2 件（うち1件はサブディレクトリ）と破損 PDF 1 件を置いたディレクトリ."""
+    root = tmp_path / "in"
+    (root / "sub").mkdir(parents=True)
+    shutil.copy(generated_pdf, root / "a.pdf")
+    shutil.copy(generated_pdf, root / "sub" / "b.pdf")
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+    (root / "notes.txt").write_text("ignored")
+    return root
+
+
+class TestCollectInputs:
+    """変換対象の列挙のテスト."""
+
+    def test_directory_keeps_relative_layout(self, input_dir: Path, tmp_path: Path) -> None:
+        items = collect_inputs([str(input_dir)], tmp_path / "out")
+        assert [item.output_path.relative_to(tmp_path / "out") for item in items] == [
+            Path("a.pptx"),
+            Path("broken.pptx"),
+            Path("sub/b.pptx"),
+        ]
+
+    def test_glob_and_duplicates(self, input_dir: Path) -> None:
+        items = collect_inputs([str(input_dir / "**" / "*.pdf"), str(input_dir / "a.pdf")])
+        assert sorted(item.input_path.name for item in items) == ["a.pdf", "b.pdf", "broken.pdf"]
+        assert all(item.output_path == item.input_path.with_suffix(".pptx") for item in items)
+
+    def test_glob_keeps_path_below_fixed_prefix(self, input_dir: Path, tmp_path: Path) -> None:
+        """同名のファイルも、glob の固定部分からの相対パスで別々に出力する."""
+        shutil.copy(input_dir / "a.pdf", input_dir / "sub" / "a.pdf")
+        items = collect_inputs([str(input_dir / "**" / "a.pdf")], tmp_path / "out")
+        assert sorted(item.output_path.relative_to(tmp_path / "out") for item in items) == [
+            Path("a.pptx"),
+            Path("sub/a.pptx"),
+        ]
+
+    def test_colliding_outputs_raise(self, input_dir: Path, tmp_path: Path) -> None:
+        shutil.copy(input_dir / "a.pdf", input_dir / "sub" / "a.pdf")
+        with pytest.raises(ValueError, match="出力先が重複"):
+            collect_inputs(
+                [str(input_dir / "a.pdf"), str(input_dir / "sub" / "a.pdf")], tmp_path / "out"
+            )
+
+
+class TestRunBatch:
+    """バッチ変換の実行テスト."""
+
+    def test_failures_do_not_stop_batch(self, input_dir: Path, tmp_path: Path) -> None:
+        items = collect_inputs([str(input_dir)], tmp_path / "out")
+        summary = run_batch(items, workers=2)
+        by_name = {Path(r.input).name: r for r in summary.files}
+        assert by_name["a.pdf"].status == STATUS_SUCCEEDED
+        assert by_name["b.pdf"].status == STATUS_SUCCEEDED
+        assert by_name["a.pdf"].pages == 6
+        assert by_name["a.pdf"].pages_per_sec > 0
+        assert by_name["broken.pdf"].status == STATUS_FAILED
+        assert by_name["broken.pdf"].error
+        assert (tmp_path / "out" / "sub" / "b.pptx").exists()
+
+    def test_up_to_date_outputs_are_skipped(self, input_dir: Path, tmp_path: Path) -> None:
+        items = [
+            item
+            for item in collect_inputs([str(input_dir)], tmp_path / "out")
+            if item.input_path.name != "broken.pdf"
+        ]
+        run_batch(items)
+        assert {r.status for r in run_batch(items).files} == {STATUS_SKIPPED}
+
+        # 入力が出力より新しくなったファイルだけ変換し直す
+        stat = items[0].output_path.stat()
+        os.utime(items[0].input_path, (stat.st_atime, stat.st_mtime + 10))
+        assert [r.status for r in run_batch(items).files] == [STATUS_SUCCEEDED, STATUS_SKIPPED]
+        assert {r.status for r in run_batch(items, force=True).files} == {STATUS_SUCCEEDED}
+
+    @pytest.mark.skipif(
+        multiprocessing.get_start_method() != "fork",
+        reason="ワーカーに差し替えた変換関数を引き継ぐため fork が必要",
+    )
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_worker_crash_fails_only_its_file(
+        self, input_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, workers: int
+    ) -> None:
+        """ワーカーが異常終了しても、原因のファイルだけを失敗とし残りは変換する."""
+        shutil.copy(input_dir / "a.pdf", input_dir / "0-crash.pdf")
+        convert = main.convert_pdf_to_pptx
+
+        def crash_on_name(pdf_path: Path, *args: Any, **kwargs: Any) -> Any:
+            if Path(pdf_path).name == "0-crash.pdf":
+                os._exit(1)
+            return convert(pdf_path, *args, **kwargs)
+
+        monkeypatch.setattr(main, "convert_pdf_to_pptx", crash_on_name)
+        items = collect_inputs([str(input_dir)], tmp_path / "out")
+        summary = run_batch(items, workers=workers)
+        by_name = {Path(r.input).name: r for r in summary.files}
+        assert by_name["0-crash.pdf"].status == STATUS_FAILED
+        assert "BrokenProcessPool" in (by_name["0-crash.pdf"].error or "")
+        assert by_name["broken.pdf"].status == STATUS_FAILED
+        assert "BrokenProcessPool" not in (by_name["broken.pdf"].error or "")
+        assert by_name["a.pdf"].status == STATUS_SUCCEEDED
+        assert by_name["b.pdf"].status == STATUS_SUCCEEDED
+
+    def test_summary_json(self, input_dir: Path, tmp_path: Path) -> None:
+        items = collect_inputs([str(input_dir)], tmp_path / "out")
+        path = run_batch(items, workers=2).write(tmp_path / "summary.json")
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert (data["total"], data["succeeded"], data["failed"], data["skipped"]) == (3, 2, 1, 0)
+        keys = {"input", "output", "status", "duration_sec", "pages", "pages_per_sec", "error"}
+        assert keys <= set(data["files"][0])
@@ -1,16 +1,24 @@
 """Builder（PPTX構築）のユニットテスト."""
 
+import io
+import re
 import tempfile
 from pathlib import Path
 from zipfile import ZipFile
 
 import pytest
+from lxml import etree
+from PIL import Image
+from pptx import Presentation
 
+from src.analyzer.recurring import find_recurring_elements
+from src.builder import BUILDER_BACKENDS, PresentationTemplate, XMLSlideBuilder, load_template
 from src.builder.pptx_builder import PPTXBuilder
 from src.models import (
     BoundingBox,
     ElementType,
     FontInfo,
+    ImageBlock,
     PresentationData,
     SlideData,
     TextBlock,
@@ -129,3 +137,264 @@ class TestPPTXBuilder:
                 assert "Test Title" in content or "Body text" in content
         finally:
             tmp_path.unlink(missing_ok=True)
+
+    def test_add_slide_without_begin_raises(self) -> None:
+        """begin() 前に add_slide() を呼ぶと RuntimeError."""
+        data = _minimal_presentation_data()
+        builder = PPTXBuilder()
+        with pytest.raises(RuntimeError, match="初期化されていません"):
+            builder.add_slide(data.slides[0])
+
+    def test_begin_and_add_slide_streaming(self) -> None:
+        """begin() + add_slide() でスライドを1枚ずつ追加できる."""
+        data = _minimal_presentation_data()
+        builder = PPTXBuilder()
+        prs = builder.begin(data.slide_width, data.slide_height)
+        for _ in range(3):
+            builder.add_slide(data.slides[0])
+        assert len(prs.slides) == 3
+        assert prs.slide_width == 720 * 12700
+
+
+def _varied_presentation_data(pages: int = 4) -> PresentationData:
+    """改行・制御文字・エスケープが必要な文字・不正な色・画像・共通フッターを含むデータ."""
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), (30, 90, 200)).save(buf, "PNG")
+    logo = buf.getvalue()
+    slides = []
+    for page in range(1, pages + 1):
+        title = TextBlock(
+            spans=[
+                TextSpan(text=""),
+                TextSpan(
+                    text=f"Title\x07 <{page}> & \"q\"\n",
+                    font=FontInfo(name='M&S "Gothic"', size=24.3, bold=True, color="#1a2b3c"),
+                ),
+                TextSpan(text="a\nb\n \nc", font=FontInfo(italic=True, color="bad")),
+                TextSpan(text=" tail "),
+            ],
+            bbox=BoundingBox(x0=40.5, y0=20.25, x1=680.1, y1=80.7),
+            alignment="center",
+        )
+        body = TextBlock(
+            spans=[TextSpan(text="右揃え\t本文", font=FontInfo(name="", size=11.0))],
+            bbox=BoundingBox(x0=40, y0=100, x1=680, y1=300),
+            alignment="right",
+        )
+        empty = TextBlock(spans=[], bbox=BoundingBox(x0=1, y0=2, x1=3, y1=4), alignment="x")
+        footer = TextBlock(
+            spans=[TextSpan(text=f"Page {page}", font=FontInfo(size=7.0))],
+            bbox=BoundingBox(x0=600, y0=390, x1=700, y1=400),
+            element_type=ElementType.FOOTER,
+        )
+        slides.append(
+            SlideData(
+                page_number=page,
+                width=720.0,
+                height=405.0,
+                text_blocks=[title, body, empty, footer],
+                image_blocks=[
+                    ImageBlock(bbox=BoundingBox(x0=660, y0=8, x1=708, y1=56), image_data=logo)
+                ],
+            )
+        )
+    return PresentationData(
+        source_path="varied.pdf",
+        total_pages=pages,
+        slide_width=720.0,
+        slide_height=405.0,
+        slides=slides,
+    )
+
+
+def _package_parts(path: Path) -> dict[str, bytes]:
+    """PPTX 内の各パーツ（スライド番号フィールドのランダムな ID は除く）."""
+    with ZipFile(path) as zf:
+        return {
+            name: re.sub(rb'<a:fld id="\{[0-9A-F-]+\}"', b"<a:fld", zf.read(name))
+            for name in zf.namelist()
+        }
+
+
+class TestXMLSlideBuilder:
+    """XMLSlideBuilder のテスト."""
+
+    def test_registered_backends(self) -> None:
+        assert BUILDER_BACKENDS["python-pptx"] is PPTXBuilder
+        assert BUILDER_BACKENDS["xml"] is XMLSlideBuilder
+
+    @pytest.mark.parametrize("promote_recurring", [False, True])
+    def test_output_matches_python_pptx(self, tmp_path: Path, promote_recurring: bool) -> None:
+        """python-pptx 版とパッケージ内の全パーツが一致する."""
+        data = _varied_presentation_data()
+        recurring = find_recurring_elements(data) if promote_recurring else None
+        assert bool(recurring) == promote_recurring
+
+        outputs = []
+        for builder_class in (PPTXBuilder, XMLSlideBuilder):
+            builder = builder_class()
+            builder.build(data, recurring=recurring)
+            path = builder.save(tmp_path / f"{builder_class.__name__}.pptx")
+            outputs.append(_package_parts(path))
+        assert outputs[0] == outputs[1]
+
+    def test_streaming_matches_python_pptx(self) -> None:
+        """begin() + add_slide() でも同じシェイプツリーになる."""
+        data = _varied_presentation_data(pages=2)
+        trees = []
+        for builder_class in (PPTXBuilder, XMLSlideBuilder):
+            builder = builder_class()
+            prs = builder.begin(data.slide_width, data.slide_height)
+            for slide in data.slides:
+                builder.add_slide(slide)
+            trees.append([etree.tostring(slide.shapes._spTree) for slide in prs.slides])
+        assert trees[0] == trees[1]
+
+
+class TestStreamingPackage:
+    """begin(stream_to=...) による逐次書き出しのテスト."""
+
+    def _stream(self, builder: PPTXBuilder, data: PresentationData, path: Path) -> None:
+        builder.begin(data.slide_width, data.slide_height, stream_to=path)
+        for slide in data.slides:
+            builder.add_slide(slide)
+
+    @pytest.mark.parametrize("builder_class", [PPTXBuilder, XMLSlideBuilder])
+    def test_package_matches_in_memory_save(
+        self, tmp_path: Path, builder_class: type[PPTXBuilder]
+    ) -> None:
+        """書き出したパーツは一括保存と一致し、共通の画像は1度だけ格納される."""
+        data = _varied_presentation_data()
+        in_memory = builder_class()
+        in_memory.begin(data.slide_width, data.slide_height)
+        for slide in data.slides:
+            in_memory.add_slide(slide)
+        expected = _package_parts(in_memory.save(tmp_path / "memory.pptx"))
+
+        streamed = builder_class()
+        path = tmp_path / "stream.pptx"
+        self._stream(streamed, data, path)
+        assert streamed.save(path) == path
+        parts = _package_parts(path)
+        assert parts == expected
+        assert len([name for name in parts if name.startswith("ppt/media/")]) == 1
+        assert len(Presentation(str(path)).slides) == len(data.slides)
+
+    def test_written_slides_and_images_are_released(self, tmp_path: Path) -> None:
+        data = _varied_presentation_data(pages=2)
+        builder = PPTXBuilder()
+        path = tmp_path / "out.pptx"
+        self._stream(builder, data, path)
+        assert not path.exists()
+
+        prs = builder._prs
+        assert prs is not None
+        for slide in prs.slides:
+            assert len(slide.shapes) == 0
+            for rel in slide.part.rels.values():
+                if rel.reltype.endswith("/image"):
+                    assert rel.target_part.blob == b""
+        builder.save(path)
+        assert path.exists()
+        assert [p.name for p in tmp_path.iterdir()] == ["out.pptx"]
+
+    def test_close_discards_partial_file(self, tmp_path: Path) -> None:
+        data = _varied_presentation_data(pages=2)
+        builder = PPTXBuilder()
+        self._stream(builder, data, tmp_path / "out.pptx")
+        builder.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_concurrent_streams_to_same_path_do_not_share_temp_file(self, tmp_path: Path) -> None:
+        """同じプロセスで同じ出力先に並行して書き出しても、一時ファイルは別になる."""
+        data = _varied_presentation_data(pages=2)
+        path = tmp_path / "out.pptx"
+        first, second = PPTXBuilder(), PPTXBuilder()
+        self._stream(first, data, path)
+        self._stream(second, data, path)
+        assert len(list(tmp_path.iterdir())) == 2
+        first.save(path)
+        second.save(path)
+        assert [p.name for p in tmp_path.iterdir()] == ["out.pptx"]
+        assert len(Presentation(str(path)).slides) == len(data.slides)
+
+    def test_save_to_another_path_raises(self, tmp_path: Path) -> None:
+        data = _varied_presentation_data(pages=1)
+        builder = PPTXBuilder()
+        self._stream(builder, data, tmp_path / "out.pptx")
+        with pytest.raises(ValueError, match="逐次書き出し中"):
+            builder.save(tmp_path / "other.pptx")
+        builder.close()
+
+
+def _template_file(path: Path, content_type: str | None = None) -> Path:
+    """スライド1枚と画像を含むテンプレートを作る（content_type でメインパーツの種類を変える）."""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Corporate"
+    image = io.BytesIO()
+    Image.new("RGB", (16, 16), "navy").save(image, "PNG")
+    image.seek(0)
+    slide.shapes.add_picture(image, 0, 0)
+    prs.save(str(path))
+    if content_type is not None:
+        parts = _package_parts(path)
+        parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(
+            b"presentationml.presentation.main+xml", content_type.encode()
+        )
+        with ZipFile(path, "w") as zf:
+            for name, blob in parts.items():
+                zf.writestr(name, blob)
+    return path
+
+
+class TestPresentationTemplate:
+    """PresentationTemplate / load_template のテスト."""
+
+    def test_open_matches_presentation(self, tmp_path: Path) -> None:
+        """複製したプレゼンテーションは Presentation(path) と同じパッケージとして保存される."""
+        path = _template_file(tmp_path / "template.pptx")
+        Presentation(str(path)).save(str(tmp_path / "expected.pptx"))
+        PresentationTemplate(path).open().save(str(tmp_path / "cloned.pptx"))
+        assert _package_parts(tmp_path / "cloned.pptx") == _package_parts(
+            tmp_path / "expected.pptx"
+        )
+
+    def test_open_returns_independent_copies(self, tmp_path: Path) -> None:
+        template = PresentationTemplate(_template_file(tmp_path / "template.pptx"))
+        first = template.open()
+        first.slides.add_slide(first.slide_layouts[6])
+        first.slide_layouts[0].name = "changed"
+        second = template.open()
+        assert (len(first.slides), len(second.slides)) == (2, 1)
+        assert second.slide_layouts[0].name != "changed"
+
+    def test_potx_saved_as_pptx(self, tmp_path: Path) -> None:
+        path = _template_file(tmp_path / "template.potx", "presentationml.template.main+xml")
+        with pytest.raises(ValueError):
+            Presentation(str(path))
+        PresentationTemplate(path).open().save(str(tmp_path / "out.pptx"))
+        assert len(Presentation(str(tmp_path / "out.pptx")).slides) == 1
+
+    def test_load_template_cached_until_modified(self, tmp_path: Path) -> None:
+        path = _template_file(tmp_path / "template.pptx")
+        template = load_template(path)
+        assert load_template(path) is template
+        assert load_template() is load_template()
+
+        prs = Presentation(str(path))
+        prs.slides.add_slide(prs.slide_layouts[6])
+        prs.save(str(path))
+        reloaded = load_template(path)
+        assert reloaded is not template
+        assert len(reloaded.open().slides) == 2
+
+    def test_builder_uses_template(self, tmp_path: Path) -> None:
+        """テンプレートを渡した PPTXBuilder はテンプレートのスライドに続けて構築する."""
+        template = PresentationTemplate(_template_file(tmp_path / "template.pptx"))
+        data = _minimal_presentation_data()
+        builder = XMLSlideBuilder(template=template)
+        assert builder.template_path == template.path
+        prs = builder.build(data)
+        assert len(prs.slides) == 1 + len(data.slides)
+        assert len(template.open().slides) == 1
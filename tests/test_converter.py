@@ -0,0 +1,72 @@
+"""Converter のテスト."""
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+from pptx.package import Package
+from rich.live import Live
+
+from src.converter import Converter
+from src.main import convert_pdf_to_pptx
+
+
+def _slide_texts(prs: object) -> list[list[str]]:
+    return [
+        sorted(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+        for slide in prs.slides  # type: ignore[attr-defined]
+    ]
+
+
+class TestConverter:
+    """テンプレートを読み込み済みの Converter のテスト."""
+
+    def test_template_parsed_once(
+        self, generated_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """生成後の変換ではテンプレートのパッケージを読み込まない."""
+        converter = Converter()
+        calls: list[object] = []
+        original_open = Package.open
+        monkeypatch.setattr(
+            Package, "open", classmethod(lambda cls, f: calls.append(f) or original_open(f))
+        )
+        pdf_bytes = generated_pdf.read_bytes()
+        for _ in range(2):
+            converter.convert_bytes(pdf_bytes)
+        converter.convert(generated_pdf, tmp_path / "out.pptx")
+        assert calls == []
+
+    def test_concurrent_conversions(self, generated_pdf: Path, tmp_path: Path) -> None:
+        """1つの Converter を複数スレッドから同時に使っても結果は逐次変換と同じ."""
+        expected = _slide_texts(
+            Presentation(
+                str(convert_pdf_to_pptx(generated_pdf, tmp_path / "ref.pptx", save_images=False))
+            )
+        )
+        converter = Converter()
+        pdf_bytes = generated_pdf.read_bytes()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: converter.convert_bytes(pdf_bytes), range(8)))
+        for pptx_bytes in results:
+            assert _slide_texts(Presentation(io.BytesIO(pptx_bytes))) == expected
+
+    def test_library_calls_do_not_start_live_display(
+        self, generated_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """rich の Live はコンソールに1つしか開始できないため、ライブラリ呼び出しでは使わない."""
+
+        def fail(self: Live, refresh: bool = False) -> None:
+            raise AssertionError("Live 表示が開始された")
+
+        monkeypatch.setattr(Live, "start", fail)
+        converter = Converter()
+        converter.convert_bytes(generated_pdf.read_bytes())
+        converter.convert(generated_pdf, tmp_path / "out.pptx")
+        Converter(stream=True).convert_bytes(generated_pdf.read_bytes())
+
+    def test_missing_template_raises(self, tmp_path: Path) -> None:
+        with pytest.raises(OSError):
+            Converter(template_path=tmp_path / "missing.potx")
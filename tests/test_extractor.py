@@ -2,10 +2,12 @@
 
 from pathlib import Path
 
+import fitz
 import pytest
 
-from src.extractor.pdf_extractor import PDFExtractor
-from src.models import PresentationData
+from src.extractor.pdf_extractor import PDFExtractor, _split_page_ranges
+from src.models import PresentationData, TextBlock
+from src.utils.page_ranges import parse_page_ranges
 
 
 class TestPDFExtractor:
@@ -43,3 +45,284 @@ class TestPDFExtractor:
         assert len(data.slides) >= 1
         # テキストまたは画像はある想定（PDF による）
         assert total_blocks >= 0 and total_images >= 0
+
+    def test_parallel_extract_matches_serial(self, generated_pdf: Path) -> None:
+        """workers>1 の並列抽出は逐次抽出とページ順・内容とも一致する."""
+        with PDFExtractor(generated_pdf) as extractor:
+            serial = extractor.extract_all()
+            parallel = extractor.extract_all(workers=3)
+        assert [s.page_number for s in parallel.slides] == list(range(1, 7))
+        assert parallel.model_dump() == serial.model_dump()
+
+    def test_iter_slides_matches_extract_all(self, generated_pdf: Path) -> None:
+        """iter_slides() はページ順に extract_all() と同じ SlideData を返す."""
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all()
+            streamed = list(extractor.iter_slides())
+            assert extractor.slide_size == (data.slide_width, data.slide_height)
+        assert [s.model_dump() for s in streamed] == [s.model_dump() for s in data.slides]
+
+    def test_repeated_image_xref_shares_payload(self, generated_pdf: Path) -> None:
+        """全ページ共通のロゴ画像は1回だけ抽出され、同一の bytes を共有する."""
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all()
+            stats = extractor.image_cache.stats
+        payloads = [s.image_blocks[0].image_data for s in data.slides]
+        assert all(p is payloads[0] for p in payloads)
+        assert stats.misses == 1
+        assert stats.hits == len(data.slides) - 1
+
+    def test_lazy_images_load_same_payload(self, generated_pdf: Path) -> None:
+        """lazy_images では xref 参照のみを保持し、読み込み結果は通常抽出と一致する."""
+        with PDFExtractor(generated_pdf) as extractor:
+            eager = extractor.extract_all()
+        with PDFExtractor(generated_pdf, lazy_images=True) as extractor:
+            lazy = extractor.extract_all(workers=2)
+            block = lazy.slides[0].image_blocks[0]
+            assert block.image_data == b""
+            assert block.xref is not None
+            assert block.load_payload() == eager.slides[0].image_blocks[0].image_data
+
+    def test_save_images_materializes_lazy_payload(
+        self, generated_pdf: Path, tmp_path: Path
+    ) -> None:
+        """save_images は遅延画像を読み込んで保存し、ファイル参照に切り替える."""
+        with PDFExtractor(generated_pdf, lazy_images=True) as extractor:
+            data = extractor.extract_all()
+            extractor.save_images(data, tmp_path / "images")
+        block = data.slides[0].image_blocks[0]
+        assert block.source_path is not None
+        assert Path(block.source_path).stat().st_size > 0
+        assert block.load_payload() == Path(block.source_path).read_bytes()
+
+    def test_trusted_models_match_validated(self, generated_pdf: Path) -> None:
+        """検証なしで生成したモデルは、同じ値で検証付き生成したものと一致する."""
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all()
+        for slide in data.slides:
+            for block in slide.text_blocks:
+                assert set(block.__dict__) == set(TextBlock.model_fields)
+                assert TextBlock.model_validate(block.model_dump()) == block
+
+    def test_fonts_are_shared_across_pages(self, generated_pdf: Path) -> None:
+        """同じ書式のスパンはページ・プロセスをまたいで同一の FontInfo を共有する."""
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all(workers=2)
+        body_fonts = [s.text_blocks[1].spans[0].font for s in data.slides]
+        assert all(f is body_fonts[0] for f in body_fonts)
+
+
+class TestSelectiveExtraction:
+    """ページ範囲・要素を絞った抽出のテスト."""
+
+    def test_only_selected_pages_are_parsed(
+        self, generated_pdf: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        parsed: list[int] = []
+        original = PDFExtractor._extract_page_uncached
+        monkeypatch.setattr(
+            PDFExtractor,
+            "_extract_page_uncached",
+            lambda self, page, page_num: parsed.append(page_num) or original(self, page, page_num),
+        )
+        with PDFExtractor(generated_pdf, pages=parse_page_ranges("5-,2")) as extractor:
+            data = extractor.extract_all()
+            streamed = list(extractor.iter_slides())
+        assert parsed == [1, 4, 5] * 2
+        assert [s.page_number for s in data.slides] == [2, 5, 6]
+        assert [s.model_dump() for s in streamed] == [s.model_dump() for s in data.slides]
+        assert data.total_pages == 6
+
+    def test_parallel_selected_pages_match_serial(self, generated_pdf: Path) -> None:
+        with PDFExtractor(generated_pdf, pages=parse_page_ranges("1,3-5")) as extractor:
+            serial = extractor.extract_all()
+            parallel = extractor.extract_all(workers=2)
+        assert [s.page_number for s in parallel.slides] == [1, 3, 4, 5]
+        assert parallel.model_dump() == serial.model_dump()
+
+    def test_pages_beyond_document_raise(self, generated_pdf: Path) -> None:
+        extractor = PDFExtractor(generated_pdf, pages=parse_page_ranges("7-"))
+        with pytest.raises(ValueError, match="指定したページ"):
+            extractor.open()
+
+    def test_without_images_skips_image_lookup(
+        self, generated_pdf: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("画像を参照した")
+
+        monkeypatch.setattr(fitz.Page, "get_images", fail)
+        monkeypatch.setattr(fitz.Document, "extract_image", fail)
+        with PDFExtractor(generated_pdf, extract_images=False) as extractor:
+            data = extractor.extract_all()
+        assert all(not s.image_blocks and s.text_blocks for s in data.slides)
+
+
+def _solid_png(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), False)
+    pix.set_rect(pix.irect, color)
+    return pix.tobytes("png")
+
+
+def _append_contents(doc: fitz.Document, page: fitz.Page, stream: bytes) -> None:
+    """ページのコンテンツストリームの末尾に stream を追加する."""
+    xref = doc.get_new_xref()
+    doc.update_object(xref, "<<>>")
+    doc.update_stream(xref, stream)
+    refs = " ".join(f"{c} 0 R" for c in [*page.get_contents(), xref])
+    doc.xref_set_key(page.xref, "Contents", f"[{refs}]")
+
+
+# 100x100pt で (300, 100) に描く 2x2 の DeviceRGB のインライン画像（青）
+_INLINE_BLUE = (
+    b"q 100 0 0 100 300 100 cm\n"
+    b"BI /W 2 /H 2 /CS /RGB /BPC 8 /F /AHx ID\n"
+    b"0000FF0000FF0000FF0000FF> EI Q\n"
+)
+
+
+class TestImagePlacements:
+    """TextPage の画像情報から画像の配置を抽出するテスト."""
+
+    def test_every_placement_becomes_image_block(self) -> None:
+        """同じ画像を複数の位置に配置した場合、配置ごとに ImageBlock を作る."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        rects = [fitz.Rect(40, 40, 140, 140), fitz.Rect(300, 200, 400, 300)]
+        xref = page.insert_image(rects[0], stream=_solid_png(32, 32, (200, 0, 0)))
+        page.insert_image(rects[1], xref=xref)
+        pdf_bytes = doc.tobytes()
+
+        with PDFExtractor(pdf_bytes) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [(b.bbox.x0, b.bbox.y0) for b in images] == [(40, 40), (300, 200)]
+        assert {b.xref for b in images} == {xref}
+        assert images[0].image_data is images[1].image_data
+
+    def test_image_past_page_edge_is_extracted(self) -> None:
+        """ページからはみ出した画像も、はみ出す前の位置で抽出する."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        page.insert_image(fitz.Rect(600, 300, 800, 450), stream=_solid_png(40, 30, (0, 128, 0)))
+
+        with PDFExtractor(doc.tobytes()) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [(b.bbox.x0, b.bbox.y0, b.bbox.x1, b.bbox.y1) for b in images] == [
+            (600, 300, 800, 450)
+        ]
+
+    def test_same_sized_images_resolved_by_pixels(self) -> None:
+        """同じ寸法の別画像も、画素でそれぞれの xref に対応付ける."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        red = page.insert_image(
+            fitz.Rect(40, 40, 140, 140), stream=_solid_png(32, 32, (255, 0, 0))
+        )
+        blue = page.insert_image(
+            fitz.Rect(300, 40, 400, 140), stream=_solid_png(32, 32, (0, 0, 255))
+        )
+        page.insert_image(fitz.Rect(40, 200, 140, 300), xref=blue)
+        pdf_bytes = doc.tobytes()
+
+        with PDFExtractor(pdf_bytes, lazy_images=True) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+            assert [(b.bbox.x0, b.bbox.y0, b.xref) for b in images] == [
+                (40, 40, red),
+                (300, 40, blue),
+                (40, 200, blue),
+            ]
+
+    def test_inline_image_is_not_mapped_to_xobject(self) -> None:
+        """インライン画像は、寸法の合わない XObject の画像に対応付けない."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        xref = page.insert_image(
+            fitz.Rect(40, 40, 140, 140), stream=_solid_png(32, 32, (255, 0, 0))
+        )
+        _append_contents(doc, page, _INLINE_BLUE)
+
+        with PDFExtractor(doc.tobytes(), lazy_images=True) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [(b.bbox.x0, b.bbox.y0, b.xref) for b in images] == [(40, 40, xref)]
+
+    def test_inline_image_with_xobject_dimensions_is_not_mapped(self) -> None:
+        """寸法が同じでも色空間の異なるインライン画像は XObject に対応付けない."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        # insert_image() の画像は ICCBased、インライン画像は DeviceRGB
+        xref = page.insert_image(fitz.Rect(40, 40, 140, 140), stream=_solid_png(2, 2, (255, 0, 0)))
+        _append_contents(doc, page, _INLINE_BLUE)
+
+        with PDFExtractor(doc.tobytes(), lazy_images=True) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [(b.bbox.x0, b.bbox.y0, b.xref) for b in images] == [(40, 40, xref)]
+
+    def test_inline_image_matching_xobject_is_resolved_by_pixels(self) -> None:
+        """寸法も色空間も同じインライン画像は、画素で XObject の再配置と区別する."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        xref = doc.get_new_xref()
+        doc.update_object(
+            xref,
+            "<< /Type /XObject /Subtype /Image /Width 2 /Height 2 "
+            "/BitsPerComponent 8 /ColorSpace /DeviceRGB >>",
+        )
+        doc.update_stream(xref, b"\xff\x00\x00" * 4)
+        doc.xref_set_key(page.xref, "Resources", f"<< /XObject << /Im0 {xref} 0 R >> >>")
+        _append_contents(
+            doc,
+            page,
+            b"q 100 0 0 100 40 265 cm /Im0 Do Q\n"
+            b"q 100 0 0 100 40 105 cm /Im0 Do Q\n" + _INLINE_BLUE,
+        )
+
+        with PDFExtractor(doc.tobytes(), lazy_images=True) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [(b.bbox.x0, b.bbox.y0, b.xref) for b in images] == [
+            (40, 40, xref),
+            (40, 200, xref),
+        ]
+
+    def test_repeated_image_is_not_hashed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """インライン画像のないページでは、同じ画像の再配置を画素で確かめない."""
+        doc = fitz.open()
+        page = doc.new_page(width=720, height=405)
+        xref = page.insert_image(
+            fitz.Rect(40, 40, 140, 140), stream=_solid_png(32, 32, (200, 0, 0))
+        )
+        page.insert_image(fitz.Rect(300, 200, 400, 300), xref=xref)
+        original = fitz.TextPage.extractIMGINFO
+
+        def no_hashes(self: fitz.TextPage, hashes: bool = False) -> list[dict[str, object]]:
+            assert not hashes, "画素のハッシュを計算した"
+            return original(self)
+
+        monkeypatch.setattr(fitz.TextPage, "extractIMGINFO", no_hashes)
+        with PDFExtractor(doc.tobytes(), lazy_images=True) as extractor:
+            images = extractor.extract_all().slides[0].image_blocks
+        assert [b.xref for b in images] == [xref, xref]
+
+    def test_distinct_images_parse_content_once(
+        self, generated_pdf: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """寸法で区別できる画像は、画像ごとの位置の再解析を行わない."""
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("画像の位置を再解析した")
+
+        monkeypatch.setattr(fitz.Page, "get_image_rects", fail)
+        monkeypatch.setattr(fitz.Page, "get_text", fail)
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all()
+        assert all(s.image_blocks and s.text_blocks for s in data.slides)
+
+
+class TestSplitPageRanges:
+    """_split_page_ranges のテスト."""
+
+    def test_ranges_cover_all_pages_in_order(self) -> None:
+        ranges = _split_page_ranges(10, 4)
+        assert ranges == [(0, 3), (3, 6), (6, 8), (8, 10)]
+
+    def test_chunks_capped_by_page_count(self) -> None:
+        assert _split_page_ranges(2, 8) == [(0, 1), (1, 2)]
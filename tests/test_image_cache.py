@@ -0,0 +1,33 @@
+"""画像キャッシュのユニットテスト."""
+
+from src.extractor.image_cache import CachedImage, ImageCache
+
+
+class TestImageCache:
+    """ImageCache のテスト."""
+
+    def test_hit_and_miss_are_counted(self) -> None:
+        cache = ImageCache(max_bytes=100)
+        assert cache.get(1) is None
+        image = CachedImage(data=b"x" * 10, ext="png")
+        cache.put(1, image)
+        assert cache.get(1) is image
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_lru_eviction_respects_size_cap(self) -> None:
+        cache = ImageCache(max_bytes=25)
+        cache.put(1, CachedImage(data=b"a" * 10, ext="png"))
+        cache.put(2, CachedImage(data=b"b" * 10, ext="png"))
+        cache.get(1)  # 1 を最近参照にする
+        cache.put(3, CachedImage(data=b"c" * 10, ext="png"))
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.current_bytes == 20
+        assert cache.stats.evictions == 1
+
+    def test_oversized_image_is_not_cached(self) -> None:
+        cache = ImageCache(max_bytes=5)
+        cache.put(1, CachedImage(data=b"x" * 10, ext="png"))
+        assert len(cache) == 0
+        assert cache.get(1) is None
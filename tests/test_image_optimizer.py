@@ -0,0 +1,138 @@
+"""画像最適化ステージのユニットテスト."""
+
+import io
+
+import fitz
+import numpy as np
+import pytest
+from PIL import Image
+from pptx import Presentation
+
+from src.extractor.image_optimizer import ImageOptimizer
+from src.main import convert_bytes
+from src.models import BoundingBox, ImageBlock, SlideData
+
+
+def _photo(width: int, height: int) -> bytes:
+    """色数の多い（写真相当の）JPEG を生成する."""
+    pixels = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _graphic(width: int, height: int) -> bytes:
+    """2色の図版の PNG を生成する."""
+    image = Image.new("RGB", (width, height), (255, 255, 255))
+    image.paste((0, 80, 200), (0, 0, width // 2, height))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _slide(*blocks: ImageBlock) -> SlideData:
+    return SlideData(
+        page_number=1, width=720, height=405, text_blocks=[], image_blocks=list(blocks)
+    )
+
+
+def _block(data: bytes, bbox: tuple[float, float, float, float], xref: int = 1) -> ImageBlock:
+    x0, y0, x1, y1 = bbox
+    return ImageBlock(
+        bbox=BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1),
+        image_data=data,
+        image_format="jpeg",
+        xref=xref,
+    )
+
+
+def _size(data: bytes) -> tuple[int, int]:
+    with Image.open(io.BytesIO(data)) as image:
+        return image.size
+
+
+class TestImageOptimizer:
+    """ImageOptimizer のテスト."""
+
+    def test_downsamples_to_displayed_size(self) -> None:
+        """表示サイズ × DPI を超える画像は縮小し、写真は JPEG で再圧縮する."""
+        original = _photo(1200, 900)
+        block = _block(original, (100, 100, 172, 154))
+        with ImageOptimizer(dpi=144) as optimizer:
+            optimizer.optimize_slide(_slide(block))
+        assert _size(block.image_data) == (144, 108)
+        assert block.image_format == "jpeg"
+        assert len(block.image_data) < len(original)
+        assert optimizer.stats.optimized == 1
+
+    def test_crops_to_visible_region(self) -> None:
+        """スライドからはみ出した部分は切り落とし、表示位置も表示領域に合わせる."""
+        block = _block(_graphic(400, 300), (620, 305, 820, 455))
+        with ImageOptimizer(dpi=72) as optimizer:
+            optimizer.optimize_slide(_slide(block))
+        bbox = block.bbox
+        assert (bbox.x0, bbox.y0, bbox.x1, bbox.y1) == (620, 305, 720, 405)
+        assert _size(block.image_data) == (100, 100)
+        assert block.image_format == "png"
+        with Image.open(io.BytesIO(block.image_data)) as image:
+            assert image.convert("RGB").getpixel((0, 0)) == (0, 80, 200)
+
+    def test_image_within_target_is_unchanged(self) -> None:
+        """表示サイズに見合った JPEG は再圧縮しない."""
+        original = _photo(200, 150)
+        block = _block(original, (0, 0, 200, 150))
+        with ImageOptimizer(dpi=72) as optimizer:
+            optimizer.optimize_slide(_slide(block))
+        assert block.image_data is original
+        assert optimizer.stats.unchanged == 1
+
+    def test_encoding_png_is_lossless(self) -> None:
+        block = _block(_photo(800, 600), (0, 0, 200, 150))
+        with ImageOptimizer(dpi=72, encoding="png") as optimizer:
+            optimizer.optimize_slide(_slide(block))
+        assert block.image_format == "png"
+        assert _size(block.image_data) == (200, 150)
+
+    def test_same_placement_is_processed_once(self) -> None:
+        """同じ xref・表示領域の画像は1度だけ処理し、同じバイト列を共有する."""
+        original = _photo(1200, 900)
+        slides = [_slide(_block(original, (10, 10, 82, 64), xref=7)) for _ in range(3)]
+        with ImageOptimizer(dpi=72) as optimizer:
+            optimizer.optimize_slides(slides)
+        data = [slide.image_blocks[0].image_data for slide in slides]
+        assert data[0] is data[1] is data[2]
+        assert optimizer.stats.optimized == 1
+
+    def test_undecodable_image_is_kept(self) -> None:
+        block = _block(b"not an image", (0, 0, 100, 100))
+        with ImageOptimizer() as optimizer:
+            optimizer.optimize_slide(_slide(block))
+        assert block.image_data == b"not an image"
+        assert optimizer.stats.unchanged == 1
+
+    def test_invalid_encoding_raises(self) -> None:
+        with pytest.raises(ValueError, match="再圧縮形式"):
+            ImageOptimizer(encoding="webp")
+
+
+class TestOptimizedConversion:
+    """optimize_images を指定した変換のテスト."""
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_output_embeds_downsampled_images(self, stream: bool) -> None:
+        doc = fitz.open()
+        photo = _photo(2000, 1500)
+        for _ in range(2):
+            page = doc.new_page(width=720, height=405)
+            page.insert_image(fitz.Rect(50, 50, 250, 200), stream=photo)
+            page.insert_text((50, 300), "Photo slide")
+        pdf_bytes = doc.tobytes()
+
+        plain = convert_bytes(pdf_bytes, stream=stream, use_cache=False)
+        optimized = convert_bytes(pdf_bytes, stream=stream, use_cache=False, optimize_images=True)
+        assert len(optimized) < len(plain) / 2
+        prs = Presentation(io.BytesIO(optimized))
+        shapes = [*prs.slides[0].slide_layout.shapes, *prs.slides[0].shapes]
+        pictures = [shape for shape in shapes if hasattr(shape, "image")]
+        assert [picture.image.size for picture in pictures] == [(834, 625)]
+        assert pictures[0].width == 200 * 12700
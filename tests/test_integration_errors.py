@@ -38,6 +38,13 @@ class TestCliErrorPaths:
         assert len(combined) > 0
         assert "exist" in combined or "エラー" in combined or "見つかりません" in combined or "error" in combined
 
+    def test_invalid_pages_exits_nonzero(self, generated_pdf: Path) -> None:
+        """--pages の書式が不正な場合は変換せずに非ゼロ終了する."""
+        result = _run_cli([str(generated_pdf), "--pages", "3-1"])
+        assert result.returncode != 0
+        assert "--pages" in result.stderr
+        assert not generated_pdf.with_suffix(".pptx").exists()
+
     def test_help_succeeds(self) -> None:
         """--help で全オプションが表示され、正常終了する."""
         result = _run_cli(["--help"])
@@ -1,5 +1,7 @@
 """レイアウト解析のユニットテスト."""
 
+import pytest
+
 from src.analyzer.layout_analyzer import LayoutAnalyzer
 from src.models import (
     BoundingBox,
@@ -131,3 +133,312 @@ class TestLayoutAnalyzer:
         assert result is pres
         assert pres.slides[0].text_blocks[0].element_type == ElementType.TITLE
         assert pres.slides[0].text_blocks[1].element_type == ElementType.BODY
+
+
+class _FakeResponse:
+    """messages.create の応答を模したオブジェクト."""
+
+    def __init__(self, text: str) -> None:
+        self.content = [type("Content", (), {"text": text})()]
+        self.usage = type("Usage", (), {"input_tokens": 100, "output_tokens": 20})()
+
+
+class _FakeAsyncClient:
+    """一定時間待ってから全ブロックを body と返す非同期クライアント.
+
+    テキストに「エラー」を含むスライドでは例外を送出し、「欠落」を含むスライドでは
+    最後のブロックの判定を応答から除く。
+    """
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.messages = self
+
+    async def create(self, **kwargs: object) -> _FakeResponse:
+        import asyncio
+        import json
+
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        content = kwargs["messages"][0]["content"]  # type: ignore[index]
+        if "エラー" in content:
+            raise RuntimeError("API error")
+        blocks = json.loads(content.split("テキストブロック:\n")[1])
+        if "欠落" in content:
+            blocks = blocks[:-1]
+        return _FakeResponse(
+            json.dumps([{"block_index": b["block_index"], "element_type": "body"} for b in blocks])
+        )
+
+
+def _make_llm_presentation(pages: int):
+    """タイトルと本文を持つスライドを pages 枚含むプレゼンテーションを生成する."""
+    from src.models import PresentationData
+
+    return PresentationData(
+        source_path="test.pdf",
+        total_pages=pages,
+        slides=[
+            SlideData(
+                page_number=i,
+                width=720.0,
+                height=405.0,
+                text_blocks=[
+                    _make_block("タイトル", 50, 30, 670, 80, font_size=24.0),
+                    _make_block("本文", 50, 120, 670, 200, font_size=12.0),
+                ],
+            )
+            for i in range(1, pages + 1)
+        ],
+    )
+
+
+class TestLayoutAnalyzerLLM:
+    """LLM解析の並行実行とフォールバックのテスト."""
+
+    def test_slides_are_analyzed_concurrently(self) -> None:
+        """同時実行数の上限まで並行して呼び出され、全スライドが LLM の判定になる."""
+        import time
+
+        client = _FakeAsyncClient(delay=0.05)
+        analyzer = LayoutAnalyzer(anthropic_client=client, concurrency=10)
+        pres = _make_llm_presentation(40)
+        progress: list[int] = []
+
+        start = time.monotonic()
+        analyzer.analyze_presentation(pres, on_progress=lambda done, total: progress.append(done))
+        elapsed = time.monotonic() - start
+        analyzer.close()
+
+        assert client.calls == 40
+        assert client.max_active == 10
+        # 逐次なら 2.0 秒、並行なら約 4 往復分
+        assert elapsed < 1.0
+        assert progress[-1] == 40
+        assert all(b.element_type == ElementType.BODY for s in pres.slides for b in s.text_blocks)
+
+    def test_failed_slide_falls_back_to_heuristic(self) -> None:
+        """失敗したスライドだけがヒューリスティックで判定される."""
+        client = _FakeAsyncClient(delay=0.0)
+        analyzer = LayoutAnalyzer(anthropic_client=client, concurrency=4)
+        pres = _make_llm_presentation(3)
+        pres.slides[1].text_blocks[1] = _make_block("エラー", 50, 120, 670, 200, font_size=12.0)
+
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        assert pres.slides[0].text_blocks[0].element_type == ElementType.BODY
+        assert pres.slides[1].text_blocks[0].element_type == ElementType.TITLE
+        assert pres.slides[2].text_blocks[0].element_type == ElementType.BODY
+
+    def test_analyze_slide_uses_llm(self) -> None:
+        """ストリーミング用の analyze_slide もクライアントがあれば LLM を使う."""
+        client = _FakeAsyncClient(delay=0.0)
+        analyzer = LayoutAnalyzer(anthropic_client=client)
+        pres = _make_llm_presentation(2)
+
+        for slide in pres.slides:
+            analyzer.analyze_slide(slide)
+        analyzer.close()
+
+        assert client.calls == 2
+        assert pres.slides[1].text_blocks[0].element_type == ElementType.BODY
+
+
+class _FakeBatchClient:
+    """表形式の一括解析リクエストに、全ブロックを body と返す非同期クライアント.
+
+    omit_pages に含まれるページは応答から除外する。
+    """
+
+    def __init__(self, omit_pages: frozenset[int] = frozenset()) -> None:
+        self.omit_pages = omit_pages
+        self.requests: list[str] = []
+        self.messages = self
+
+    async def create(self, **kwargs: object) -> _FakeResponse:
+        import json
+
+        content = kwargs["messages"][0]["content"]  # type: ignore[index]
+        self.requests.append(content)
+        results: dict[str, dict[str, str]] = {}
+        page = ""
+        for line in content.splitlines():
+            if line.startswith("# "):
+                page = line.split()[1]
+                results[page] = {}
+            else:
+                results[page][line.split("|")[0]] = "body"
+        for omitted in self.omit_pages:
+            results.pop(str(omitted), None)
+        return _FakeResponse("```json\n" + json.dumps(results) + "\n```")
+
+
+class TestLayoutAnalyzerBatch:
+    """複数スライドの一括LLM解析のテスト."""
+
+    def test_slides_are_packed_into_few_requests(self) -> None:
+        """トークン数の目安までスライドをまとめ、全ブロックに判定を反映する."""
+        client = _FakeBatchClient()
+        analyzer = LayoutAnalyzer(anthropic_client=client, batch_tokens=200)
+        pres = _make_llm_presentation(20)
+        progress: list[int] = []
+
+        analyzer.analyze_presentation(pres, on_progress=lambda done, total: progress.append(done))
+        analyzer.close()
+
+        assert 1 < len(client.requests) < 10
+        assert progress[-1] == 20
+        assert all(b.element_type == ElementType.BODY for s in pres.slides for b in s.text_blocks)
+
+    def test_table_encoding_is_compact(self) -> None:
+        """表形式は1ブロック1行で、JSON の整形より短い."""
+        import json
+
+        slide = _make_llm_presentation(1).slides[0]
+        info = LayoutAnalyzer._blocks_info(slide)
+        table = LayoutAnalyzer._encode_slide_table(slide, info)
+        assert table.splitlines() == [
+            "# 1 720x405",
+            "0|50|30|670|80|24|0|タイトル",
+            "1|50|120|670|200|12|0|本文",
+        ]
+        assert len(table) < len(json.dumps(info, ensure_ascii=False, indent=2)) / 3
+
+    def test_missing_slide_falls_back_to_heuristic(self) -> None:
+        """応答に含まれないスライドだけがヒューリスティックで判定される."""
+        client = _FakeBatchClient(omit_pages=frozenset({2}))
+        analyzer = LayoutAnalyzer(anthropic_client=client, batch_tokens=10_000)
+        pres = _make_llm_presentation(3)
+
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        assert len(client.requests) == 1
+        assert pres.slides[0].text_blocks[0].element_type == ElementType.BODY
+        assert pres.slides[1].text_blocks[0].element_type == ElementType.TITLE
+        assert pres.slides[2].text_blocks[0].element_type == ElementType.BODY
+
+    def test_failed_request_falls_back_to_heuristic(self) -> None:
+        """リクエストが失敗したバッチのスライドはヒューリスティックで判定される."""
+        client = _FakeAsyncClient(delay=0.0)  # 表形式を解釈できず例外を送出する
+        analyzer = LayoutAnalyzer(anthropic_client=client, batch_tokens=10_000)
+        pres = _make_llm_presentation(2)
+
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        assert all(s.text_blocks[0].element_type == ElementType.TITLE for s in pres.slides)
+
+
+class TestHeuristicConfidence:
+    """ヒューリスティック判定の信頼度と、信頼度による LLM への振り分けのテスト."""
+
+    def test_clear_cut_blocks_are_confident(self) -> None:
+        """しきい値から十分離れたブロックの信頼度は 1.0."""
+        slide = SlideData(
+            page_number=1,
+            width=720.0,
+            height=405.0,
+            text_blocks=[
+                _make_block("タイトル", 50, 20, 670, 80, font_size=28.0),
+                _make_block("本文", 50, 200, 670, 260, font_size=12.0),
+            ],
+        )
+        assert LayoutAnalyzer()._analyze_slide_heuristic(slide) == pytest.approx([1.0, 1.0])
+
+    def test_near_threshold_block_is_uncertain(self) -> None:
+        """タイトルのフォントサイズ比 0.85 付近のブロックは信頼度が低い."""
+        slide = SlideData(
+            page_number=1,
+            width=720.0,
+            height=405.0,
+            text_blocks=[
+                _make_block("タイトル", 50, 20, 670, 80, font_size=28.0),
+                _make_block("見出し？", 50, 100, 670, 140, font_size=24.0),
+            ],
+        )
+        confidences = LayoutAnalyzer()._analyze_slide_heuristic(slide)
+        assert slide.text_blocks[1].element_type == ElementType.TITLE
+        assert confidences[0] == pytest.approx(1.0)
+        assert confidences[1] < 0.1
+
+    def test_only_uncertain_slides_are_escalated(self) -> None:
+        """信頼度がしきい値未満のスライドだけが LLM に送られる."""
+        client = _FakeAsyncClient(delay=0.0)
+        analyzer = LayoutAnalyzer(anthropic_client=client, escalation_threshold=0.5)
+        pres = _make_llm_presentation(3)
+        pres.slides[1].text_blocks[1] = _make_block("見出し？", 50, 100, 670, 140, font_size=20.5)
+        progress: list[int] = []
+
+        analyzer.analyze_presentation(pres, on_progress=lambda done, total: progress.append(done))
+        analyzer.close()
+
+        assert client.calls == 1
+        assert progress[-1] == 3
+        assert pres.slides[0].text_blocks[0].element_type == ElementType.TITLE
+        assert pres.slides[1].text_blocks[0].element_type == ElementType.BODY
+        assert pres.slides[2].text_blocks[0].element_type == ElementType.TITLE
+
+
+class TestVectorizedHeuristic:
+    """全スライド一括のヒューリスティック判定のテスト."""
+
+    def test_matches_per_block_rules(self) -> None:
+        """ランダムなデッキで、ブロック単位の判定と同じラベル・信頼度になる."""
+        import random
+
+        from src.analyzer.vectorized_heuristic import analyze_slides, build_features, classify
+
+        rng = random.Random(0)
+        texts = ["タイトル", "• 項目", "1. 手順", "  ", "本文です", "-", "a.b"]
+        sizes = [8.0, 12.0, 14.0, 17.0, 20.0, 24.0, 28.0]
+        slides = []
+        for page in range(1, 60):
+            height = rng.choice([405.0, 540.0, 0.0]) if page % 20 == 0 else 405.0
+            blocks = []
+            for _ in range(rng.randint(0, 8)):
+                y0 = rng.choice([rng.uniform(0, 400), 40.5, 162.0, 344.25])
+                block = _make_block(rng.choice(texts), 50, y0, 670, y0 + 20, rng.choice(sizes))
+                if rng.random() < 0.2:
+                    block.spans.append(block.spans[0].model_copy())
+                    block.spans[-1].font = FontInfo(size=rng.choice(sizes), bold=True)
+                blocks.append(block)
+            slides.append(
+                SlideData(page_number=page, width=720.0, height=height, text_blocks=blocks)
+            )
+
+        analyzer = LayoutAnalyzer()
+        expected_labels = []
+        expected_conf = []
+        for slide in slides:
+            expected_conf.extend(analyzer._analyze_slide_heuristic(slide))
+            expected_labels.extend(b.element_type for b in slide.text_blocks)
+            for block in slide.text_blocks:
+                block.element_type = ElementType.UNKNOWN
+
+        _, confidence = classify(build_features(slides))
+        slide_conf = analyze_slides(slides)
+
+        assert [b.element_type for s in slides for b in s.text_blocks] == expected_labels
+        assert confidence.tolist() == expected_conf
+        assert len(slide_conf) == len(slides)
+
+    def test_analyze_presentation_uses_whole_deck_path(self) -> None:
+        """クライアントが無い場合も analyze_presentation の結果は変わらない."""
+        pres = _make_llm_presentation(3)
+        progress: list[tuple[int, int]] = []
+        LayoutAnalyzer().analyze_presentation(
+            pres, on_progress=lambda done, total: progress.append((done, total))
+        )
+        assert progress[-1] == (3, 3)
+        assert all(s.text_blocks[0].element_type == ElementType.TITLE for s in pres.slides)
+        assert all(s.text_blocks[1].element_type == ElementType.BODY for s in pres.slides)
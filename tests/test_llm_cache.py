@@ -0,0 +1,97 @@
+"""LLM レイアウト判定キャッシュのテスト."""
+
+from pathlib import Path
+
+from src.analyzer import LayoutAnalyzer, LLMLayoutCache
+from src.analyzer.llm_cache import layout_key
+from src.models import ElementType
+from tests.test_layout_analyzer import _FakeAsyncClient, _make_block, _make_llm_presentation
+
+
+class TestLLMLayoutCache:
+    """LLMLayoutCache のテスト."""
+
+    def test_put_then_get(self, tmp_path: Path) -> None:
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite")
+        assert cache.get("k") is None
+        cache.put("k", {0: "title", 1: "body"})
+        assert cache.get("k") == {0: "title", 1: "body"}
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_entries_survive_reopen(self, tmp_path: Path) -> None:
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite")
+        cache.put("k", {0: "title"})
+        cache.close()
+        assert LLMLayoutCache(tmp_path / "llm.sqlite").get("k") == {0: "title"}
+
+    def test_expired_entry_is_a_miss(self, tmp_path: Path) -> None:
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite", ttl_sec=1e-9)
+        cache.put("k", {0: "title"})
+        assert cache.get("k") is None
+
+    def test_least_recently_used_is_evicted(self, tmp_path: Path) -> None:
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite", max_entries=2)
+        cache.put("a", {0: "title"})
+        cache.put("b", {0: "body"})
+        cache.get("a")
+        cache.put("c", {0: "footer"})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats.evictions == 1
+
+    def test_key_ignores_dict_order(self) -> None:
+        a = layout_key({"x": 1, "y": [1, 2]}, "model", 1)
+        assert a == layout_key({"y": [1, 2], "x": 1}, "model", 1)
+        assert a != layout_key({"x": 1, "y": [1, 2]}, "other-model", 1)
+        assert a != layout_key({"x": 1, "y": [1, 2]}, "model", 2)
+
+
+class TestLayoutAnalyzerCache:
+    """キャッシュを使った LLM 解析のテスト."""
+
+    def test_repeated_layouts_skip_the_api(self, tmp_path: Path) -> None:
+        """同じレイアウトは2回目以降 API を呼ばずに判定される."""
+        client = _FakeAsyncClient(delay=0.0)
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite")
+        analyzer = LayoutAnalyzer(anthropic_client=client, concurrency=1, cache=cache)
+
+        analyzer.analyze_presentation(_make_llm_presentation(5))
+        pres = _make_llm_presentation(5)
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        # 5 枚とも同じレイアウトなので API 呼び出しは最初の1回だけ
+        assert client.calls == 1
+        assert (cache.stats.hits, cache.stats.misses) == (9, 1)
+        assert all(b.element_type == ElementType.BODY for s in pres.slides for b in s.text_blocks)
+
+    def test_failed_slide_is_not_cached(self, tmp_path: Path) -> None:
+        """フォールバックしたスライドの判定はキャッシュしない."""
+        client = _FakeAsyncClient(delay=0.0)
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite")
+        analyzer = LayoutAnalyzer(anthropic_client=client, cache=cache)
+        pres = _make_llm_presentation(1)
+        pres.slides[0].text_blocks[1] = _make_block("エラー", 50, 120, 670, 200, font_size=12.0)
+
+        analyzer.analyze_presentation(pres)
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        assert client.calls == 2
+        assert cache.stats.hits == 0
+
+    def test_partial_reply_is_not_cached(self, tmp_path: Path) -> None:
+        """判定が一部のブロックに欠けた応答は使わず、キャッシュもしない."""
+        client = _FakeAsyncClient(delay=0.0)
+        cache = LLMLayoutCache(tmp_path / "llm.sqlite")
+        analyzer = LayoutAnalyzer(anthropic_client=client, cache=cache)
+        pres = _make_llm_presentation(1)
+        pres.slides[0].text_blocks[1] = _make_block("欠落", 50, 120, 670, 200, font_size=12.0)
+
+        analyzer.analyze_presentation(pres)
+        analyzer.analyze_presentation(pres)
+        analyzer.close()
+
+        assert client.calls == 2
+        assert cache.stats.hits == 0
+        assert pres.slides[0].text_blocks[0].element_type == ElementType.TITLE
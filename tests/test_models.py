@@ -1,13 +1,20 @@
 """データモデルのユニットテスト."""
 
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from src.extractor import PDFExtractor
 from src.models import (
     BoundingBox,
     ElementType,
     FontInfo,
+    ImageBlock,
     PresentationData,
     SlideData,
     TextBlock,
     TextSpan,
+    construct_trusted,
 )
 
 
@@ -91,3 +98,88 @@ class TestElementType:
 
     def test_unknown_value(self) -> None:
         assert ElementType.UNKNOWN.value == "unknown"
+
+
+class TestImageBlockPayload:
+    """ImageBlock の画像データ取得のテスト."""
+
+    def _bbox(self) -> BoundingBox:
+        return BoundingBox(x0=0, y0=0, x1=10, y1=10)
+
+    def test_load_payload_from_bytes(self) -> None:
+        block = ImageBlock(bbox=self._bbox(), image_data=b"abc")
+        assert block.load_payload() == b"abc"
+        with block.open_payload() as stream:
+            assert stream.read() == b"abc"
+
+    def test_open_payload_mmaps_source_file(self, tmp_path) -> None:
+        path = tmp_path / "img.png"
+        path.write_bytes(b"file-bytes")
+        block = ImageBlock(bbox=self._bbox(), source_path=str(path))
+        assert block.has_payload
+        with block.open_payload() as stream:
+            assert stream.read() == b"file-bytes"
+
+    def test_lazy_loader_is_called_on_demand(self) -> None:
+        calls: list[int] = []
+
+        def loader(xref: int) -> bytes:
+            calls.append(xref)
+            return b"lazy"
+
+        block = ImageBlock(bbox=self._bbox(), xref=7)
+        assert not block.has_payload
+        block.bind_loader(loader)
+        assert block.has_payload
+        assert calls == []
+        assert block.load_payload() == b"lazy"
+        assert calls == [7]
+
+    def test_loader_is_dropped_on_pickle(self) -> None:
+        import pickle
+
+        block = ImageBlock(bbox=self._bbox(), xref=7)
+        block.bind_loader(lambda xref: b"lazy")
+        restored = pickle.loads(pickle.dumps(block))
+        assert restored.xref == 7
+        assert not restored.has_payload
+
+
+class TestConstructTrusted:
+    """construct_trusted のテスト."""
+
+    def test_builds_equal_model_without_validation(self) -> None:
+        values = {"x0": 1.0, "y0": 2.0, "x1": 3.0, "y1": 4.0}
+        bbox = construct_trusted(BoundingBox, dict(values))
+        assert bbox == BoundingBox(**values)
+        assert bbox.width == 2.0
+        assert bbox.model_fields_set == set(values)
+
+    def test_assignment_still_tracks_fields_set(self) -> None:
+        block = construct_trusted(
+            TextBlock,
+            {
+                "spans": [],
+                "bbox": BoundingBox(x0=0, y0=0, x1=1, y1=1),
+                "element_type": ElementType.UNKNOWN,
+                "line_spacing": 1.0,
+                "alignment": "left",
+            },
+        )
+        block.element_type = ElementType.TITLE
+        assert block.element_type == ElementType.TITLE
+
+    def test_extractor_models_meet_preconditions(self, generated_pdf: Path) -> None:
+        """construct_trusted で生成するモデルは全フィールドを持ち、プライベート属性を持たない."""
+        with PDFExtractor(generated_pdf) as extractor:
+            data = extractor.extract_all()
+
+        constructed: set[type[BaseModel]] = set()
+        for slide in data.slides:
+            for block in slide.text_blocks:
+                for model in [block, block.bbox, *block.spans, *(s.bbox for s in block.spans)]:
+                    assert model.__dict__.keys() == type(model).model_fields.keys()
+                    constructed.add(type(model))
+        assert constructed == {TextBlock, TextSpan, BoundingBox}
+        for model_cls in constructed:
+            assert not model_cls.__private_attributes__
@@ -0,0 +1,71 @@
+"""ページ単位の抽出キャッシュのテスト."""
+
+from pathlib import Path
+
+import fitz
+import pytest
+
+from src.extractor import PageCache, PDFExtractor
+from src.models import PresentationData
+
+
+def _extract(
+    pdf_path: Path, cache_dir: Path | None, workers: int = 1, lazy_images: bool = False
+) -> tuple[PresentationData, PDFExtractor]:
+    """抽出し、比較できるよう画像データを読み込んでおく."""
+    page_cache = PageCache(cache_dir) if cache_dir else None
+    with PDFExtractor(pdf_path, page_cache=page_cache, lazy_images=lazy_images) as extractor:
+        data = extractor.extract_all(workers=workers)
+        for slide in data.slides:
+            for image in slide.image_blocks:
+                image.image_data = image.load_payload()
+    return data, extractor
+
+
+def _revise(pdf_path: Path, out_path: Path, page_index: int) -> Path:
+    """1ページだけ文字を追加し、xref を振り直して保存した改訂版を作る."""
+    with fitz.open(pdf_path) as doc:
+        doc[page_index].insert_text((40, 300), "Revised", fontname="helv", fontsize=14)
+        doc.save(out_path, garbage=4, deflate=True)
+    return out_path
+
+
+class TestPageCache:
+    """PageCache を使った抽出のテスト."""
+
+    def test_rerun_reuses_every_page(self, generated_pdf: Path, tmp_path: Path) -> None:
+        expected, _ = _extract(generated_pdf, None)
+        _extract(generated_pdf, tmp_path / "cache")
+        data, extractor = _extract(generated_pdf, tmp_path / "cache")
+        assert (extractor.page_cache.stats.hits, extractor.page_cache.stats.misses) == (6, 0)
+        assert data.model_dump() == expected.model_dump()
+
+    def test_revised_pdf_reextracts_only_changed_page(
+        self, generated_pdf: Path, tmp_path: Path
+    ) -> None:
+        _extract(generated_pdf, tmp_path / "cache")
+        revised = _revise(generated_pdf, tmp_path / "revised.pdf", page_index=2)
+        expected, _ = _extract(revised, None)
+        data, extractor = _extract(revised, tmp_path / "cache")
+        assert (extractor.page_cache.stats.hits, extractor.page_cache.stats.misses) == (5, 1)
+        assert data.model_dump() == expected.model_dump()
+        assert "Revised" in "".join(
+            span.text for block in data.slides[2].text_blocks for span in block.spans
+        )
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_lazy_images_restored_from_current_document(
+        self, generated_pdf: Path, tmp_path: Path, workers: int
+    ) -> None:
+        _extract(generated_pdf, tmp_path / "cache", lazy_images=True)
+        revised = _revise(generated_pdf, tmp_path / "revised.pdf", page_index=0)
+        expected, _ = _extract(revised, None)
+        data, extractor = _extract(revised, tmp_path / "cache", lazy_images=True, workers=workers)
+        assert extractor.page_cache.stats.hits == 5
+        assert data.model_dump() == expected.model_dump()
+
+    def test_cache_is_bounded(self, generated_pdf: Path, tmp_path: Path) -> None:
+        with PDFExtractor(generated_pdf, page_cache=PageCache(tmp_path, max_bytes=1)) as extractor:
+            extractor.extract_all()
+        assert list(tmp_path.glob("*.json")) == []
+        assert extractor.page_cache.stats.evictions == 6
@@ -0,0 +1,25 @@
+"""ページ指定の解析のテスト."""
+
+import pytest
+
+from src.utils.page_ranges import format_page_ranges, parse_page_ranges, select_pages
+
+
+class TestPageRanges:
+    """parse_page_ranges / select_pages のテスト."""
+
+    def test_parse(self) -> None:
+        assert parse_page_ranges("1-10, 25,30-") == ((1, 10), (25, 25), (30, None))
+
+    @pytest.mark.parametrize("spec", ["", "0", "3-1", "a", "1-x", ","])
+    def test_invalid_spec_raises(self, spec: str) -> None:
+        with pytest.raises(ValueError):
+            parse_page_ranges(spec)
+
+    def test_select_sorted_unique_within_page_count(self) -> None:
+        ranges = parse_page_ranges("5-,2,1-3,40")
+        assert select_pages(ranges, 7) == [0, 1, 2, 4, 5, 6]
+        assert select_pages(None, 3) == [0, 1, 2]
+
+    def test_format_roundtrip(self) -> None:
+        assert format_page_ranges(parse_page_ranges("1-10,25,30-")) == "1-10,25,30-"
@@ -0,0 +1,45 @@
+"""LLM API レート制限のユニットテスト."""
+
+import asyncio
+import time
+
+from src.analyzer.rate_limiter import RateLimiter, estimate_tokens
+
+
+def _acquire_all(limiter: RateLimiter, count: int, tokens: int = 0) -> float:
+    """count 回 acquire し、要した秒数を返す."""
+
+    async def run() -> None:
+        await asyncio.gather(*(limiter.acquire(tokens) for _ in range(count)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    return time.monotonic() - start
+
+
+class TestRateLimiter:
+    """RateLimiter のテスト."""
+
+    def test_unlimited_does_not_wait(self) -> None:
+        """上限なしでは待たない."""
+        assert _acquire_all(RateLimiter(), 100, tokens=10_000) < 0.1
+
+    def test_within_burst_does_not_wait(self) -> None:
+        """1分あたりの上限以内なら待たない."""
+        assert _acquire_all(RateLimiter(requests_per_minute=60), 60) < 0.1
+
+    def test_requests_over_limit_wait(self) -> None:
+        """リクエスト数の上限を超えると補充されるまで待つ（600/分 = 0.1 秒に1回）."""
+        assert _acquire_all(RateLimiter(requests_per_minute=600), 602) >= 0.15
+
+    def test_tokens_over_limit_wait(self) -> None:
+        """トークン数の上限を超えると補充されるまで待つ."""
+        limiter = RateLimiter(tokens_per_minute=6000)
+        assert _acquire_all(limiter, 3, tokens=2000) < 0.1
+        assert _acquire_all(limiter, 1, tokens=20) >= 0.15
+
+
+def test_estimate_tokens() -> None:
+    """ASCII は約4文字、それ以外は約1文字で1トークンと見積もる."""
+    assert estimate_tokens("a" * 40) == 11
+    assert estimate_tokens("あいう") == 4
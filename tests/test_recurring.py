@@ -0,0 +1,151 @@
+"""繰り返し要素の検出とスライドレイアウトへの集約のテスト."""
+
+import io
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from src.analyzer.recurring import PAGE_NUMBER_TOKEN, find_recurring_elements
+from src.builder.pptx_builder import PPTXBuilder
+from src.models import (
+    BoundingBox,
+    ElementType,
+    FontInfo,
+    ImageBlock,
+    PresentationData,
+    SlideData,
+    TextBlock,
+    TextSpan,
+)
+
+
+def _png(color: tuple[int, int, int] = (30, 90, 200)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8), color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _text(
+    text: str,
+    x0: float,
+    y0: float,
+    size: float = 7.0,
+    element_type: ElementType = ElementType.FOOTER,
+) -> TextBlock:
+    return TextBlock(
+        spans=[TextSpan(text=text, font=FontInfo(size=size))],
+        bbox=BoundingBox(x0=x0, y0=y0, x1=x0 + 100, y1=y0 + 10),
+        element_type=element_type,
+    )
+
+
+def _deck(pages: int = 6, footer_from: int = 1) -> PresentationData:
+    """ページ番号・フッター・ロゴが共通する（footer_from ページ目以降）デッキを作る."""
+    logo = _png()
+    slides = []
+    for page in range(1, pages + 1):
+        text_blocks = [_text(f"Slide {page}", 40, 20, 24, ElementType.TITLE)]
+        image_blocks = []
+        if page >= footer_from:
+            text_blocks += [_text("NotebookLM Deck", 40, 390), _text(f"{page}", 660, 390)]
+            image_blocks.append(
+                ImageBlock(bbox=BoundingBox(x0=660, y0=8, x1=708, y1=56), image_data=logo)
+            )
+        slides.append(
+            SlideData(
+                page_number=page,
+                width=720,
+                height=405,
+                text_blocks=text_blocks,
+                image_blocks=image_blocks,
+            )
+        )
+    return PresentationData(
+        source_path="deck.pdf", total_pages=pages, slide_width=720, slide_height=405, slides=slides
+    )
+
+
+def _deck_with_backgrounds() -> PresentationData:
+    """_deck() の各スライドの最背面に、スライドごとに異なる全面画像を敷いたデッキ."""
+    data = _deck()
+    for page, slide in enumerate(data.slides, start=1):
+        background = ImageBlock(
+            bbox=BoundingBox(x0=0, y0=0, x1=720, y1=405), image_data=_png((page, 0, 0))
+        )
+        slide.image_blocks.insert(0, background)
+    return data
+
+
+class TestFindRecurringElements:
+    """find_recurring_elements のテスト."""
+
+    def test_footer_page_number_and_logo(self) -> None:
+        recurring = find_recurring_elements(_deck())
+        texts = sorted(block.full_text for block in recurring.text_blocks)
+        assert texts == ["NotebookLM Deck", PAGE_NUMBER_TOKEN]
+        assert len(recurring.image_blocks) == 1
+        assert recurring.slide_indices == frozenset(range(6))
+        assert recurring.skipped_text[0] == frozenset({1, 2})
+        assert recurring.skipped_images[0] == frozenset({0})
+
+    def test_slides_without_the_elements_keep_the_blank_layout(self) -> None:
+        recurring = find_recurring_elements(_deck(footer_from=2))
+        assert recurring.slide_indices == frozenset(range(1, 6))
+        assert 0 not in recurring.skipped_text
+
+    def test_page_numbers_only_in_headers_and_footers(self) -> None:
+        """タイトル中のスライド番号と同じ数字はページ番号とみなさない."""
+        recurring = find_recurring_elements(_deck())
+        assert all("Slide" not in block.full_text for block in recurring.text_blocks)
+
+    def test_logo_over_slide_specific_image_stays_on_slide(self) -> None:
+        """スライド固有の全面画像の上に描かれたロゴは、隠れないようスライドに残す."""
+        data = _deck_with_backgrounds()
+        recurring = find_recurring_elements(data)
+        texts = sorted(block.full_text for block in recurring.text_blocks)
+        assert texts == ["NotebookLM Deck", PAGE_NUMBER_TOKEN]
+        assert recurring.image_blocks == []
+        assert all(not indices for indices in recurring.skipped_images.values())
+
+    def test_nothing_recurs_in_short_or_varied_decks(self) -> None:
+        assert not find_recurring_elements(_deck(pages=2))
+        assert not find_recurring_elements(_deck(footer_from=5))
+
+
+class TestRecurringLayout:
+    """繰り返し要素をスライドレイアウトに配置して構築するテスト."""
+
+    def test_elements_are_emitted_once_on_the_layout(self, tmp_path: Path) -> None:
+        data = _deck()
+        builder = PPTXBuilder()
+        builder.build(data, recurring=find_recurring_elements(data))
+        prs = Presentation(str(builder.save(tmp_path / "out.pptx")))
+
+        layout = prs.slides[0].slide_layout
+        assert all(slide.slide_layout == layout for slide in prs.slides)
+        assert all(len(slide.shapes) == 1 for slide in prs.slides)
+        assert len(layout.shapes) - len(layout.placeholders) == 3
+        fields = layout._element.xpath(".//p:sp[not(.//p:ph)]//a:fld[@type='slidenum']")
+        assert len(fields) == 1
+
+    def test_covered_logo_is_drawn_above_the_background(self, tmp_path: Path) -> None:
+        data = _deck_with_backgrounds()
+        builder = PPTXBuilder()
+        builder.build(data, recurring=find_recurring_elements(data))
+        prs = Presentation(str(builder.save(tmp_path / "out.pptx")))
+
+        for slide in prs.slides:
+            pictures = [s for s in slide.shapes if s.shape_type == MSO_SHAPE_TYPE.PICTURE]
+            assert [picture.left for picture in pictures] == [0, 660 * 12700]
+
+    def test_smaller_than_per_slide_copies(self, tmp_path: Path) -> None:
+        data = _deck(pages=30)
+        plain = PPTXBuilder()
+        plain.build(data)
+        promoted = PPTXBuilder()
+        promoted.build(data, recurring=find_recurring_elements(data))
+        plain_size = plain.save(tmp_path / "plain.pptx").stat().st_size
+        promoted_size = promoted.save(tmp_path / "promoted.pptx").stat().st_size
+        assert promoted_size < plain_size
@@ -0,0 +1,157 @@
+"""変換結果キャッシュのテスト."""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from pptx import Presentation
+
+import src.result_cache
+from config.settings import get_settings
+from src.builder import PresentationTemplate
+from src.main import convert_pdf_to_pptx
+from src.result_cache import ResultCache, file_digest, result_key
+
+
+class TestResultKey:
+    """キャッシュキーのテスト."""
+
+    def test_same_input_same_key(self, generated_pdf: Path, tmp_path: Path) -> None:
+        copy = tmp_path / "copy.pdf"
+        shutil.copy(generated_pdf, copy)
+        assert result_key(generated_pdf) == result_key(copy)
+
+    def test_options_change_key(self, generated_pdf: Path, tmp_path: Path) -> None:
+        template = tmp_path / "template.pptx"
+        template.write_bytes(b"template")
+        keys = {
+            result_key(generated_pdf),
+            result_key(generated_pdf, template_path=template),
+            result_key(generated_pdf, use_llm=True, model="a"),
+            result_key(generated_pdf, use_llm=True, model="b"),
+            result_key(generated_pdf, merge_spans=False),
+            result_key(generated_pdf, promote_recurring=False),
+            result_key(generated_pdf, pages="1-3"),
+            result_key(generated_pdf, extract_images=False),
+            result_key(generated_pdf, image_optimization="300dpi/q85/auto"),
+            result_key(generated_pdf, use_llm=True, model="a", escalation_threshold=0.5),
+            result_key(generated_pdf, use_llm=True, model="a", batch_tokens=0),
+        }
+        assert len(keys) == 11
+
+    def test_template_digest_matches_file_key(self, generated_pdf: Path, tmp_path: Path) -> None:
+        template = tmp_path / "template.pptx"
+        Presentation().save(str(template))
+        digest = PresentationTemplate(template).digest
+        assert digest == file_digest(template)
+        assert result_key(generated_pdf, template_path=template) == result_key(
+            generated_pdf, template_path=template, template_digest=digest
+        )
+
+    def test_bytes_key_matches_file_key(self, generated_pdf: Path) -> None:
+        assert result_key(generated_pdf.read_bytes()) == result_key(generated_pdf)
+
+    def test_model_ignored_without_llm(self, generated_pdf: Path) -> None:
+        assert result_key(generated_pdf, model="a") == result_key(generated_pdf, model="b")
+        assert result_key(generated_pdf, escalation_threshold=0.5, batch_tokens=0) == result_key(
+            generated_pdf
+        )
+
+
+class TestResultCache:
+    """ResultCache のテスト."""
+
+    def test_miss_then_hit(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        src = tmp_path / "src.pptx"
+        src.write_bytes(b"pptx")
+        assert cache.get("k", tmp_path / "out.pptx") is None
+        cache.put("k", src)
+        assert cache.get("k", tmp_path / "out" / "hit.pptx") == tmp_path / "out" / "hit.pptx"
+        assert (tmp_path / "out" / "hit.pptx").read_bytes() == b"pptx"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_bytes_miss_then_hit(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache")
+        assert cache.get_bytes("k") is None
+        cache.put_bytes("k", b"pptx")
+        assert cache.get_bytes("k") == b"pptx"
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path / "cache", max_bytes=25)
+        src = tmp_path / "src.pptx"
+        src.write_bytes(b"x" * 10)
+        cache.put("a", src)
+        cache.put("b", src)
+        # a を古くしてから参照し、b より新しくする
+        for name, mtime in (("a", 1000), ("b", 2000)):
+            os.utime(tmp_path / "cache" / f"{name}.pptx", (mtime, mtime))
+        assert cache.get("a", tmp_path / "out.pptx") is not None
+        cache.put("c", src)
+        assert sorted(p.stem for p in (tmp_path / "cache").glob("*.pptx")) == ["a", "c"]
+        assert cache.stats.evictions == 1
+
+
+class TestConvertWithCache:
+    """convert_pdf_to_pptx のキャッシュ利用のテスト."""
+
+    @pytest.fixture(autouse=True)
+    def _cache_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(get_settings(), "result_cache_dir", tmp_path / "cache")
+
+    def test_second_conversion_hits_cache(
+        self, generated_pdf: Path, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        caplog.set_level("INFO", logger="src.main")
+        first = convert_pdf_to_pptx(
+            generated_pdf, tmp_path / "first.pptx", save_images=False, use_cache=True
+        )
+        assert "変換キャッシュにミス" in caplog.text
+
+        events: list[tuple[str, int, int]] = []
+        second = convert_pdf_to_pptx(
+            generated_pdf,
+            tmp_path / "second.pptx",
+            save_images=False,
+            use_cache=True,
+            on_progress=lambda *event: events.append(event),
+        )
+        assert "変換キャッシュにヒット" in caplog.text
+        assert events == []
+        assert second.read_bytes() == first.read_bytes()
+
+    def test_loaded_template_is_not_rehashed(
+        self,
+        generated_pdf: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """読み込み済みテンプレートのキーは読み込み時のハッシュから作り、ファイルを読み直さない."""
+        caplog.set_level("INFO", logger="src.main")
+        path = tmp_path / "template.pptx"
+        Presentation().save(str(path))
+        template = PresentationTemplate(path)
+        hashed: list[Path] = []
+        original_digest = src.result_cache.file_digest
+        monkeypatch.setattr(
+            src.result_cache,
+            "file_digest",
+            lambda p: hashed.append(Path(p)) or original_digest(p),
+        )
+        for name in ("first.pptx", "second.pptx"):
+            convert_pdf_to_pptx(
+                generated_pdf,
+                tmp_path / name,
+                template_path=template,
+                save_images=False,
+                use_cache=True,
+            )
+        assert "変換キャッシュにヒット" in caplog.text
+        assert path not in hashed
+
+    def test_cache_disabled_by_default(self, generated_pdf: Path, tmp_path: Path) -> None:
+        convert_pdf_to_pptx(generated_pdf, tmp_path / "out.pptx", save_images=False)
+        assert not (tmp_path / "cache").exists()
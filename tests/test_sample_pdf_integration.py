@@ -1,13 +1,19 @@
 """サンプル PDF を使った統合テスト.
 
 pdf/ または input/ に .pdf が無い場合はスキップする。
+生成 PDF（generated_pdf）を使うケースは常に実行する。
 """
 
+import io
+import subprocess
+import sys
 from pathlib import Path
 
 import pytest
+from pptx import Presentation
 
-from src.main import convert_pdf_to_pptx
+from src.extractor.pdf_extractor import MEMORY_SOURCE, PDFExtractor
+from src.main import convert_bytes, convert_pdf_to_pptx
 
 
 class TestSamplePdfIntegration:
@@ -48,3 +54,123 @@ class TestSamplePdfIntegration:
         )
         assert output_pptx.exists()
         assert output_pptx.stat().st_size == size_first
+
+
+def _visible_shapes(slide: object, number: int) -> list[tuple[object, object]]:
+    """スライドとそのレイアウト（プレースホルダー以外）のシェイプの種類とテキストを返す.
+
+    スライド番号フィールドは番号に置き換える。
+    """
+    shapes = list(slide.shapes) + [  # type: ignore[attr-defined]
+        s for s in slide.slide_layout.shapes if not s.is_placeholder  # type: ignore[attr-defined]
+    ]
+    return sorted(
+        (
+            (s.shape_type, s.has_text_frame and s.text_frame.text.replace("‹#›", str(number)))
+            for s in shapes
+        ),
+        key=repr,
+    )
+
+
+class TestGeneratedPdfIntegration:
+    """生成 PDF による E2E 統合テスト."""
+
+    def test_stream_matches_batch_slide_count(
+        self, generated_pdf: Path, tmp_path: Path
+    ) -> None:
+        """ストリーミング変換は通常変換と同じスライド数・テキストを出力する."""
+        batch = convert_pdf_to_pptx(generated_pdf, tmp_path / "batch.pptx", save_images=False)
+        streamed = convert_pdf_to_pptx(
+            generated_pdf, tmp_path / "stream.pptx", save_images=False, stream=True
+        )
+        batch_prs = Presentation(str(batch))
+        stream_prs = Presentation(str(streamed))
+        assert len(stream_prs.slides) == len(batch_prs.slides) == 6
+        pairs = zip(batch_prs.slides, stream_prs.slides, strict=True)
+        for number, (a, b) in enumerate(pairs, start=1):
+            # 通常変換では繰り返し要素がスライドレイアウトに移るため、レイアウトと合わせて比較する
+            assert _visible_shapes(a, number) == _visible_shapes(b, number)
+
+    @pytest.mark.parametrize("options", [{}, {"stream": True}, {"jobs": 2}])
+    def test_progress_reports_every_stage(
+        self, generated_pdf: Path, tmp_path: Path, options: dict
+    ) -> None:
+        """on_progress には工程ごとに総ページ数までの進捗が通知される."""
+        events: list[tuple[str, int, int]] = []
+        convert_pdf_to_pptx(
+            generated_pdf,
+            tmp_path / "out.pptx",
+            save_images=False,
+            on_progress=lambda stage, done, total: events.append((stage, done, total)),
+            **options,
+        )
+        for stage in ("extract", "analyze", "build"):
+            progress = [(done, total) for s, done, total in events if s == stage]
+            assert progress[-1] == (6, 6)
+            assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_selected_pages_without_images(
+        self, generated_pdf: Path, tmp_path: Path, stream: bool
+    ) -> None:
+        """pages と extract_images=False は指定ページのテキストだけを変換する."""
+        result = convert_pdf_to_pptx(
+            generated_pdf,
+            tmp_path / "out.pptx",
+            stream=stream,
+            pages="2,4-5",
+            extract_images=False,
+        )
+        prs = Presentation(str(result))
+        titles = [
+            next(s.text_frame.text for s in slide.shapes if "Title" in s.text_frame.text)
+            for slide in prs.slides
+        ]
+        assert titles == ["Slide Title 2", "Slide Title 4", "Slide Title 5"]
+        assert not any(s.shape_type == 13 for slide in prs.slides for s in slide.shapes)
+        assert not (tmp_path / "images").exists()
+
+
+class TestBytesConversion:
+    """バイト列入出力の変換 API と標準入出力の CLI のテスト."""
+
+    def test_convert_bytes_matches_file_conversion(
+        self, generated_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """convert_bytes はファイル経由の変換と同じスライドを返し、ファイルを作らない."""
+        expected = Presentation(
+            str(convert_pdf_to_pptx(generated_pdf, tmp_path / "file.pptx", save_images=False))
+        )
+        work_dir = tmp_path / "work"
+        work_dir.mkdir()
+        monkeypatch.chdir(work_dir)
+        for stream in (False, True):
+            pptx_bytes = convert_bytes(memoryview(generated_pdf.read_bytes()), stream=stream)
+            prs = Presentation(io.BytesIO(pptx_bytes))
+            assert len(prs.slides) == len(expected.slides) == 6
+            for number, (a, b) in enumerate(zip(expected.slides, prs.slides, strict=True), start=1):
+                assert _visible_shapes(a, number) == _visible_shapes(b, number)
+        assert list(work_dir.iterdir()) == []
+
+    def test_extractor_from_bytes(self, generated_pdf: Path) -> None:
+        with PDFExtractor(generated_pdf.read_bytes()) as extractor:
+            data = extractor.extract_all()
+        assert data.source_path == MEMORY_SOURCE
+        assert data.total_pages == 6
+
+    def test_invalid_bytes_raise_value_error(self) -> None:
+        with pytest.raises(ValueError):
+            convert_bytes(b"not a pdf")
+
+    def test_cli_stdin_to_stdout(self, generated_pdf: Path) -> None:
+        """入力に「-」を指定すると標準入力から読み、PPTX を標準出力に書く."""
+        result = subprocess.run(
+            [sys.executable, "-m", "src.main", "-"],
+            cwd=Path(__file__).resolve().parent.parent,
+            input=generated_pdf.read_bytes(),
+            capture_output=True,
+            timeout=60,
+        )
+        assert result.returncode == 0, result.stderr.decode(errors="replace")
+        assert len(Presentation(io.BytesIO(result.stdout)).slides) == 6
@@ -0,0 +1,128 @@
+"""変換サーバーの結合テスト."""
+
+import io
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from zipfile import ZipFile
+
+import pytest
+
+from src.server import ConversionHTTPServer, ConversionService, create_server, run_in_thread
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[ConversionHTTPServer]:
+    """ワーカー1個の変換サーバーを空きポートで起動する."""
+    srv = create_server("127.0.0.1", 0, workers=1)
+    run_in_thread(srv)
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(server: ConversionHTTPServer, path: str) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+def _get_json(server: ConversionHTTPServer, path: str) -> dict:
+    with urllib.request.urlopen(_url(server, path)) as res:
+        return json.loads(res.read())
+
+
+def _submit_job(server: ConversionHTTPServer, pdf_path: Path) -> dict:
+    req = urllib.request.Request(_url(server, "/jobs"), data=pdf_path.read_bytes(), method="POST")
+    with urllib.request.urlopen(req) as res:
+        assert res.status == 202
+        return json.loads(res.read())
+
+
+class TestConversionServer:
+    """変換サーバーのテスト."""
+
+    def test_health(self, server: ConversionHTTPServer) -> None:
+        with urllib.request.urlopen(_url(server, "/health")) as res:
+            assert json.loads(res.read()) == {"status": "ok", "workers": 1}
+
+    def test_convert_returns_pptx(self, server: ConversionHTTPServer, generated_pdf: Path) -> None:
+        req = urllib.request.Request(
+            _url(server, "/convert"), data=generated_pdf.read_bytes(), method="POST"
+        )
+        with urllib.request.urlopen(req, timeout=60) as res:
+            assert res.status == 200
+            body = res.read()
+        with ZipFile(io.BytesIO(body)) as zf:
+            assert "ppt/slides/slide6.xml" in zf.namelist()
+
+    def test_non_pdf_is_rejected(self, server: ConversionHTTPServer) -> None:
+        req = urllib.request.Request(_url(server, "/convert"), data=b"hello", method="POST")
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(req)
+        assert exc_info.value.code == 400
+
+
+class TestConversionJobs:
+    """非同期ジョブ API のテスト."""
+
+    def test_job_reports_progress_and_result(
+        self, server: ConversionHTTPServer, generated_pdf: Path
+    ) -> None:
+        job = _submit_job(server, generated_pdf)
+        assert job["status"] in ("queued", "running")
+
+        deadline = time.time() + 60
+        while (status := _get_json(server, job["status_url"]))["status"] not in (
+            "succeeded",
+            "failed",
+        ):
+            assert time.time() < deadline
+            time.sleep(0.1)
+
+        assert status["status"] == "succeeded"
+        assert status["progress"] == {
+            stage: {"completed": 6, "total": 6} for stage in ("extract", "analyze", "build")
+        }
+        with (
+            urllib.request.urlopen(_url(server, job["result_url"])) as res,
+            ZipFile(io.BytesIO(res.read())) as zf,
+        ):
+            assert "ppt/slides/slide6.xml" in zf.namelist()
+
+    def test_events_stream_until_done(
+        self, server: ConversionHTTPServer, generated_pdf: Path
+    ) -> None:
+        job = _submit_job(server, generated_pdf)
+        with urllib.request.urlopen(_url(server, job["events_url"]), timeout=60) as res:
+            events = [
+                json.loads(line[len(b"data: "):])
+                for line in res.read().splitlines()
+                if line.startswith(b"data: ")
+            ]
+        assert events[-1]["status"] == "succeeded"
+
+    def test_unknown_job_is_404(self, server: ConversionHTTPServer) -> None:
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(_url(server, "/jobs/" + "0" * 32))
+        assert exc_info.value.code == 404
+
+
+class TestConversionService:
+    """ConversionService のテスト."""
+
+    def test_broken_pool_is_replaced(self, generated_pdf: Path) -> None:
+        """ワーカーが異常終了した後も、プールを作り直して変換を受け付ける."""
+        service = ConversionService(workers=1, log_level="WARNING")
+        try:
+            with pytest.raises(BrokenProcessPool):
+                service._executor.submit(os._exit, 1).result(timeout=60)
+            pptx_bytes = service.submit(generated_pdf.read_bytes()).result(timeout=60)
+            with ZipFile(io.BytesIO(pptx_bytes)) as zf:
+                assert "ppt/slides/slide6.xml" in zf.namelist()
+        finally:
+            service.shutdown()
@@ -0,0 +1,53 @@
+"""スパン正規化（同一書式スパンの結合）のユニットテスト."""
+
+from src.analyzer.span_normalizer import merge_spans, normalize_slide
+from src.models import BoundingBox, FontInfo, SlideData, TextBlock, TextSpan
+
+
+def _span(
+    text: str, x0: float, y0: float, x1: float, y1: float, font: FontInfo | None = None
+) -> TextSpan:
+    """テスト用の座標付き TextSpan を生成するヘルパー."""
+    return TextSpan(
+        text=text,
+        font=font or FontInfo(name="Arial", size=12.0),
+        bbox=BoundingBox(x0=x0, y0=y0, x1=x1, y1=y1),
+    )
+
+
+class TestMergeSpans:
+    """merge_spans のテスト."""
+
+    def test_same_line_same_font_is_merged(self) -> None:
+        spans = [_span("Hello ", 10, 10, 50, 24), _span("World", 50, 10, 90, 24)]
+        merged = merge_spans(spans)
+        assert len(merged) == 1
+        assert merged[0].text == "Hello World"
+        assert merged[0].bbox == BoundingBox(x0=10, y0=10, x1=90, y1=24)
+
+    def test_different_font_is_not_merged(self) -> None:
+        bold = FontInfo(name="Arial-Bold", size=12.0, bold=True)
+        spans = [_span("Hello ", 10, 10, 50, 24), _span("World", 50, 10, 90, 24, font=bold)]
+        assert len(merge_spans(spans)) == 2
+
+    def test_next_line_is_not_merged(self) -> None:
+        spans = [_span("line 1", 10, 10, 80, 24), _span("line 2", 10, 26, 80, 40)]
+        assert [s.text for s in merge_spans(spans)] == ["line 1", "line 2"]
+
+    def test_newline_text_is_not_merged(self) -> None:
+        spans = [_span("a", 10, 10, 20, 24), _span("b\nc", 20, 10, 40, 24)]
+        assert len(merge_spans(spans)) == 2
+
+    def test_empty_spans_are_dropped(self) -> None:
+        spans = [_span("a", 10, 10, 20, 24), _span("", 20, 10, 20, 24), _span("b", 20, 10, 30, 24)]
+        assert [s.text for s in merge_spans(spans)] == ["ab"]
+
+    def test_normalize_slide_keeps_full_text(self) -> None:
+        block = TextBlock(
+            spans=[_span("a", 10, 10, 20, 24), _span("b", 20, 10, 30, 24)],
+            bbox=BoundingBox(x0=10, y0=10, x1=30, y1=24),
+        )
+        slide = SlideData(page_number=1, width=720, height=405, text_blocks=[block])
+        normalize_slide(slide)
+        assert block.full_text == "ab"
+        assert len(block.spans) == 1
@@ -0,0 +1,46 @@
+"""書式テーブル（StyleTable）のユニットテスト."""
+
+import pytest
+from pydantic import ValidationError
+
+from src.models import FontInfo
+from src.utils.style_table import StyleTable
+
+
+class TestStyleTable:
+    """StyleTable のテスト."""
+
+    def test_resolve_returns_shared_instance(self) -> None:
+        table = StyleTable()
+        a = table.resolve("Helvetica-Bold", 14.0, 16, 0x112233)
+        b = table.resolve("Helvetica-Bold", 14.0, 16, 0x112233)
+        assert a is b
+        assert a == FontInfo(name="Helvetica-Bold", size=14.0, bold=True, color="#112233")
+
+    def test_equal_styles_from_different_raw_keys_are_interned(self) -> None:
+        table = StyleTable()
+        a = table.resolve("Arial", 12.0, 0, 0)
+        b = table.resolve("Arial", 12.04, 4, 0)  # 丸め後は同じ書式
+        assert a is b
+        assert len(table) == 1
+
+    def test_intern_equal_font(self) -> None:
+        table = StyleTable()
+        first = table.intern(FontInfo(name="Arial", size=10.0))
+        assert table.intern(FontInfo(name="Arial", size=10.0)) is first
+
+    def test_run_style_is_cached_and_parses_color(self) -> None:
+        table = StyleTable()
+        font = FontInfo(color="#ff8000")
+        style = table.run_style(font)
+        assert table.run_style(font) is style
+        assert tuple(style.color) == (255, 128, 0)
+        assert style.size == 12 * 12700
+
+    def test_invalid_color_yields_none(self) -> None:
+        assert StyleTable().run_style(FontInfo(color="#zz")).color is None
+
+    def test_font_info_is_immutable(self) -> None:
+        font = FontInfo()
+        with pytest.raises(ValidationError):
+            font.size = 20.0  # type: ignore[misc]
@@ -1,4 +1,4 @@
-import { spawnSync } from "child_process";
+import { spawn } from "child_process";
 import { existsSync, mkdirSync } from "fs";
 import { readFile, unlink, writeFile } from "fs/promises";
 import path from "path";
@@ -12,94 +12,202 @@ const PYTHON_BIN = existsSync(path.join(PROJECT_ROOT, ".venv", "bin", "python"))
   ? path.join(PROJECT_ROOT, ".venv", "bin", "python")
   : "python3";
 
-export async function POST(request: Request) {
-  let inputPath: string | null = null;
-  let outputPath: string | null = null;
+/** 常駐変換サーバー（python -m src.server）の URL。未設定時は Python を都度起動する */
+const CONVERTER_URL = process.env.CONVERTER_URL?.replace(/\/$/, "");
+/** 同時に実行する変換数の上限 */
+const CONVERT_CONCURRENCY = Math.max(1, Number(process.env.CONVERT_CONCURRENCY ?? "2") || 2);
+const SPAWN_TIMEOUT_MS = 120000;
+/** 変換サーバーへのリクエスト（応答本文の受信まで）のタイムアウト */
+const SERVER_TIMEOUT_MS = SPAWN_TIMEOUT_MS;
+
+const PPTX_CONTENT_TYPE =
+  "application/vnd.openxmlformats-officedocument.presentationml.presentation";
+
+let running = 0;
+const waiting: Array<() => void> = [];
 
+/** 同時実行数を CONVERT_CONCURRENCY に制限して task を実行する */
+async function withConcurrencyLimit<T>(task: () => Promise<T>): Promise<T> {
+  if (running >= CONVERT_CONCURRENCY) {
+    // 空いた実行枠は終了した側から直接引き継ぐ（running は増減させない）
+    await new Promise<void>((resolve) => waiting.push(resolve));
+  } else {
+    running += 1;
+  }
   try {
-    const formData = await request.formData();
-    const file = formData.get("file") as File | null;
-    if (!file || !file.name.toLowerCase().endsWith(".pdf")) {
-      return new Response(
-        JSON.stringify({ error: "PDFファイルを選択してください。" }),
-        { status: 400, headers: { "Content-Type": "application/json" } }
-      );
+    return await task();
+  } finally {
+    const next = waiting.shift();
+    if (next) {
+      next();
+    } else {
+      running -= 1;
     }
+  }
+}
 
-    if (!existsSync(TMP_DIR)) {
-      mkdirSync(TMP_DIR, { recursive: true });
-    }
+function jsonResponse(body: Record<string, unknown>, status: number): Response {
+  return new Response(JSON.stringify(body), {
+    status,
+    headers: { "Content-Type": "application/json" },
+  });
+}
 
-    const bytes = await file.arrayBuffer();
-    const buffer = Buffer.from(bytes);
-    const base = path.join(TMP_DIR, `notebooklm-${Date.now()}-${Math.random().toString(36).slice(2, 9)}`);
-    inputPath = `${base}.pdf`;
-    outputPath = `${base}.pptx`;
+function pptxResponse(pptx: Buffer | ArrayBuffer, pdfFileName: string): Response {
+  const outFileName = pdfFileName.replace(/\.pdf$/i, ".pptx");
+  return new Response(pptx, {
+    status: 200,
+    headers: {
+      "Content-Type": PPTX_CONTENT_TYPE,
+      "Content-Disposition": `attachment; filename="${encodeURIComponent(outFileName)}"`,
+    },
+  });
+}
 
-    await writeFile(inputPath, buffer);
+function timeoutResponse(): Response {
+  return jsonResponse(
+    { error: `変換サーバーが ${SERVER_TIMEOUT_MS / 1000} 秒以内に応答しませんでした。` },
+    504
+  );
+}
 
-    const { status, stderr, error } = spawnSync(
-      PYTHON_BIN,
-      ["-m", "src.main", inputPath, "-o", outputPath, "--no-save-images"],
+/** 常駐変換サーバーに PDF を送り、PPTX を受け取る */
+async function convertWithServer(buffer: Buffer, fileName: string): Promise<Response> {
+  // 応答しないサーバーが実行枠を占有し続けないよう、本文の受信までを打ち切る
+  const signal = AbortSignal.timeout(SERVER_TIMEOUT_MS);
+  let res: Response;
+  try {
+    res = await fetch(`${CONVERTER_URL}/convert`, {
+      method: "POST",
+      headers: { "Content-Type": "application/pdf" },
+      body: new Uint8Array(buffer),
+      signal,
+    });
+  } catch (e) {
+    if (signal.aborted) {
+      return timeoutResponse();
+    }
+    return jsonResponse(
       {
-        cwd: PROJECT_ROOT,
-        env: { ...process.env, PYTHONPATH: PROJECT_ROOT },
-        encoding: "utf-8",
-        timeout: 120000,
-      }
+        error: "変換サーバーに接続できません。",
+        detail: e instanceof Error ? e.message : String(e),
+        hint: "対処: プロジェクトルートで python -m src.server を起動してください。",
+      },
+      503
     );
+  }
+
+  if (!res.ok) {
+    const detail = await res.json().catch(() => ({ error: "変換に失敗しました。" }));
+    // 413（PDF が大きすぎる）など利用者側の問題は、そのままの状態コードで返す
+    return jsonResponse(detail, res.status >= 400 && res.status < 500 ? res.status : 500);
+  }
+  let pptx: ArrayBuffer;
+  try {
+    pptx = await res.arrayBuffer();
+  } catch (e) {
+    if (signal.aborted) {
+      return timeoutResponse();
+    }
+    throw e;
+  }
+  return pptxResponse(pptx, fileName);
+}
+
+type SpawnResult = { status: number | null; stderr: string; error?: Error };
+
+/** Python を非同期に起動し、終了を待つ（イベントループはブロックしない） */
+function runPython(args: string[]): Promise<SpawnResult> {
+  return new Promise((resolve) => {
+    const child = spawn(PYTHON_BIN, args, {
+      cwd: PROJECT_ROOT,
+      env: { ...process.env, PYTHONPATH: PROJECT_ROOT },
+    });
+    let stderr = "";
+    child.stderr.setEncoding("utf-8");
+    child.stderr.on("data", (chunk: string) => {
+      stderr += chunk;
+    });
+    const timer = setTimeout(() => child.kill("SIGKILL"), SPAWN_TIMEOUT_MS);
+    child.on("error", (error) => {
+      clearTimeout(timer);
+      resolve({ status: null, stderr, error });
+    });
+    child.on("close", (status) => {
+      clearTimeout(timer);
+      resolve({ status, stderr });
+    });
+  });
+}
+
+/** 一時ファイル経由で python -m src.main を起動して変換する */
+async function convertWithSpawn(buffer: Buffer, fileName: string): Promise<Response> {
+  if (!existsSync(TMP_DIR)) {
+    mkdirSync(TMP_DIR, { recursive: true });
+  }
+  const base = path.join(TMP_DIR, `notebooklm-${Date.now()}-${Math.random().toString(36).slice(2, 9)}`);
+  const inputPath = `${base}.pdf`;
+  const outputPath = `${base}.pptx`;
+
+  try {
+    await writeFile(inputPath, buffer);
+
+    const { status, stderr, error } = await runPython([
+      "-m",
+      "src.main",
+      inputPath,
+      "-o",
+      outputPath,
+      "--no-save-images",
+    ]);
 
     if (error) {
-      return new Response(
-        JSON.stringify({
+      return jsonResponse(
+        {
           error: "変換の実行に失敗しました。Python の環境を確認してください。",
           detail: error.message,
-        }),
-        { status: 500, headers: { "Content-Type": "application/json" } }
+        },
+        500
       );
     }
 
     if (status !== 0) {
-      const stderrStr = (stderr ?? "").trim();
+      const stderrStr = stderr.trim();
       const detail = stderrStr.slice(0, 800) || "（Python の標準エラー出力はありません）";
       const isMissingModule = /ModuleNotFoundError|No module named ['"]/.test(stderrStr);
       const hint = isMissingModule
         ? "対処: プロジェクトルートで仮想環境を有効化し、pip install -r requirements.txt を実行してください。"
         : undefined;
-      return new Response(
-        JSON.stringify({
+      return jsonResponse(
+        {
           error: isMissingModule ? "Python の依存パッケージが不足しています。" : "変換に失敗しました。",
           detail,
           hint,
-        }),
-        { status: 422, headers: { "Content-Type": "application/json" } }
+        },
+        422
       );
     }
 
-    const outExists = existsSync(outputPath);
-    if (!outExists) {
-      return new Response(
-        JSON.stringify({ error: "出力ファイルが生成されませんでした。" }),
-        { status: 500, headers: { "Content-Type": "application/json" } }
-      );
+    if (!existsSync(outputPath)) {
+      return jsonResponse({ error: "出力ファイルが生成されませんでした。" }, 500);
     }
 
-    const pptxBuffer = await readFile(outputPath);
-    const outFileName = file.name.replace(/\.pdf$/i, ".pptx");
-
-    return new Response(pptxBuffer, {
-      status: 200,
-      headers: {
-        "Content-Type": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        "Content-Disposition": `attachment; filename="${encodeURIComponent(outFileName)}"`,
-      },
-    });
+    return pptxResponse(await readFile(outputPath), fileName);
   } finally {
-    if (inputPath) {
-      unlink(inputPath).catch(() => {});
-    }
-    if (outputPath) {
-      unlink(outputPath).catch(() => {});
-    }
+    unlink(inputPath).catch(() => {});
+    unlink(outputPath).catch(() => {});
+  }
+}
+
+export async function POST(request: Request) {
+  const formData = await request.formData();
+  const file = formData.get("file") as File | null;
+  if (!file || !file.name.toLowerCase().endsWith(".pdf")) {
+    return jsonResponse({ error: "PDFファイルを選択してください。" }, 400);
   }
+
+  const buffer = Buffer.from(await file.arrayBuffer());
+  return withConcurrencyLimit(() =>
+    CONVERTER_URL ? convertWithServer(buffer, file.name) : convertWithSpawn(buffer, file.name)
+  );
 }